@@ -1,7 +1,12 @@
 """Flask app factory. Registers blueprints and initializes services."""
 
-from flask import Flask, jsonify
+from flask import Flask
 from config import Config
+from stressease.services.utility.json_response import json_response
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
 
 
 def create_app():
@@ -17,105 +22,113 @@ def create_app():
     # Load configuration
     app.config.from_object(Config)
 
+    # Route service logs through the background log writer
+    from stressease.services.utility.logging_config import init_logging
+
+    init_logging()
+
     # Initialize services
     from stressease.services.utility.firebase_config import init_firebase
     from stressease.services.chat.llm_service import init_gemini
+    from stressease.services.mood.mood_service import preload_daily_questions
+    from stressease.services.prediction.prediction_service import (
+        preload_prediction_cache,
+    )
 
     try:
         # Initialize Firebase
         init_firebase(Config.FIREBASE_CREDENTIALS_PATH)
-        print("✓ Firebase initialized successfully")
+        logger.info("Firebase initialized")
 
         # Initialize Gemini AI (dual-model LLM)
         init_gemini(Config.GEMINI_API_KEY)
-        print("✓ LLM service initialized successfully")
-
-    except Exception as e:
-        print(f"✗ Service initialization error: {e}")
+        logger.info("LLM service initialized")
+
+        # Load quiz question sets and stored predictions off the startup path
+        threading.Thread(
+            target=preload_daily_questions, name="questions-preload", daemon=True
+        ).start()
+        threading.Thread(
+            target=preload_prediction_cache, name="predictions-preload", daemon=True
+        ).start()
+
+    except Exception:
+        logger.exception("Service initialization error")
         raise
 
     # Register blueprints
     from stressease.api.mood import mood_bp
-    from stressease.api.chat import chat_bp
+    from stressease.api.chat import chat_bp, start_session_memory_monitor
     from stressease.api.predict import predict_bp
 
     app.register_blueprint(mood_bp, url_prefix="/api/mood")
     app.register_blueprint(chat_bp, url_prefix="/api/chat")
     app.register_blueprint(predict_bp, url_prefix="/api")
 
+    # Shed cached chat sessions if the host runs low on memory
+    start_session_memory_monitor()
+
     # Global error handlers
     @app.errorhandler(400)
     def bad_request(error):
-        return (
-            jsonify(
-                {
-                    "error": "Bad Request",
-                    "message": "The request could not be understood by the server",
-                }
-            ),
+        return json_response(
+            {
+                "error": "Bad Request",
+                "message": "The request could not be understood by the server",
+            },
             400,
         )
 
     @app.errorhandler(401)
     def unauthorized(error):
-        return (
-            jsonify({"error": "Unauthorized", "message": "Authentication required"}),
-            401,
+        return json_response(
+            {"error": "Unauthorized", "message": "Authentication required"}, 401
         )
 
     @app.errorhandler(403)
     def forbidden(error):
-        return jsonify({"error": "Forbidden", "message": "Access denied"}), 403
+        return json_response({"error": "Forbidden", "message": "Access denied"}, 403)
 
     @app.errorhandler(404)
     def not_found(error):
-        return (
-            jsonify(
-                {
-                    "error": "Not Found",
-                    "message": "The requested resource was not found",
-                }
-            ),
+        return json_response(
+            {
+                "error": "Not Found",
+                "message": "The requested resource was not found",
+            },
             404,
         )
 
     @app.errorhandler(500)
     def internal_error(error):
-        return (
-            jsonify(
-                {
-                    "error": "Internal Server Error",
-                    "message": "An unexpected error occurred",
-                }
-            ),
+        return json_response(
+            {
+                "error": "Internal Server Error",
+                "message": "An unexpected error occurred",
+            },
             500,
         )
 
     # Health check endpoint
     @app.route("/health")
     def health_check():
-        return (
-            jsonify(
-                {"status": "healthy", "message": "StressEase Backend API is running"}
-            ),
-            200,
+        return json_response(
+            {"status": "healthy", "message": "StressEase Backend API is running"}, 200
         )
 
     # API root endpoint
     @app.route("/api")
     def api_root():
-        return (
-            jsonify(
-                {
-                    "message": "Welcome to StressEase Backend API",
-                    "version": "1.0.0",
-                    "endpoints": {
-                        "mood": "/api/mood",
-                        "chat": "/api/chat",
-                        "predict": "/api/predict",
-                    },
-                }
-            ),
+        return json_response(
+            {
+                "message": "Welcome to StressEase Backend API",
+                "version": "1.0.0",
+                "endpoints": {
+                    "mood": "/api/mood",
+                    "chat": "/api/chat",
+                    "predict": "/api/predict",
+                },
+            },
             200,
         )
 
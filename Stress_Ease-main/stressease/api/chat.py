@@ -7,17 +7,27 @@ This module provides:
 - GET /crisis-resources - Get country-specific crisis resources
 """
 
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, request, stream_with_context
 from stressease.services.utility.auth_service import token_required
+from stressease.services.utility.json_response import json_default, json_response
 from stressease.services.chat import llm_service
 from stressease.services.chat import chat_memory_service
 from stressease.services.mood import mood_service
 from stressease.services.chat import crisis_resource_service
 from langchain_core.messages import HumanMessage, AIMessage
-from datetime import datetime
-import uuid
+from cachetools import TTLCache
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+import atexit
+import hashlib
+import logging
+import orjson
+import os
 import threading
+import time
+import uuid
 
+logger = logging.getLogger(__name__)
 
 # Create the chat blueprint
 chat_bp = Blueprint("chat", __name__)
@@ -26,8 +36,74 @@ chat_bp = Blueprint("chat", __name__)
 # ============================================================================
 # IN-MEMORY SESSION CACHE
 # ============================================================================
-# Format: {user_id: {session_id: {'chain': runnable, 'last_activity': timestamp, 'message_count': int}}}
-active_chat_sessions = {}
+# Format: {(user_id, session_id): {'chain': runnable, 'user_context': str,
+#          'cache_name': str|None, 'cache_expires_at': timestamp|None,
+#          'history': [BaseMessage], 'last_activity': timestamp, 'message_count': int}}
+# Bounded and expiring: idle sessions drop out after SESSION_CACHE_TTL_SECONDS
+# and are rebuilt from Firestore on their next message.
+SESSION_CACHE_MAX_SIZE = 10_000
+SESSION_CACHE_TTL_SECONDS = 1800
+active_chat_sessions = TTLCache(
+    maxsize=SESSION_CACHE_MAX_SIZE, ttl=SESSION_CACHE_TTL_SECONDS
+)
+
+# Guards active_chat_sessions and the session dicts inside it. TTLCache is not
+# thread-safe (even reads reorder its internal links), and concurrent turns on
+# one session would otherwise race on message_count and history. Never held
+# across Firestore or Gemini calls.
+_sessions_lock = threading.Lock()
+
+# Under memory pressure (MemAvailable below this fraction of MemTotal) the
+# session cache is expired, its least recently active half evicted, and its
+# maxsize lowered to match so it doesn't refill. The full maxsize is restored
+# once MemAvailable is back above MEMORY_RECOVERY_THRESHOLD.
+MEMORY_CHECK_INTERVAL_SECONDS = 30
+MEMORY_PRESSURE_THRESHOLD = 0.10
+MEMORY_RECOVERY_THRESHOLD = 0.20
+SESSION_CACHE_MIN_SIZE = 100
+_memory_monitor_started = False
+_memory_monitor_lock = threading.Lock()
+
+# Cached history grows append-only (stable prefix for provider caching) up to
+# HISTORY_MAX_MESSAGES, then is reset once to the newest HISTORY_RESET_MESSAGES
+HISTORY_MAX_MESSAGES = 40
+HISTORY_RESET_MESSAGES = 20
+
+# Estimated token budget for the history sent with each turn; a reset trims
+# to half of it so the history has room to grow append-only again
+HISTORY_TOKEN_BUDGET = 2048
+
+# Rendered crisis-resource cache hits: {country: (json_bytes, etag)}. Resources
+# rarely change, so hot countries skip the Firestore read and re-serialization.
+CRISIS_RESPONSE_CACHE_MAX_SIZE = 256
+CRISIS_RESPONSE_CACHE_TTL_SECONDS = 3600
+_crisis_response_cache = TTLCache(
+    maxsize=CRISIS_RESPONSE_CACHE_MAX_SIZE, ttl=CRISIS_RESPONSE_CACHE_TTL_SECONDS
+)
+_crisis_response_cache_lock = threading.Lock()
+
+# Message validation limit
+MAX_MESSAGE_LENGTH = 1000
+
+# Session IDs are carved out of one os.urandom() read of this many IDs instead
+# of one syscall per uuid4()
+SESSION_ID_POOL_SIZE = 256
+_session_id_pool = b""
+_session_id_pool_offset = 0
+_session_id_pool_lock = threading.Lock()
+
+
+# ============================================================================
+# FIRESTORE THREAD POOLS
+# ============================================================================
+# Bounded pool reused across requests instead of spawning a thread per write
+_firestore_executor = ThreadPoolExecutor(max_workers=20, thread_name_prefix="fs-")
+atexit.register(_firestore_executor.shutdown, wait=False)
+
+# Separate pool for reads the request thread waits on, so slow background
+# writes can never starve them (and no task waits on another in its own pool)
+_read_executor = ThreadPoolExecutor(max_workers=20, thread_name_prefix="fs-read-")
+atexit.register(_read_executor.shutdown, wait=False)
 
 
 # ============================================================================
@@ -46,7 +122,8 @@ def get_crisis_resources(user_id):
         country (str): Country name selected from dropdown
 
     Returns:
-        JSON response with country-specific crisis resources
+        JSON response with country-specific crisis resources. Cached responses
+        carry an ETag; a matching If-None-Match gets 304 Not Modified.
     """
     try:
         # Get country from query parameter
@@ -56,32 +133,40 @@ def get_crisis_resources(user_id):
         if not country:
             country = "India"
 
+        # Serve an already rendered cache hit
+        with _crisis_response_cache_lock:
+            rendered = _crisis_response_cache.get(country)
+        if rendered:
+            return _cached_crisis_response(*rendered)
+
         # Check cache first
         cached_resources = crisis_resource_service.get_cached_crisis_resources(country)
 
         if cached_resources:
-            response = jsonify(
+            body = orjson.dumps(
                 {
                     "success": True,
                     "message": "Crisis resources retrieved from cache",
                     "resources": cached_resources,
                     "source": "cache",
-                }
+                },
+                default=json_default,
             )
-            response.headers["Content-Type"] = "application/json; charset=utf-8"
-            return response, 200
+            etag = hashlib.blake2b(body, digest_size=16).hexdigest()
+            with _crisis_response_cache_lock:
+                _crisis_response_cache[country] = (body, etag)
+            return _cached_crisis_response(body, etag)
 
         # Cache miss - generate using Gemini
         resources = llm_service.find_crisis_resources(country)
         if not resources:
-            response = jsonify(
+            return json_response(
                 {
                     "success": False,
                     "message": f"Could not find crisis resources for {country}",
-                }
+                },
+                404,
             )
-            response.headers["Content-Type"] = "application/json; charset=utf-8"
-            return response, 404
 
         # Cache the new resources
         cache_success = crisis_resource_service.cache_crisis_resources(
@@ -89,27 +174,25 @@ def get_crisis_resources(user_id):
         )
 
         # Return the resources
-        response = jsonify(
+        return json_response(
             {
                 "success": True,
                 "message": "Crisis resources generated using AI",
                 "resources": resources,
                 "source": "generated",
                 "cached": cache_success,
-            }
+            },
+            200,
         )
-        response.headers["Content-Type"] = "application/json; charset=utf-8"
-        return response, 200
 
     except Exception as e:
-        response = jsonify(
+        return json_response(
             {
                 "success": False,
                 "message": f"Error retrieving crisis resources: {str(e)}",
-            }
+            },
+            500,
         )
-        response.headers["Content-Type"] = "application/json; charset=utf-8"
-        return response, 500
 
 
 # ============================================================================
@@ -126,24 +209,24 @@ def send_chat_message(user_id):
     Expected JSON payload:
     {
         "message": "Hello, I'm feeling anxious today",
-        "session_id": null  // null for new session, or existing session_id
+        "session_id": null,  // null for new session, or existing session_id
+        "stream": false      // optional, true for a text/event-stream response
     }
 
     Returns:
-        JSON response with AI reply and session_id
+        JSON response with AI reply and session_id, or an SSE stream of
+        {"delta", "session_id"} frames ending with a {"done": true, ...} frame
     """
     try:
         # Get and validate JSON data
         message_data = request.get_json()
         if not message_data:
-            return (
-                jsonify(
-                    {
-                        "success": False,
-                        "error": "Invalid request",
-                        "message": "JSON data is required",
-                    }
-                ),
+            return json_response(
+                {
+                    "success": False,
+                    "error": "Invalid request",
+                    "message": "JSON data is required",
+                },
                 400,
             )
 
@@ -153,40 +236,22 @@ def send_chat_message(user_id):
 
         # Input validation
         if not user_message:
-            return (
-                jsonify(
-                    {
-                        "success": False,
-                        "error": "Invalid message",
-                        "message": "Message cannot be empty",
-                    }
-                ),
+            return json_response(
+                {
+                    "success": False,
+                    "error": "Invalid message",
+                    "message": "Message cannot be empty",
+                },
                 400,
             )
 
-        # Block gibberish (messages without any letters)
-        # TEMPORARILY DISABLED FOR TESTING - See how LLM handles gibberish
-        # if not any(c.isalpha() for c in user_message):
-        #     return (
-        #         jsonify(
-        #             {
-        #                 "success": False,
-        #                 "error": "Invalid message",
-        #                 "message": "Please send a message with words so I can help you.",
-        #             }
-        #         ),
-        #         400,
-        #     )
-
-        if len(user_message) > 1000:
-            return (
-                jsonify(
-                    {
-                        "success": False,
-                        "error": "Message too long",
-                        "message": "Message must be 1000 characters or less",
-                    }
-                ),
+        if len(user_message) > MAX_MESSAGE_LENGTH:
+            return json_response(
+                {
+                    "success": False,
+                    "error": "Message too long",
+                    "message": f"Message must be {MAX_MESSAGE_LENGTH} characters or less",
+                },
                 400,
             )
 
@@ -194,85 +259,65 @@ def send_chat_message(user_id):
         session_id, chain, history_messages = _load_session(session_id, user_id)
 
         if not chain:
-            return (
-                jsonify(
-                    {
-                        "success": False,
-                        "error": "Session error",
-                        "message": "Could not initialize chat session",
-                    }
-                ),
+            return json_response(
+                {
+                    "success": False,
+                    "error": "Session error",
+                    "message": "Could not initialize chat session",
+                },
                 500,
             )
 
+        # Streaming clients get Server-Sent Events instead of a single JSON body
+        if message_data.get("stream"):
+            return _stream_chat_message(
+                user_id, session_id, chain, user_message, history_messages
+            )
+
         # Generate AI response using LCEL chain
         # Pass history explicitly as it's stateless
         ai_response = llm_service.generate_chat_response(
             chain, user_message, history_messages
         )
 
-        # Calculate new turn number
-        turn_number = len(history_messages) // 2
-
-        # Save conversation turn to Firestore (async in background)
-        threading.Thread(
-            target=chat_memory_service.save_conversation_turn,
-            args=(user_id, session_id, user_message, ai_response, turn_number),
-        ).start()
-
-        # Update session activity (async in background)
-        threading.Thread(
-            target=chat_memory_service.update_session_activity,
-            args=(user_id, session_id),
-        ).start()
-
-        # Update message count in cache
-        if (
-            user_id in active_chat_sessions
-            and session_id in active_chat_sessions[user_id]
-        ):
-            active_chat_sessions[user_id][session_id]["message_count"] += 1
-            active_chat_sessions[user_id][session_id][
-                "last_activity"
-            ] = datetime.utcnow()
-
-        # Return response
-        timestamp = datetime.utcnow().isoformat()
-        return (
-            jsonify(
-                {
-                    "success": True,
-                    "user_message": {
-                        "content": user_message,
-                        "timestamp": timestamp,
-                        "role": "user",
-                    },
-                    "ai_response": {
-                        "content": ai_response,
-                        "timestamp": timestamp,
-                        "role": "assistant",
-                    },
-                    "session_id": session_id,
-                    "metadata": {
-                        "message_count": active_chat_sessions.get(user_id, {})
-                        .get(session_id, {})
-                        .get("message_count", 0),
-                    },
-                }
-            ),
+        # Single clock read for cache activity and response timestamps
+        now = datetime.now(timezone.utc)
+
+        # Persist the turn and update the session cache
+        message_count = _record_turn(
+            user_id, session_id, user_message, ai_response, history_messages, now
+        )
+
+        # Return response (orjson serializes datetime as ISO 8601)
+        return json_response(
+            {
+                "success": True,
+                "user_message": {
+                    "content": user_message,
+                    "timestamp": now,
+                    "role": "user",
+                },
+                "ai_response": {
+                    "content": ai_response,
+                    "timestamp": now,
+                    "role": "assistant",
+                },
+                "session_id": session_id,
+                "metadata": {
+                    "message_count": message_count,
+                },
+            },
             201,
         )
 
     except Exception as e:
-        print(f"Error in send_chat_message: {str(e)}")
-        return (
-            jsonify(
-                {
-                    "success": False,
-                    "error": "Failed to process message",
-                    "message": str(e),
-                }
-            ),
+        logger.exception("Error in send_chat_message")
+        return json_response(
+            {
+                "success": False,
+                "error": "Failed to process message",
+                "message": str(e),
+            },
             500,
         )
 
@@ -300,62 +345,50 @@ def end_chat_session(user_id):
         # Get and validate JSON data
         request_data = request.get_json()
         if not request_data:
-            return (
-                jsonify(
-                    {
-                        "success": False,
-                        "error": "Invalid request",
-                        "message": "JSON data is required",
-                    }
-                ),
+            return json_response(
+                {
+                    "success": False,
+                    "error": "Invalid request",
+                    "message": "JSON data is required",
+                },
                 400,
             )
 
         # Extract and validate session_id
         session_id = request_data.get("session_id", "").strip()
         if not session_id:
-            return (
-                jsonify(
-                    {
-                        "success": False,
-                        "error": "Missing session_id",
-                        "message": "session_id is required",
-                    }
-                ),
+            return json_response(
+                {
+                    "success": False,
+                    "error": "Missing session_id",
+                    "message": "session_id is required",
+                },
                 400,
             )
 
         cleanup_count = 0
 
         # Clean up in-memory session
-        if (
-            user_id in active_chat_sessions
-            and session_id in active_chat_sessions[user_id]
-        ):
-            del active_chat_sessions[user_id][session_id]
+        with _sessions_lock:
+            removed = active_chat_sessions.pop((user_id, session_id), None)
+        if removed is not None:
             cleanup_count += 1
 
         # Mark session as ended in Firestore (async)
-        threading.Thread(
-            target=chat_memory_service.end_session, args=(user_id, session_id)
-        ).start()
+        _submit_background(chat_memory_service.end_session, user_id, session_id)
 
-        return (
-            jsonify(
-                {
-                    "success": True,
-                    "message": "Session ended successfully",
-                    "cleanup_count": cleanup_count,
-                }
-            ),
+        return json_response(
+            {
+                "success": True,
+                "message": "Session ended successfully",
+                "cleanup_count": cleanup_count,
+            },
             200,
         )
 
     except Exception as e:
-        return (
-            jsonify(
-                {"success": False, "error": "Failed to end session", "message": str(e)}
-            ),
+        return json_response(
+            {"success": False, "error": "Failed to end session", "message": str(e)},
             500,
         )
 
@@ -377,93 +410,525 @@ def _load_session(session_id, user_id):
         tuple: (session_id, chain, history_messages)
     """
     try:
-        # Initialize user's session dictionary if it doesn't exist
-        if user_id not in active_chat_sessions:
-            active_chat_sessions[user_id] = {}
-
         # Case 1: No session_id provided - create new session
         if not session_id:
-            session_id = str(uuid.uuid4())
+            session_id = _new_session_id()
 
             # Create session metadata in Firestore (async)
-            threading.Thread(
-                target=chat_memory_service.create_session_metadata,
-                args=(user_id, session_id),
-            ).start()
-
-            # Create fresh chain
-            chain = _create_chain_for_user(user_id)
+            _submit_background(
+                chat_memory_service.create_session_metadata, user_id, session_id
+            )
 
-            # Store in cache
-            active_chat_sessions[user_id][session_id] = {
-                "chain": chain,
-                "last_activity": datetime.utcnow(),
-                "message_count": 0,
-            }
+            # Create fresh chain and store in cache
+            session = _create_chain_for_user(user_id)
+            session["last_activity"] = datetime.now(timezone.utc)
+            session["message_count"] = 0
+            session["history"] = []
+            with _sessions_lock:
+                active_chat_sessions[(user_id, session_id)] = session
 
-            return session_id, chain, []
+            return session_id, session["chain"], []
 
         # Case 2: Session_id provided
+        key = (user_id, session_id)
+
+        # Check cache for existing chain and history
+        with _sessions_lock:
+            session = active_chat_sessions.get(key)
+            if session:
+                chain = session["chain"]
+                history = list(session["history"])
+                cache_expires_at = session["cache_expires_at"]
+                user_context = session["user_context"]
+                cached_count = session["message_count"]
+
+        if session:
+            # Another worker or instance may have added turns since this entry
+            # was cached. A lower stored count is just this process's own turns
+            # still waiting in the write batcher.
+            stored_count = chat_memory_service.get_session_message_count(
+                user_id, session_id
+            )
+            if stored_count is not None and stored_count > cached_count:
+                with _sessions_lock:
+                    active_chat_sessions.pop(key, None)
+                session = None
+
+        if session:
+            # Gemini prompt cache expired - rebuild chain from the stored context
+            if cache_expires_at and datetime.now(timezone.utc) >= cache_expires_at:
+                refreshed = _create_cached_chain(user_context)
+                with _sessions_lock:
+                    session.update(refreshed)
+                chain = refreshed["chain"]
+
+            return session_id, chain, history
+
+        # Cache miss - load history and the stored turn count from Firestore
+        # while the chain is being built. With the chain's own profile/mood-log
+        # reads, all Firestore reads of a cold turn are in flight together.
+        # This uses the read pool, not AsyncClient: the app is sync Flask, and
+        # an event loop per request would cost more than the threads. They
+        # aren't merged into one get_all() either: history is a query (get_all
+        # only takes document refs), and the profile read sits behind the
+        # per-user chain and profile caches, so folding it in here would turn
+        # cache hits back into RPCs.
+        history_future = _read_executor.submit(
+            chat_memory_service.load_conversation_memory,
+            user_id,
+            session_id,
+            max_messages=25,
+        )
+        count_future = _read_executor.submit(
+            chat_memory_service.get_session_message_count, user_id, session_id
+        )
+        session = _create_chain_for_user(user_id)
 
-        # Load history from Firestore (always load fresh history to be safe)
-        # We convert the raw dicts to LangChain Message objects
-        raw_messages = chat_memory_service.load_conversation_memory(
-            user_id, session_id, max_messages=25
+        # load_conversation_memory already returns LangChain Message objects
+        loaded_messages = history_future.result()
+        history_messages = llm_service.trim_messages_to_budget(
+            loaded_messages, HISTORY_TOKEN_BUDGET
         )
-        history_messages = []
-
-        for msg in raw_messages:
-            # Assuming msg has 'role' and 'content' or similar structure from load_conversation_memory
-            # We need to adapt based on what chat_memory_service returns
-            # If it returns LangChain messages, great. If dicts, we convert.
-            if isinstance(msg, HumanMessage) or isinstance(msg, AIMessage):
-                history_messages.append(msg)
-            elif isinstance(msg, dict):
-                # Adapt based on your Firestore structure
-                role = msg.get("role") or msg.get("type")
-                content = msg.get("content") or msg.get("text")
-                if role == "user":
-                    history_messages.append(HumanMessage(content=content))
-                elif role == "assistant" or role == "ai":
-                    history_messages.append(AIMessage(content=content))
-
-        # Check cache for existing chain
-        if session_id in active_chat_sessions[user_id]:
-            chain = active_chat_sessions[user_id][session_id]["chain"]
-            return session_id, chain, history_messages
-
-        # If not in cache, create new chain
-        chain = _create_chain_for_user(user_id)
-
-        # Store in cache
-        active_chat_sessions[user_id][session_id] = {
-            "chain": chain,
-            "last_activity": datetime.utcnow(),
-            "message_count": len(history_messages) // 2,
-        }
-
-        return session_id, chain, history_messages
 
-    except Exception as e:
-        print(f"Error in _load_session: {str(e)}")
+        # Loaded history is capped, so it only bounds the count from below
+        stored_count = count_future.result()
+
+        # Store the new chain in cache
+        session["last_activity"] = datetime.now(timezone.utc)
+        session["message_count"] = (
+            stored_count if stored_count is not None else len(loaded_messages) // 2
+        )
+        session["history"] = list(history_messages)
+        with _sessions_lock:
+            active_chat_sessions[key] = session
+
+        return session_id, session["chain"], history_messages
+
+    except Exception:
+        logger.exception("Error in _load_session")
         return None, None, []
 
 
+def _new_session_id():
+    """
+    Generate a random version 4 UUID string for a new chat session.
+
+    Same 36-character format and entropy source as str(uuid.uuid4()), but the
+    random bytes come from a pooled os.urandom() read refilled every
+    SESSION_ID_POOL_SIZE sessions.
+
+    Returns:
+        str: Session ID
+    """
+    global _session_id_pool, _session_id_pool_offset
+
+    with _session_id_pool_lock:
+        if _session_id_pool_offset >= len(_session_id_pool):
+            _session_id_pool = os.urandom(16 * SESSION_ID_POOL_SIZE)
+            _session_id_pool_offset = 0
+        start = _session_id_pool_offset
+        _session_id_pool_offset += 16
+        random_bytes = _session_id_pool[start : start + 16]
+
+    return str(uuid.UUID(bytes=random_bytes, version=4))
+
+
+def _memory_available_ratio():
+    """
+    Read the fraction of system memory still available (Linux only).
+
+    Returns:
+        Optional[float]: MemAvailable / MemTotal, or None if /proc/meminfo is unavailable
+    """
+    try:
+        meminfo = {}
+        with open("/proc/meminfo") as f:
+            for line in f:
+                key, value = line.split(":", 1)
+                meminfo[key] = int(value.split()[0])
+        return meminfo["MemAvailable"] / meminfo["MemTotal"]
+    except (OSError, KeyError, ValueError, ZeroDivisionError):
+        return None
+
+
+def _resize_session_cache(maxsize):
+    """
+    Replace the session cache with one of a new maxsize.
+
+    TTLCache's maxsize is fixed at construction, so the most recently active
+    sessions are copied into a new cache (their TTL restarts).
+
+    Args:
+        maxsize (int): Maximum number of cached sessions
+
+    Returns:
+        int: Number of sessions evicted to fit
+    """
+    global active_chat_sessions
+
+    with _sessions_lock:
+        active_chat_sessions.expire()
+        newest = sorted(
+            active_chat_sessions.items(), key=lambda item: item[1]["last_activity"]
+        )[-maxsize:]
+
+        resized = TTLCache(maxsize=maxsize, ttl=SESSION_CACHE_TTL_SECONDS)
+        for key, session in newest:
+            resized[key] = session
+
+        evicted = len(active_chat_sessions) - len(newest)
+        active_chat_sessions = resized
+
+    return evicted
+
+
+def _monitor_session_memory():
+    """Background loop that sheds cached sessions when the host runs low on memory."""
+    while True:
+        time.sleep(MEMORY_CHECK_INTERVAL_SECONDS)
+
+        ratio = _memory_available_ratio()
+        if ratio is None:
+            return  # Not on Linux - nothing to monitor
+
+        if ratio < MEMORY_PRESSURE_THRESHOLD:
+            with _sessions_lock:
+                maxsize = max(SESSION_CACHE_MIN_SIZE, len(active_chat_sessions) // 2)
+            evict_count = _resize_session_cache(maxsize)
+            logger.warning(
+                "Memory pressure (%.0f%% available): evicted %d chat sessions, "
+                "session cache limited to %d",
+                ratio * 100,
+                evict_count,
+                maxsize,
+            )
+
+        elif (
+            ratio >= MEMORY_RECOVERY_THRESHOLD
+            and active_chat_sessions.maxsize < SESSION_CACHE_MAX_SIZE
+        ):
+            _resize_session_cache(SESSION_CACHE_MAX_SIZE)
+            logger.info(
+                "Memory recovered (%.0f%% available): session cache limit restored",
+                ratio * 100,
+            )
+
+
+def start_session_memory_monitor():
+    """Start the session-cache memory monitor once per process (called by create_app)."""
+    global _memory_monitor_started
+
+    with _memory_monitor_lock:
+        if _memory_monitor_started:
+            return
+        _memory_monitor_started = True
+
+    threading.Thread(
+        target=_monitor_session_memory, name="session-memory-monitor", daemon=True
+    ).start()
+
+
+def _cached_crisis_response(body, etag):
+    """
+    Build the response for a rendered crisis-resource cache hit.
+
+    Args:
+        body (bytes): Pre-serialized JSON body
+        etag (str): Unquoted ETag for the body
+
+    Returns:
+        Response: 200 with the body, or 304 if the client already has it
+    """
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+    else:
+        response = Response(
+            body, status=200, content_type="application/json; charset=utf-8"
+        )
+
+    response.set_etag(etag)
+    # Private: the endpoint is authenticated, so shared caches must not store it
+    response.headers["Cache-Control"] = (
+        f"private, max-age={CRISIS_RESPONSE_CACHE_TTL_SECONDS}"
+    )
+    return response
+
+
+def _stream_chat_message(user_id, session_id, chain, user_message, history_messages):
+    """
+    Stream the AI reply as Server-Sent Events.
+
+    Each frame is `data: {"delta": "...", "session_id": "..."}`. Deltas are
+    safety-checked before they are sent and trail the model by
+    STREAM_HOLDBACK_CHARS, so a keyword split across chunks is never partly
+    shown. Once the text matches a safety pattern no further deltas are sent.
+    The terminal frame carries the validated full reply in "content" (the
+    safe response in that case); clients display it in place of the deltas.
+    The turn is persisted once the full response has been accumulated, or in
+    `finally` if the client disconnects.
+
+    Args:
+        user_id (str): User ID from authentication
+        session_id (str): Session ID from _load_session
+        chain (Runnable): The LCEL conversation chain
+        user_message (str): User's input message
+        history_messages (list): Chat history
+
+    Returns:
+        Response: text/event-stream response
+    """
+
+    holdback = llm_service.STREAM_HOLDBACK_CHARS
+
+    def generate():
+        text = ""
+        recorded = False
+        try:
+            try:
+                sent = 0
+                blocked = False
+                for delta in llm_service.stream_chat_response(
+                    chain, user_message, history_messages
+                ):
+                    # Only the new text (plus the held-back tail) needs a scan
+                    scan_from = max(0, len(text) - holdback)
+                    text += delta
+                    if blocked:
+                        continue
+                    if llm_service.contains_unsafe_content(text, scan_from):
+                        # Keep consuming, so the final reply is validated on
+                        # the whole text like the non-streaming path
+                        blocked = True
+                        continue
+                    release = len(text) - holdback
+                    if release > sent:
+                        yield _sse_frame(
+                            {"delta": text[sent:release], "session_id": session_id}
+                        )
+                        sent = release
+
+                ai_response = llm_service.finalize_chat_response(text)
+                if not blocked and ai_response == text and sent < len(text):
+                    yield _sse_frame({"delta": text[sent:], "session_id": session_id})
+            except Exception:
+                logger.exception("Error streaming chat response")
+                ai_response = llm_service.CONNECTION_ERROR_RESPONSE
+
+            now = datetime.now(timezone.utc)
+            # Set first: if _record_turn raises, `finally` must not record again
+            recorded = True
+            message_count = _record_turn(
+                user_id, session_id, user_message, ai_response, history_messages, now
+            )
+
+            yield _sse_frame(
+                {
+                    "done": True,
+                    "content": ai_response,
+                    "timestamp": now,
+                    "session_id": session_id,
+                    "metadata": {"message_count": message_count},
+                }
+            )
+
+        finally:
+            # Client went away mid-stream - keep history consistent with what it saw
+            if not recorded and text:
+                _record_turn(
+                    user_id,
+                    session_id,
+                    user_message,
+                    llm_service.finalize_chat_response(text),
+                    history_messages,
+                    datetime.now(timezone.utc),
+                )
+
+    response = Response(
+        stream_with_context(generate()), status=200, mimetype="text/event-stream"
+    )
+    response.headers["Cache-Control"] = "no-cache"
+    response.headers["X-Accel-Buffering"] = "no"  # Disable proxy buffering
+    return response
+
+
+def _sse_frame(payload):
+    """Encode one Server-Sent Events data frame."""
+    return b"data: " + orjson.dumps(payload, default=json_default) + b"\n\n"
+
+
+def _record_turn(user_id, session_id, user_message, ai_response, history_messages, now):
+    """
+    Persist a completed turn and update the cached session.
+
+    Args:
+        user_id (str): User ID from authentication
+        session_id (str): Session ID
+        user_message (str): User's message content
+        ai_response (str): Validated AI response
+        history_messages (list): History the response was generated from
+        now (datetime): Timestamp for this turn
+
+    Returns:
+        int: Session message count after this turn
+    """
+    # Single cache lookup; the session dict is mutated in place below
+    key = (user_id, session_id)
+
+    with _sessions_lock:
+        session = active_chat_sessions.get(key)
+
+        if session:
+            # Calculate new turn number (cached history may have been trimmed)
+            turn_number = session["message_count"]
+            message_count = turn_number + 1
+
+            # Update message count and append-only history in cache
+            session["message_count"] = message_count
+            session["last_activity"] = now
+            _append_to_history(session["history"], user_message, ai_response)
+
+            # Re-insert to restart the entry's TTL (TTLCache expires by insertion time)
+            active_chat_sessions[key] = session
+
+    if not session:
+        # Evicted mid-turn: history_messages is capped, so use the stored count
+        stored_count = chat_memory_service.get_session_message_count(
+            user_id, session_id
+        )
+        turn_number = (
+            stored_count if stored_count is not None else len(history_messages) // 2
+        )
+        message_count = turn_number + 1
+
+    # Queue conversation turn and session activity for the next batched flush
+    chat_memory_service.save_turn_and_touch_session(
+        user_id, session_id, user_message, ai_response, turn_number
+    )
+
+    return message_count
+
+
+def _submit_background(func, *args):
+    """
+    Run a Firestore write on the shared background pool.
+
+    Exceptions are logged here because the returned Future is never awaited.
+
+    Args:
+        func (callable): Service function to run
+        *args: Positional arguments for func
+    """
+
+    def _task():
+        try:
+            func(*args)
+        except Exception:
+            logger.exception("Error in background task %s", func.__name__)
+
+    _firestore_executor.submit(_task)
+
+
+def _append_to_history(history, user_message, ai_response):
+    """
+    Append a completed turn to the cached session history.
+
+    Messages are added as-is (no timestamps or rewrites) so earlier turns stay
+    byte-identical across requests. Once the message cap or token budget is
+    exceeded the history is cut back in one step instead of sliding by one turn
+    every request, which would invalidate the provider's cached prefix on every
+    call.
+
+    Args:
+        history (list): Cached LangChain messages for the session (mutated)
+        user_message (str): User's message content
+        ai_response (str): AI's response content
+    """
+    history.append(HumanMessage(content=user_message))
+    history.append(AIMessage(content=ai_response))
+
+    if (
+        len(history) > HISTORY_MAX_MESSAGES
+        or llm_service.count_tokens(history) > HISTORY_TOKEN_BUDGET
+    ):
+        history[:] = llm_service.trim_messages_to_budget(
+            history[-HISTORY_RESET_MESSAGES:], HISTORY_TOKEN_BUDGET // 2
+        )
+
+
 def _create_chain_for_user(user_id):
     """
-    Helper to create a personalized LCEL chain for a user.
+    Helper to get a personalized LCEL chain for a user, reusing a cached one.
+
+    Returns:
+        dict: Session cache fields (chain, user_context, cache_name, cache_expires_at)
+              as a new dict the caller may extend
+    """
+    fields = chat_memory_service.get_cached_user_chain(user_id)
+
+    if fields is None:
+        fields = _build_chain_for_user(user_id)
+    else:
+        # Gemini prompt cache expired - rebuild chain from the cached context
+        cache_expires_at = fields["cache_expires_at"]
+        if cache_expires_at and datetime.now(timezone.utc) >= cache_expires_at:
+            fields = dict(fields, **_create_cached_chain(fields["user_context"]))
+        else:
+            return dict(fields)
+
+    chat_memory_service.cache_user_chain(user_id, fields)
+
+    return dict(fields)
+
+
+def _build_chain_for_user(user_id):
+    """
+    Helper to create a personalized LCEL chain for a user from Firestore data.
+
+    Returns:
+        dict: Session cache fields (chain, user_context, cache_name, cache_expires_at)
     """
-    # Fetch user context
-    user_profile = chat_memory_service.get_user_profile(user_id)
-    mood_logs = mood_service.get_last_daily_mood_logs(user_id, limit=7)
+    # Fetch user context. The profile read runs on the read pool while this
+    # thread reads the mood logs and, without waiting for the profile, goes
+    # straight on to the summary LLM call that only depends on the logs
+    profile_future = _read_executor.submit(
+        chat_memory_service.get_user_profile, user_id
+    )
+    mood_logs = mood_service.get_last_daily_mood_logs(
+        user_id, limit=7, fields=llm_service.MOOD_SUMMARY_FIELDS
+    )
 
     # Generate mood summary if logs exist
     mood_summary = ""
     if mood_logs:
         mood_summary = llm_service.summarize_mood_logs(mood_logs)
 
+    user_profile = profile_future.result()
+
     # Build user context
     user_context = llm_service.build_user_context(user_profile, mood_summary)
 
     # Create chain
-    return llm_service.create_conversation_chain(user_context)
+    session = _create_cached_chain(user_context)
+    session["user_context"] = user_context
+    return session
+
+
+def _create_cached_chain(user_context):
+    """
+    Helper to create a chain whose static prompt prefix is served from the shared
+    Gemini context cache.
+
+    Falls back to an inline system prompt when the cache can't be created.
+
+    Returns:
+        dict: {'chain': runnable, 'cache_name': str|None, 'cache_expires_at': timestamp|None}
+    """
+    prompt_cache = llm_service.get_prompt_cache()
+    cache_name, cache_expires_at = prompt_cache or (None, None)
+
+    return {
+        "chain": llm_service.create_conversation_chain(user_context, cache_name),
+        "cache_name": cache_name,
+        "cache_expires_at": cache_expires_at,
+    }
+
@@ -1,22 +1,129 @@
 """Daily mood quiz endpoint only."""
 
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request
 from stressease.services.utility.auth_service import token_required
+from stressease.services.utility.json_response import json_response
 from stressease.services.mood.mood_service import (
     upsert_daily_mood_log,
     get_last_daily_mood_logs,
     get_daily_mood_logs_count,
-    weekly_dass_exists,
     save_weekly_dass_totals,
     get_daily_mood_log_by_date,
     update_daily_mood_log,
     get_daily_questions,
 )
-from datetime import datetime, date
+from stressease.services.chat.chat_memory_service import invalidate_user_chain
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+import atexit
+import fastjsonschema
+import logging
+import operator
+import threading
+
+logger = logging.getLogger(__name__)
 
 # Create the mood blueprint
 mood_bp = Blueprint("mood", __name__)
 
+# Question IDs in score order: 4 core, 5 rotating, 3 DASS
+ALL_QUESTIONS = (
+    "q1",
+    "q2",
+    "q3",
+    "q4",  # core
+    "q5",
+    "q6",
+    "q7",
+    "q8",
+    "q9",  # rotating
+    "q10",
+    "q11",
+    "q12",  # DASS
+)
+QUESTION_INDEXES = range(len(ALL_QUESTIONS))
+
+# Daily logs per weekly DASS aggregation block
+WEEKLY_BLOCK_DAYS = 7
+
+# Mood log fields the weekly aggregation reads, fetched with a field mask
+WEEKLY_BLOCK_FIELDS = ["date", "core_scores", "rotating_scores", "dass_today"]
+
+# Quiz score (index) -> DASS-21 item score 0-3; index 0 is a missing answer
+DASS_SCALE = (0, 0, 1, 1, 2, 3)
+
+# Daily quiz payload schema, compiled once at import into a plain function
+_SCORE_SCHEMA = {"type": "integer", "minimum": 1, "maximum": 5}
+_quiz_payload_validator = fastjsonschema.compile(
+    {
+        "type": "object",
+        "required": ["core_scores", "rotating_scores", "dass_today"],
+        "properties": {
+            "core_scores": {
+                "type": "object",
+                "required": ["mood", "energy", "sleep", "stress"],
+                "properties": {
+                    "mood": _SCORE_SCHEMA,
+                    "energy": _SCORE_SCHEMA,
+                    "sleep": _SCORE_SCHEMA,
+                    "stress": _SCORE_SCHEMA,
+                },
+            },
+            "rotating_scores": {
+                "type": "object",
+                "required": ["domain_name", "scores"],
+                "properties": {
+                    "scores": {
+                        "type": "array",
+                        "items": _SCORE_SCHEMA,
+                        "minItems": 5,
+                        "maxItems": 5,
+                    },
+                },
+            },
+            "dass_today": {
+                "type": "object",
+                "required": ["depression", "anxiety", "stress"],
+                "properties": {
+                    "depression": _SCORE_SCHEMA,
+                    "anxiety": _SCORE_SCHEMA,
+                    "stress": _SCORE_SCHEMA,
+                },
+            },
+        },
+    }
+)
+
+# Score keys of each section in question order
+CORE_SCORE_KEYS = ("mood", "energy", "sleep", "stress")
+ROTATING_SCORE_KEYS = ("domain_name", "scores")
+DASS_SCORE_KEYS = ("depression", "anxiety", "stress")
+
+# Score values of each section in question order; raise KeyError on a missing key
+_core_values = operator.itemgetter(*CORE_SCORE_KEYS)
+_dass_values = operator.itemgetter(*DASS_SCORE_KEYS)
+
+# Quiz answers are integers 1-5 (JSON booleans are ints in Python, as before)
+VALID_SCORE_VALUES = frozenset({1, 2, 3, 4, 5})
+VALID_SCORE_TYPES = frozenset({int, bool})
+
+# (dimension, score label) per question, in the same order; rotating questions
+# are positional and have no label
+QUESTION_LAYOUT = (
+    ("core", "mood"),
+    ("core", "energy"),
+    ("core", "sleep"),
+    ("core", "stress"),
+    ("rotating", None),
+    ("rotating", None),
+    ("rotating", None),
+    ("rotating", None),
+    ("rotating", None),
+    ("dass", "depression"),
+    ("dass", "anxiety"),
+    ("dass", "stress"),
+)
+
 
 # ******************************************************************************
 # * POST /api/mood/quiz/daily - Submit structured daily mood quiz
@@ -42,175 +149,67 @@ def submit_daily_quiz(user_id):
     try:
         payload = request.get_json()
         if not payload:
-            return (
-                jsonify(
-                    {
-                        "success": False,
-                        "error": "Invalid request",
-                        "message": "JSON body required",
-                    }
-                ),
-                400,
-            )
-
-        # Validate required sections
-        core = payload.get("core_scores")
-        rotating = payload.get("rotating_scores")
-        dass = payload.get("dass_today")
-
-        if not core or not rotating or not dass:
-            return (
-                jsonify(
-                    {
-                        "success": False,
-                        "error": "Missing required fields",
-                        "message": "core_scores, rotating_scores, and dass_today are required",
-                    }
-                ),
+            return json_response(
+                {
+                    "success": False,
+                    "error": "Invalid request",
+                    "message": "JSON body required",
+                },
                 400,
             )
 
-        # Validate core scores
-        required_core_keys = ["mood", "energy", "sleep", "stress"]
-        if any(k not in core for k in required_core_keys):
-            return (
-                jsonify(
+        # Fast path: one compiled schema check. The detailed checks below only
+        # run when it fails, to pick the error message (or accept the rare
+        # payload the schema is stricter about, e.g. boolean scores)
+        if not _is_valid_quiz_payload(payload):
+            error = _quiz_payload_error(payload)
+            if error:
+                return json_response(
                     {
                         "success": False,
-                        "error": "Invalid core_scores",
-                        "message": "Missing one of mood, energy, sleep, stress",
-                    }
-                ),
-                400,
-            )
-        core_scores = [core["mood"], core["energy"], core["sleep"], core["stress"]]
-        if not all(isinstance(s, int) and 1 <= s <= 5 for s in core_scores):
-            return (
-                jsonify(
-                    {
-                        "success": False,
-                        "error": "Invalid core_scores",
-                        "message": "All core scores must be integers between 1 and 5",
-                    }
-                ),
-                400,
-            )
+                        "error": error[0],
+                        "message": error[1],
+                    },
+                    400,
+                )
 
-        # Validate rotating scores
-        if "domain_name" not in rotating or "scores" not in rotating:
-            return (
-                jsonify(
-                    {
-                        "success": False,
-                        "error": "Invalid rotating_scores",
-                        "message": "domain_name and scores are required",
-                    }
-                ),
-                400,
-            )
-        if not isinstance(rotating["scores"], list) or len(rotating["scores"]) != 5:
-            return (
-                jsonify(
-                    {
-                        "success": False,
-                        "error": "Invalid rotating_scores",
-                        "message": "scores must be a list of 5 integers",
-                    }
-                ),
-                400,
-            )
+        core = payload["core_scores"]
+        rotating = payload["rotating_scores"]
+        dass = payload["dass_today"]
+        core_scores = list(_core_values(core))
         rotating_scores = rotating["scores"]
-        if not all(isinstance(s, int) and 1 <= s <= 5 for s in rotating_scores):
-            return (
-                jsonify(
-                    {
-                        "success": False,
-                        "error": "Invalid rotating_scores",
-                        "message": "All rotating scores must be integers between 1 and 5",
-                    }
-                ),
-                400,
-            )
-
-        # Validate DASS today
-        required_dass_keys = ["depression", "anxiety", "stress"]
-        if any(k not in dass for k in required_dass_keys):
-            return (
-                jsonify(
-                    {
-                        "success": False,
-                        "error": "Invalid dass_today",
-                        "message": "Missing one of depression, anxiety, stress",
-                    }
-                ),
-                400,
-            )
-        dass_scores = [dass["depression"], dass["anxiety"], dass["stress"]]
-        if not all(isinstance(s, int) and 1 <= s <= 5 for s in dass_scores):
-            return (
-                jsonify(
-                    {
-                        "success": False,
-                        "error": "Invalid dass_today",
-                        "message": "All DASS scores must be integers between 1 and 5",
-                    }
-                ),
-                400,
-            )
+        dass_scores = list(_dass_values(dass))
 
         # Step 2 — Compute Daily Averages (1–5 scale)
         core_avg = sum(core_scores) / len(core_scores)
         rotating_avg = sum(rotating_scores) / len(rotating_scores)
 
         # Step 3 — Identify High & Low Points
-        all_scores = (
-            core_scores
-            + rotating_scores
-            + [dass["depression"], dass["anxiety"], dass["stress"]]
-        )
-        all_questions = [
-            "q1",
-            "q2",
-            "q3",
-            "q4",  # core
-            "q5",
-            "q6",
-            "q7",
-            "q8",
-            "q9",  # rotating
-            "q10",
-            "q11",
-            "q12",  # DASS
-        ]
-        high_idx = all_scores.index(max(all_scores))
-        low_idx = all_scores.index(min(all_scores))
+        # One pass per extreme; ties resolve to the first question, as before
+        all_scores = core_scores + rotating_scores + dass_scores
+        high_idx = max(QUESTION_INDEXES, key=all_scores.__getitem__)
+        low_idx = min(QUESTION_INDEXES, key=all_scores.__getitem__)
         high_point = {
-            "question_id": all_questions[high_idx],
+            "question_id": ALL_QUESTIONS[high_idx],
             "score": all_scores[high_idx],
         }
         low_point = {
-            "question_id": all_questions[low_idx],
+            "question_id": ALL_QUESTIONS[low_idx],
             "score": all_scores[low_idx],
         }
 
-        # Build Firestore document
+        # Build Firestore document. Validation guarantees each section has its
+        # required keys, so a section with no extra keys is stored as sent;
+        # otherwise it's rebuilt to keep unvalidated client fields out
         daily_doc = {
             "date": payload.get("date"),
-            "core_scores": {
-                "mood": core["mood"],
-                "energy": core["energy"],
-                "sleep": core["sleep"],
-                "stress": core["stress"],
-            },
-            "rotating_scores": {
-                "domain_name": rotating["domain_name"],
-                "scores": rotating_scores,
-            },
-            "dass_today": {
-                "depression": dass["depression"],
-                "anxiety": dass["anxiety"],
-                "stress": dass["stress"],
-            },
+            "core_scores": _stored_section(core, CORE_SCORE_KEYS, core_scores),
+            "rotating_scores": _stored_section(
+                rotating,
+                ROTATING_SCORE_KEYS,
+                (rotating["domain_name"], rotating_scores),
+            ),
+            "dass_today": _stored_section(dass, DASS_SCORE_KEYS, dass_scores),
             "high_point": high_point,
             "low_point": low_point,
             # Optionally include averages for analytics convenience
@@ -224,146 +223,71 @@ def submit_daily_quiz(user_id):
         result = upsert_daily_mood_log(user_id, daily_doc)
 
         if not result:
-            return (
-                jsonify(
-                    {
-                        "success": False,
-                        "error": "Database error",
-                        "message": "Failed to save daily mood log",
-                    }
-                ),
+            return json_response(
+                {
+                    "success": False,
+                    "error": "Database error",
+                    "message": "Failed to save daily mood log",
+                },
                 500,
             )
 
         log_id = result["doc_id"]
-        quiz_date = result["date"]
 
-        # Generate AI insights from today's quiz data with context-aware enrichment
-        try:
-            from stressease.services.ai_insight.ai_insight_service import (
-                generate_ai_insights,
-            )
+        # New mood data changes the chat context - rebuild it on the next session
+        invalidate_user_chain(user_id)
 
-            # Extract day_key from payload (default to "day_1" if missing)
-            day_key = payload.get("day_key", "day_1")
-
-            # Fetch questions from Firestore for this day
-            questions = get_daily_questions(day_key)
-
-            if questions:
-                print(f"✓ Fetched {len(questions)} questions for {day_key}")
-
-                # Map scores to question text for enriched Q&A context
-                # Questions structure: [4 core, 5 rotating, 3 DASS] = 12 total
-                enriched_qa = []
-
-                # Core questions (0-3)
-                core_labels = ["mood", "energy", "sleep", "stress"]
-                for i, label in enumerate(core_labels):
-                    if i < len(questions):
-                        q_text = questions[i].get(
-                            "text", f"{label.capitalize()} question"
-                        )
-                        score = core.get(label, 0)
-                        enriched_qa.append(
-                            {
-                                "question": q_text,
-                                "score": score,
-                                "dimension": "core",
-                                "label": label,
-                            }
-                        )
-
-                # Rotating questions (4-8)
-                for i in range(5):
-                    q_idx = 4 + i
-                    if q_idx < len(questions) and i < len(rotating_scores):
-                        q_text = questions[q_idx].get(
-                            "text", f"Rotating question {i+1}"
-                        )
-                        enriched_qa.append(
-                            {
-                                "question": q_text,
-                                "score": rotating_scores[i],
-                                "dimension": "rotating",
-                                "domain": rotating.get("domain_name", "unknown"),
-                            }
-                        )
-
-                # DASS questions (9-11)
-                dass_labels = ["depression", "anxiety", "stress"]
-                for i, label in enumerate(dass_labels):
-                    q_idx = 9 + i
-                    if q_idx < len(questions):
-                        q_text = questions[q_idx].get(
-                            "text", f"{label.capitalize()} question"
-                        )
-                        score = dass.get(label, 0)
-                        enriched_qa.append(
-                            {
-                                "question": q_text,
-                                "score": score,
-                                "dimension": "dass",
-                                "label": label,
-                            }
-                        )
-
-                # Add enriched Q&A to daily_doc
-                daily_doc["enriched_qa"] = enriched_qa
-            else:
-                print(f"⚠ No questions found for {day_key}, using scores only")
-
-            # Pass the enriched quiz data to insights generation
-            insights_result = generate_ai_insights(user_id, daily_doc)
-            if insights_result:
-                print(f"✓ AI insights generated for user {user_id} on {quiz_date}")
-            else:
-                print(f"⚠ AI insights generation failed for user {user_id}")
-        except Exception as e:
-            # Don't fail the quiz submission if insights generation fails
-            print(f"✗ Error generating AI insights for user {user_id}: {str(e)}")
+        # Generate AI insights in the background; the client reads them later
+        # from users/{uid}/ai_insights/latest
+        _submit_insights(user_id, dict(daily_doc), payload.get("day_key", "day_1"))
 
-        # After saving, check if we have 7 logs to trigger weekly DASS aggregation
+        # After saving, check if we have 7 logs to trigger weekly DASS aggregation.
+        # The daily and weekly writes can't share one batch: the count and the
+        # last 7 logs must be read after today's log is written. Insights are
+        # already written off-thread through the shared Firestore batcher.
         weekly_result = None
         # Only trigger when total count is a multiple of 7 (i.e., end of a 7-day block)
+        # Count is a single aggregation RPC; the logs are only read on block ends
         total_count = get_daily_mood_logs_count(user_id)
-        last_7 = get_last_daily_mood_logs(user_id, 7)
-        if total_count >= 7 and total_count % 7 == 0 and len(last_7) == 7:
-            # Extract DASS series
-            def _to_dass_scale(score: int) -> int:
-                mapping = {1: 0, 2: 1, 3: 1, 4: 2, 5: 3}
-                return mapping[int(score)]
-
-            depression_vals = [
-                entry.get("dass_today", {}).get("depression", 0) for entry in last_7
-            ]
-            anxiety_vals = [
-                entry.get("dass_today", {}).get("anxiety", 0) for entry in last_7
-            ]
-            stress_vals = [
-                entry.get("dass_today", {}).get("stress", 0) for entry in last_7
-            ]
-
-            depression_total = sum(_to_dass_scale(s) for s in depression_vals) * 2
-            anxiety_total = sum(_to_dass_scale(s) for s in anxiety_vals) * 2
-            stress_total = sum(_to_dass_scale(s) for s in stress_vals) * 2
-
-            # Determine week range based on earliest/latest dates in the 7 logs
-            # Prefer explicit 'date' field, else derive from submitted_at
-            def _extract_date(entry):
-                d = entry.get("date")
-                if d:
-                    return d
-                ts = entry.get("submitted_at")
-                try:
-                    # Firestore returns datetime for server timestamps
-                    if isinstance(ts, datetime):
-                        return ts.date().isoformat()
-                except Exception:
-                    pass
-                return None
-
-            dates = [d for d in (_extract_date(e) for e in last_7) if d]
+        last_7 = (
+            get_last_daily_mood_logs(user_id, WEEKLY_BLOCK_DAYS, WEEKLY_BLOCK_FIELDS)
+            if _completes_weekly_block(total_count)
+            else None
+        )
+        if last_7 and len(last_7) == WEEKLY_BLOCK_DAYS:
+            # Sum the DASS series and the weekly score totals in one pass. A
+            # server-side sum() aggregation can't replace this: DASS_SCALE is
+            # not linear in the stored answer index, and the same 7 logs are
+            # needed anyway for the core/rotating averages and the week range
+            depression_total = anxiety_total = stress_total = 0
+            core_total = rotating_total = rotating_days = 0
+            for entry in last_7:
+                dass_day = entry.get("dass_today", {})
+                depression_total += DASS_SCALE[int(dass_day.get("depression", 0))]
+                anxiety_total += DASS_SCALE[int(dass_day.get("anxiety", 0))]
+                stress_total += DASS_SCALE[int(dass_day.get("stress", 0))]
+
+                c = entry.get("core_scores", {})
+                core_total += (
+                    c.get("mood", 0)
+                    + c.get("energy", 0)
+                    + c.get("sleep", 0)
+                    + c.get("stress", 0)
+                )
+                rs = entry.get("rotating_scores", {}).get("scores", [])
+                if isinstance(rs, list) and len(rs) == 5:
+                    rotating_total += sum(rs)
+                    rotating_days += 1
+
+            # DASS-21 totals are doubled to the DASS-42 scale
+            depression_total *= 2
+            anxiety_total *= 2
+            stress_total *= 2
+
+            # Week range from the earliest/latest log dates. upsert_daily_mood_log
+            # always stores "date" (it's part of the doc ID), and ISO date
+            # strings compare in date order
+            dates = [entry["date"] for entry in last_7 if entry.get("date")]
             if dates:
                 week_start = min(dates)
                 week_end = max(dates)
@@ -372,75 +296,289 @@ def submit_daily_quiz(user_id):
                 week_start = date.today().isoformat()
                 week_end = week_start
 
-            # Avoid duplicates: only save if a record for this range doesn't exist
-            if not weekly_dass_exists(user_id, week_start, week_end):
-                weekly_id = save_weekly_dass_totals(
-                    user_id,
-                    week_start,
-                    week_end,
-                    depression_total,
-                    anxiety_total,
-                    stress_total,
+            # Avoid duplicates: the write is skipped if this range was already saved
+            weekly_id = save_weekly_dass_totals(
+                user_id,
+                week_start,
+                week_end,
+                depression_total,
+                anxiety_total,
+                stress_total,
+            )
+            if weekly_id:
+                # Optional weekly summary for response (not stored): the
+                # mean of the daily averages, from the totals summed above
+                weekly_core_avg = round(core_total / (4 * len(last_7)), 2)
+                weekly_rotating_avg = (
+                    round(rotating_total / (5 * rotating_days), 2)
+                    if rotating_days
+                    else None
                 )
-                if weekly_id:
-                    # Compute optional weekly summary for response (not stored)
-                    core_avgs_per_day = []
-                    rotating_avgs_per_day = []
-                    for entry in last_7:
-                        c = entry.get("core_scores", {})
-                        r = entry.get("rotating_scores", {})
-                        cs = [
-                            c.get("mood", 0),
-                            c.get("energy", 0),
-                            c.get("sleep", 0),
-                            c.get("stress", 0),
-                        ]
-                        rs = r.get("scores", [])
-                        if len(cs) == 4:
-                            core_avgs_per_day.append(sum(cs) / 4)
-                        if isinstance(rs, list) and len(rs) == 5:
-                            rotating_avgs_per_day.append(sum(rs) / 5)
-
-                    weekly_core_avg = (
-                        round(sum(core_avgs_per_day) / len(core_avgs_per_day), 2)
-                        if core_avgs_per_day
-                        else None
-                    )
-                    weekly_rotating_avg = (
-                        round(
-                            sum(rotating_avgs_per_day) / len(rotating_avgs_per_day), 2
-                        )
-                        if rotating_avgs_per_day
-                        else None
-                    )
-
-                    weekly_result = {
-                        "weekly_id": weekly_id,
-                        "week_start": week_start,
-                        "week_end": week_end,
-                        "depression_total": depression_total,
-                        "anxiety_total": anxiety_total,
-                        "stress_total": stress_total,
-                        "weekly_core_avg": weekly_core_avg,
-                        "weekly_rotating_avg": weekly_rotating_avg,
-                    }
 
-        return (
-            jsonify(
-                {
-                    "success": True,
-                    "message": "Daily mood quiz saved successfully",
-                    "log_id": log_id,
-                    "high_point": high_point,
-                    "low_point": low_point,
-                    "weekly_dass": weekly_result,
+                weekly_result = {
+                    "weekly_id": weekly_id,
+                    "week_start": week_start,
+                    "week_end": week_end,
+                    "depression_total": depression_total,
+                    "anxiety_total": anxiety_total,
+                    "stress_total": stress_total,
+                    "weekly_core_avg": weekly_core_avg,
+                    "weekly_rotating_avg": weekly_rotating_avg,
                 }
-            ),
+
+        return json_response(
+            {
+                "success": True,
+                "message": "Daily mood quiz saved successfully",
+                "log_id": log_id,
+                "high_point": high_point,
+                "low_point": low_point,
+                "weekly_dass": weekly_result,
+            },
             201,
         )
 
     except Exception as e:
+        return json_response(
+            {"success": False, "error": "Server error", "message": str(e)}, 500
+        )
+
+
+# ******************************************************************************
+# * Helpers
+# ******************************************************************************
+
+
+def _is_valid_quiz_payload(payload):
+    """
+    Fast validity check for a daily quiz payload.
+
+    The compiled schema covers structure and the 1-5 range; _are_valid_scores()
+    additionally rejects floats such as 3.0, which JSON Schema treats as integers.
+    """
+    try:
+        _quiz_payload_validator(payload)
+    except fastjsonschema.JsonSchemaException:
+        return False
+
+    core = payload["core_scores"]
+    dass = payload["dass_today"]
+    return _are_valid_scores(
+        (
+            *_core_values(core),
+            *payload["rotating_scores"]["scores"],
+            *_dass_values(dass),
+        )
+    )
+
+
+def _quiz_payload_error(payload):
+    """
+    Find the first problem with a daily quiz payload.
+
+    Returns:
+        Optional[Tuple[str, str]]: (error, message) for the 400 response, or
+                                   None if the payload is valid
+    """
+    # Validate required sections
+    core = payload.get("core_scores")
+    rotating = payload.get("rotating_scores")
+    dass = payload.get("dass_today")
+
+    if not core or not rotating or not dass:
         return (
-            jsonify({"success": False, "error": "Server error", "message": str(e)}),
-            500,
+            "Missing required fields",
+            "core_scores, rotating_scores, and dass_today are required",
+        )
+
+    # Validate core scores
+    try:
+        core_scores = _core_values(core)
+    except (KeyError, TypeError):
+        return "Invalid core_scores", "Missing one of mood, energy, sleep, stress"
+    if not _are_valid_scores(core_scores):
+        return "Invalid core_scores", "All core scores must be integers between 1 and 5"
+
+    # Validate rotating scores
+    if "domain_name" not in rotating or "scores" not in rotating:
+        return "Invalid rotating_scores", "domain_name and scores are required"
+    if not isinstance(rotating["scores"], list) or len(rotating["scores"]) != 5:
+        return "Invalid rotating_scores", "scores must be a list of 5 integers"
+    rotating_scores = rotating["scores"]
+    if not _are_valid_scores(rotating_scores):
+        return (
+            "Invalid rotating_scores",
+            "All rotating scores must be integers between 1 and 5",
+        )
+
+    # Validate DASS today
+    try:
+        dass_scores = _dass_values(dass)
+    except (KeyError, TypeError):
+        return "Invalid dass_today", "Missing one of depression, anxiety, stress"
+    if not _are_valid_scores(dass_scores):
+        return "Invalid dass_today", "All DASS scores must be integers between 1 and 5"
+
+    return None
+
+
+def _stored_section(section, keys, values):
+    """
+    Return a validated score section as it should be stored.
+
+    Args:
+        section (dict): Section from the payload, known to contain every key
+        keys (tuple): The section's expected keys
+        values (Sequence): The section's values, in key order
+
+    Returns:
+        dict: section itself if it has no extra keys, else a copy of only keys
+    """
+    if len(section) == len(keys):
+        return section
+    return dict(zip(keys, values))
+
+
+def _completes_weekly_block(total_count: int) -> bool:
+    """
+    Check whether the latest log closes a weekly block (day 7, 14, 21, ...).
+
+    Checked before the last logs are fetched, so the other six submissions of
+    each week cost only the count query.
+
+    Args:
+        total_count (int): Number of daily logs the user has, including today's
+
+    Returns:
+        bool: True if the weekly DASS totals should be computed
+    """
+    return total_count >= WEEKLY_BLOCK_DAYS and total_count % WEEKLY_BLOCK_DAYS == 0
+
+
+def _are_valid_scores(scores):
+    """
+    Check that every score is an integer between 1 and 5.
+
+    Equivalent to all(isinstance(s, int) and 1 <= s <= 5 for s in scores), but
+    both checks are C-level set operations instead of a generator per call.
+    Types are checked first: it rejects floats like 3.0 (equal to 3) and keeps
+    unhashable values such as lists away from the value check.
+    """
+    if not VALID_SCORE_TYPES.issuperset(map(type, scores)):
+        return False
+    return VALID_SCORE_VALUES.issuperset(scores)
+
+
+# ******************************************************************************
+# * Background AI insights
+# ******************************************************************************
+
+# Gemini insight calls run off the request thread; bounded so a Gemini slowdown
+# can't queue work without limit - once full, new submissions are dropped (the
+# previous insights stay in place until the user's next daily log)
+INSIGHTS_MAX_WORKERS = 8
+INSIGHTS_MAX_PENDING = 64
+_insights_executor = ThreadPoolExecutor(
+    max_workers=INSIGHTS_MAX_WORKERS, thread_name_prefix="insights-"
+)
+_insights_slots = threading.BoundedSemaphore(INSIGHTS_MAX_PENDING)
+atexit.register(_insights_executor.shutdown, wait=False)
+
+
+def _submit_insights(user_id, daily_doc, day_key):
+    """Queue insight generation, or drop it if the queue is full."""
+    if not _insights_slots.acquire(blocking=False):
+        logger.warning(
+            "Insight queue full (%d pending): skipped insights for %s",
+            INSIGHTS_MAX_PENDING,
+            user_id,
         )
+        return
+
+    def _task():
+        try:
+            _generate_daily_insights(user_id, daily_doc, day_key)
+        finally:
+            _insights_slots.release()
+
+    _insights_executor.submit(_task)
+
+
+def _generate_daily_insights(user_id, daily_doc, day_key):
+    """
+    Enrich the saved quiz with question text and generate AI insights from it.
+
+    Insights are written to users/{uid}/ai_insights/latest by the service.
+
+    Args:
+        user_id (str): User ID
+        daily_doc (dict): Saved daily mood log (mutated with enriched_qa)
+        day_key (str): Question set key used for this quiz
+    """
+    core = daily_doc["core_scores"]
+    rotating = daily_doc["rotating_scores"]
+    rotating_scores = rotating["scores"]
+    dass = daily_doc["dass_today"]
+    quiz_date = daily_doc["date"]
+
+    try:
+        from stressease.services.ai_insight.ai_insight_service import (
+            generate_ai_insights,
+        )
+
+        # Fetch questions from Firestore for this day
+        questions = get_daily_questions(day_key)
+
+        if questions:
+            logger.debug("Fetched %d questions for %s", len(questions), day_key)
+
+            # Map scores to question text for enriched Q&A context
+            # Questions structure: [4 core, 5 rotating, 3 DASS] = 12 total
+            by_dimension = {"core": core, "dass": dass}
+            domain = rotating.get("domain_name", "unknown")
+            enriched_qa = []
+
+            for q_idx, (dimension, label) in enumerate(
+                QUESTION_LAYOUT[: len(questions)]
+            ):
+                if label is None:
+                    # Rotating questions (4-8) are positional
+                    i = q_idx - 4
+                    if i >= len(rotating_scores):
+                        continue
+                    enriched_qa.append(
+                        {
+                            "question": questions[q_idx].get(
+                                "text", f"Rotating question {i+1}"
+                            ),
+                            "score": rotating_scores[i],
+                            "dimension": dimension,
+                            "domain": domain,
+                        }
+                    )
+                else:
+                    enriched_qa.append(
+                        {
+                            "question": questions[q_idx].get(
+                                "text", f"{label.capitalize()} question"
+                            ),
+                            "score": by_dimension[dimension].get(label, 0),
+                            "dimension": dimension,
+                            "label": label,
+                        }
+                    )
+
+            # Add enriched Q&A to daily_doc
+            daily_doc["enriched_qa"] = enriched_qa
+        else:
+            logger.warning("No questions found for %s, using scores only", day_key)
+
+        # Pass the enriched quiz data to insights generation
+        insights_result = generate_ai_insights(user_id, daily_doc)
+        if insights_result:
+            logger.debug("AI insights generated for user %s on %s", user_id, quiz_date)
+        else:
+            logger.warning("AI insights generation failed for user %s", user_id)
+    except Exception:
+        # Don't fail the quiz submission if insights generation fails
+        logger.exception("Error generating AI insights for user %s", user_id)
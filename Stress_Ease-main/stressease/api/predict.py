@@ -1,8 +1,12 @@
 """Stress prediction endpoint."""
 
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request
 from stressease.services.utility.auth_service import token_required
+from stressease.services.utility.json_response import json_response
 from stressease.services.prediction.prediction_service import predict_stress
+import logging
+
+logger = logging.getLogger(__name__)
 
 # Create the predict blueprint
 predict_bp = Blueprint("predict", __name__)
@@ -41,24 +45,25 @@ def predict(user_id):
     }
     """
     try:
-        # DEBUG: Log incoming request details
-        print(f"\n{'='*60}")
-        print(f"📥 Incoming /api/predict request from user: {user_id}")
-        print(f"Headers: {dict(request.headers)}")
-        print(f"{'='*60}\n")
-
+        # DEBUG: Log incoming request details (skipped unless DEBUG is enabled)
         payload = request.get_json()
-        print(f"📦 Payload received: {payload}")
+        if logger.isEnabledFor(logging.DEBUG):
+            headers = {
+                name: value
+                for name, value in request.headers.items()
+                if name.lower() != "authorization"
+            }
+            logger.debug("Incoming /api/predict request from user: %s", user_id)
+            logger.debug("Headers (Authorization omitted): %s", headers)
+            logger.debug("Payload received: %s", payload)
 
         if not payload:
-            return (
-                jsonify(
-                    {
-                        "success": False,
-                        "error": "Invalid request",
-                        "message": "JSON body required",
-                    }
-                ),
+            return json_response(
+                {
+                    "success": False,
+                    "error": "Invalid request",
+                    "message": "JSON body required",
+                },
                 400,
             )
 
@@ -69,14 +74,12 @@ def predict(user_id):
 
         # Validate all required fields are present
         if avg_mood_score is None or chat_count is None or avg_quiz_score is None:
-            return (
-                jsonify(
-                    {
-                        "success": False,
-                        "error": "Missing required fields",
-                        "message": "avgMoodScore, chatCount, and avgQuizScore are required",
-                    }
-                ),
+            return json_response(
+                {
+                    "success": False,
+                    "error": "Missing required fields",
+                    "message": "avgMoodScore, chatCount, and avgQuizScore are required",
+                },
                 400,
             )
 
@@ -84,25 +87,21 @@ def predict(user_id):
         try:
             avg_mood_score = float(avg_mood_score)
             if avg_mood_score < 1.0 or avg_mood_score > 5.0:
-                return (
-                    jsonify(
-                        {
-                            "success": False,
-                            "error": "Invalid Input",
-                            "message": "avgMoodScore must be between 1.0 and 5.0",
-                        }
-                    ),
-                    400,
-                )
-        except (TypeError, ValueError):
-            return (
-                jsonify(
+                return json_response(
                     {
                         "success": False,
                         "error": "Invalid Input",
-                        "message": "avgMoodScore must be a number between 1.0 and 5.0",
-                    }
-                ),
+                        "message": "avgMoodScore must be between 1.0 and 5.0",
+                    },
+                    400,
+                )
+        except (TypeError, ValueError):
+            return json_response(
+                {
+                    "success": False,
+                    "error": "Invalid Input",
+                    "message": "avgMoodScore must be a number between 1.0 and 5.0",
+                },
                 400,
             )
 
@@ -110,25 +109,21 @@ def predict(user_id):
         try:
             chat_count = int(chat_count)
             if chat_count < 0 or chat_count > 999:
-                return (
-                    jsonify(
-                        {
-                            "success": False,
-                            "error": "Invalid Input",
-                            "message": "chatCount must be between 0 and 999",
-                        }
-                    ),
-                    400,
-                )
-        except (TypeError, ValueError):
-            return (
-                jsonify(
+                return json_response(
                     {
                         "success": False,
                         "error": "Invalid Input",
-                        "message": "chatCount must be an integer between 0 and 999",
-                    }
-                ),
+                        "message": "chatCount must be between 0 and 999",
+                    },
+                    400,
+                )
+        except (TypeError, ValueError):
+            return json_response(
+                {
+                    "success": False,
+                    "error": "Invalid Input",
+                    "message": "chatCount must be an integer between 0 and 999",
+                },
                 400,
             )
 
@@ -136,25 +131,21 @@ def predict(user_id):
         try:
             avg_quiz_score = int(avg_quiz_score)
             if avg_quiz_score < 0 or avg_quiz_score > 60:
-                return (
-                    jsonify(
-                        {
-                            "success": False,
-                            "error": "Invalid Input",
-                            "message": "avgQuizScore must be between 0 and 60",
-                        }
-                    ),
-                    400,
-                )
-        except (TypeError, ValueError):
-            return (
-                jsonify(
+                return json_response(
                     {
                         "success": False,
                         "error": "Invalid Input",
-                        "message": "avgQuizScore must be an integer between 0 and 60",
-                    }
-                ),
+                        "message": "avgQuizScore must be between 0 and 60",
+                    },
+                    400,
+                )
+        except (TypeError, ValueError):
+            return json_response(
+                {
+                    "success": False,
+                    "error": "Invalid Input",
+                    "message": "avgQuizScore must be an integer between 0 and 60",
+                },
                 400,
             )
 
@@ -162,19 +153,16 @@ def predict(user_id):
         prediction = predict_stress(avg_mood_score, chat_count, avg_quiz_score)
 
         # Return successful response
-        return (
-            jsonify(
-                {
-                    "success": True,
-                    "prediction": prediction,
-                }
-            ),
+        return json_response(
+            {
+                "success": True,
+                "prediction": prediction,
+            },
             200,
         )
 
     except Exception as e:
-        print(f"✗ Error in /api/predict for user {user_id}: {str(e)}")
-        return (
-            jsonify({"success": False, "error": "Server error", "message": str(e)}),
-            500,
+        logger.exception("Error in /api/predict for user %s", user_id)
+        return json_response(
+            {"success": False, "error": "Server error", "message": str(e)}, 500
         )
@@ -5,36 +5,130 @@ This service generates personalized mental health recommendations based on
 current day's mood quiz data using Google Gemini LLM.
 """
 
-from typing import Dict, List, Optional, Any
-from datetime import datetime
-from pydantic import BaseModel, Field
-from langchain_core.prompts import PromptTemplate
-from langchain_core.output_parsers import PydanticOutputParser
+from typing import Dict, Optional, Any
+from firebase_admin import firestore
 
 from stressease.services.utility.firebase_config import get_firestore_client
-from stressease.services.chat.llm_service import base_llm
+from stressease.services.utility.firestore_batcher import firestore_batcher
+from stressease.services.chat import llm_service
+import logging
+
+logger = logging.getLogger(__name__)
 
 
 # ============================================================================
-# PYDANTIC MODELS FOR STRUCTURED OUTPUT
+# STRUCTURED OUTPUT SCHEMA
 # ============================================================================
 
+# JSON schema for Gemini JSON mode. The model's output is returned as a plain
+# dict - _validate_insights_structure() checks it before it's saved.
+AI_INSIGHTS_SCHEMA = {
+    "title": "AIInsights",
+    "description": "Structured AI insights output for daily mood quiz.",
+    "type": "object",
+    "properties": {
+        "dominant_emotion": {
+            "type": "string",
+            "description": "Dominant emotion based on today's scores: Happy/Neutral/Sad/Anxious/Stressed/Energetic/Calm/Tired",
+        },
+        "summary": {
+            "type": "string",
+            "description": "2-3 sentence summary of today's mood state and key observations",
+        },
+        "motivation_quote": {
+            "type": "string",
+            "description": "Short motivational quote with emoji, personalized to today's mood",
+        },
+        "suggestions": {
+            "type": "array",
+            "items": {"type": "string"},
+            "description": "3-5 actionable suggestions for today/tomorrow, specific to detected issues",
+        },
+    },
+    "required": ["dominant_emotion", "summary", "motivation_quote", "suggestions"],
+}
+
+
+# Required insight fields and their types, checked by _validate_insights_structure()
+INSIGHT_FIELD_TYPES = {
+    "dominant_emotion": str,
+    "summary": str,
+    "motivation_quote": str,
+    "suggestions": list,
+}
 
-class AIInsights(BaseModel):
-    """Structured AI insights output for daily mood quiz."""
 
-    dominant_emotion: str = Field(
-        description="Dominant emotion based on today's scores: Happy/Neutral/Sad/Anxious/Stressed/Energetic/Calm/Tired"
-    )
-    summary: str = Field(
-        description="2-3 sentence summary of today's mood state and key observations"
-    )
-    motivation_quote: str = Field(
-        description="Short motivational quote with emoji, personalized to today's mood"
-    )
-    suggestions: List[str] = Field(
-        description="3-5 actionable suggestions for today/tomorrow, specific to detected issues"
-    )
+# ============================================================================
+# PROMPTS
+# ============================================================================
+
+# Daily insights prompt; {mood_data} is filled with _build_daily_prompt() output
+DAILY_INSIGHTS_PROMPT = """You are a compassionate AI mental health assistant analyzing daily mood quiz data.
+
+Based on today's mood quiz scores, provide personalized insights and suggestions.
+
+**Today's Mood Data:**
+{mood_data}
+
+**Score Interpretation:**
+- 1 = Very Poor/Very Low
+- 2 = Poor/Low
+- 3 = Moderate/Average
+- 4 = Good/High
+- 5 = Excellent/Very High
+
+**Instructions:**
+1. **Dominant Emotion**: Choose the most fitting emotion based on all scores (Happy/Neutral/Sad/Anxious/Stressed/Energetic/Calm/Tired)
+2. **Summary**: Write 2-3 sentences about today's mood state, highlighting key observations
+3. **Motivation Quote**: Create a short, encouraging quote with emoji that resonates with today's mood
+4. **Suggestions**: Provide 3-5 specific, actionable suggestions for today/tomorrow addressing detected issues
+
+**Tone**: Empathetic, supportive, non-clinical. Avoid medical terminology or diagnosis.
+
+Generate insights:"""
+
+
+# Descriptive label for each 1-5 answer, indexed by score; index 0 is the
+# label for a missing or out-of-range score
+SCORE_LABELS = (
+    "Unknown",
+    "Very Poor/Very Low",
+    "Poor/Low",
+    "Moderate/Average",
+    "Good/High",
+    "Excellent/Very High",
+)
+
+# Prompt fragments used by _build_daily_prompt(). Each Q&A is one templated
+# chunk, so the prompt is assembled with one join instead of line-by-line.
+ENRICHED_QA_HEADER = "\n**Today's Quiz Responses (Question & Answer):**\n"
+
+DIMENSION_HEADERS = {
+    "core": "**Core Well-being:**",
+    "dass": "**Mental Health Indicators (DASS-21):**",
+}
+
+QA_TEMPLATE = "  Q: {question}\n  A: {score}/5 ({label})\n"
+
+CORE_METRICS_TEMPLATE = (
+    "\nCore Metrics:\n"
+    "  - Mood: {mood}/5\n"
+    "  - Energy: {energy}/5\n"
+    "  - Sleep Quality: {sleep}/5\n"
+    "  - Stress Level: {stress}/5"
+)
+
+DASS_METRICS_TEMPLATE = (
+    "\nMental Health Indicators (DASS-21):\n"
+    "  - Depression: {depression}/5\n"
+    "  - Anxiety: {anxiety}/5\n"
+    "  - Stress: {stress}/5"
+)
+
+
+# Structured-output runnable built once per base_llm instance
+_insights_llm = None
+_insights_llm_base = None
 
 
 # ============================================================================
@@ -60,25 +154,25 @@ def generate_ai_insights(
         insights = analyze_daily_mood(daily_quiz_data)
 
         if not insights:
-            print(f"⚠ LLM returned no insights for user {user_id}")
+            logger.warning("LLM returned no insights for user %s", user_id)
             return None
 
         # Validate structure
         if not _validate_insights_structure(insights):
-            print(f"⚠ Invalid insights structure for user {user_id}")
+            logger.warning("Invalid insights structure for user %s", user_id)
             return None
 
         # Save to Firestore
         success = save_ai_insights_to_firestore(user_id, insights)
 
         if not success:
-            print(f"⚠ Failed to save insights to Firestore for user {user_id}")
+            logger.warning("Failed to save insights to Firestore for user %s", user_id)
             return None
 
         return insights
 
-    except Exception as e:
-        print(f"✗ Error generating AI insights for user {user_id}: {str(e)}")
+    except Exception:
+        logger.exception("Error generating AI insights for user %s", user_id)
         return None
 
 
@@ -86,7 +180,7 @@ def analyze_daily_mood(quiz_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
     """
     Analyze current day's mood quiz data using Google Gemini LLM.
 
-    Uses structured output with Pydantic parser for reliable JSON generation.
+    Uses Gemini's native JSON mode with AI_INSIGHTS_SCHEMA for reliable JSON.
 
     Args:
         quiz_data (dict): Daily quiz data (core_scores, dass_today, rotating_scores, etc.)
@@ -94,58 +188,20 @@ def analyze_daily_mood(quiz_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
     Returns:
         Optional[Dict]: Insights dictionary or None if analysis fails
     """
-    if base_llm is None:
+    if llm_service.base_llm is None:
         raise RuntimeError("Gemini models not initialized. Call init_gemini() first.")
 
     try:
-        # Create Pydantic output parser
-        parser = PydanticOutputParser(pydantic_object=AIInsights)
-
-        # Build prompt with daily quiz data
-        prompt_template = PromptTemplate(
-            template="""You are a compassionate AI mental health assistant analyzing daily mood quiz data.
-
-Based on today's mood quiz scores, provide personalized insights and suggestions.
-
-**Today's Mood Data:**
-{mood_data}
-
-**Score Interpretation:**
-- 1 = Very Poor/Very Low
-- 2 = Poor/Low
-- 3 = Moderate/Average
-- 4 = Good/High
-- 5 = Excellent/Very High
-
-**Instructions:**
-1. **Dominant Emotion**: Choose the most fitting emotion based on all scores (Happy/Neutral/Sad/Anxious/Stressed/Energetic/Calm/Tired)
-2. **Summary**: Write 2-3 sentences about today's mood state, highlighting key observations
-3. **Motivation Quote**: Create a short, encouraging quote with emoji that resonates with today's mood
-4. **Suggestions**: Provide 3-5 specific, actionable suggestions for today/tomorrow addressing detected issues
-
-**Tone**: Empathetic, supportive, non-clinical. Avoid medical terminology or diagnosis.
-
-{format_instructions}
-
-Generate insights:""",
-            input_variables=["mood_data"],
-            partial_variables={"format_instructions": parser.get_format_instructions()},
-        )
-
         # Format the quiz data for the prompt
         mood_data_text = _build_daily_prompt(quiz_data)
 
-        # Chain: Prompt → Base LLM → Parser (LCEL)
-        chain = prompt_template | base_llm | parser
-
-        # Execute chain
-        insights_model = chain.invoke({"mood_data": mood_data_text})
-
-        # Convert Pydantic model to dict
-        return insights_model.dict()
+        # Parsed straight to a dict - no model instance or .dict() round trip
+        return _get_insights_llm().invoke(
+            DAILY_INSIGHTS_PROMPT.format(mood_data=mood_data_text)
+        )
 
-    except Exception as e:
-        print(f"Error analyzing daily mood: {str(e)}")
+    except Exception:
+        logger.exception("Error analyzing daily mood")
         return None
 
 
@@ -153,23 +209,28 @@ def save_ai_insights_to_firestore(user_id: str, insights: Dict[str, Any]) -> boo
     """
     Write AI insights to Firestore at users/{userId}/ai_insights/latest.
 
+    The write goes through the shared FirestoreBatcher, so the insights worker
+    is free for the next Gemini call as soon as the response has been parsed
+    instead of waiting on the Firestore round trip.
+
     Args:
         user_id (str): Firebase Auth user ID
         insights (dict): Insights data to save
 
     Returns:
-        bool: True if successful, False otherwise
+        bool: True if the write was queued, False otherwise
     """
-    db = get_firestore_client()
-
     try:
+        db = get_firestore_client()
+
         # Add metadata
         insights_doc = {
             "dominant_emotion": insights["dominant_emotion"],
             "summary": insights["summary"],
             "motivation_quote": insights["motivation_quote"],
             "suggestions": insights["suggestions"],
-            "generated_at": datetime.utcnow(),
+            # Filled in by Firestore so insights order by server time
+            "generated_at": firestore.SERVER_TIMESTAMP,
         }
 
         # Write to Firestore (overwrites previous insights)
@@ -179,13 +240,13 @@ def save_ai_insights_to_firestore(user_id: str, insights: Dict[str, Any]) -> boo
             .collection("ai_insights")
             .document("latest")
         )
-        doc_ref.set(insights_doc)
+        firestore_batcher.enqueue(doc_ref, "set", insights_doc)
 
-        print(f"✓ AI insights saved to Firestore for user {user_id}")
+        logger.debug("AI insights queued for Firestore for user %s", user_id)
         return True
 
-    except Exception as e:
-        print(f"✗ Error saving insights to Firestore for user {user_id}: {str(e)}")
+    except Exception:
+        logger.exception("Error saving insights to Firestore for user %s", user_id)
         return False
 
 
@@ -194,6 +255,29 @@ def save_ai_insights_to_firestore(user_id: str, insights: Dict[str, Any]) -> boo
 # ============================================================================
 
 
+def _get_insights_llm():
+    """
+    Get the base model bound to Gemini JSON mode with AI_INSIGHTS_SCHEMA.
+
+    Decoding is constrained to the schema, so no format instructions are sent
+    and no text parsing/retry is needed. The binding (including the schema
+    conversion) is built once and reused until init_gemini() replaces base_llm.
+
+    Returns:
+        Runnable: Prompt text -> insights dict
+    """
+    global _insights_llm, _insights_llm_base
+
+    base_llm = llm_service.base_llm
+    if _insights_llm is None or _insights_llm_base is not base_llm:
+        _insights_llm = base_llm.with_structured_output(
+            AI_INSIGHTS_SCHEMA, method="json_schema"
+        )
+        _insights_llm_base = base_llm
+
+    return _insights_llm
+
+
 def _build_daily_prompt(quiz_data: Dict[str, Any]) -> str:
     """
     Format daily quiz data into readable text for LLM prompt.
@@ -206,72 +290,46 @@ def _build_daily_prompt(quiz_data: Dict[str, Any]) -> str:
     Returns:
         str: Formatted mood data text
     """
-    lines = []
-
     # Date
-    date = quiz_data.get("date", "Unknown")
-    lines.append(f"Date: {date}")
+    parts = [f"Date: {quiz_data.get('date', 'Unknown')}"]
 
     # Check if we have enriched Q&A data
     enriched_qa = quiz_data.get("enriched_qa", [])
 
     if enriched_qa:
         # Use enriched Q&A format for better context
-        lines.append("\n**Today's Quiz Responses (Question & Answer):**\n")
-
-        # Group by dimension for better readability
-        core_qa = [qa for qa in enriched_qa if qa.get("dimension") == "core"]
-        rotating_qa = [qa for qa in enriched_qa if qa.get("dimension") == "rotating"]
-        dass_qa = [qa for qa in enriched_qa if qa.get("dimension") == "dass"]
-
-        if core_qa:
-            lines.append("**Core Well-being:**")
-            for qa in core_qa:
-                score = qa.get("score", 0)
-                question = qa.get("question", "")
-                score_label = _get_score_label(score)
-                lines.append(f"  Q: {question}")
-                lines.append(f"  A: {score}/5 ({score_label})")
-                lines.append("")
-
-        if rotating_qa:
-            domain = rotating_qa[0].get("domain", "Life Area")
-            lines.append(f"**{domain.capitalize()} Domain:**")
-            for qa in rotating_qa:
-                score = qa.get("score", 0)
-                question = qa.get("question", "")
-                score_label = _get_score_label(score)
-                lines.append(f"  Q: {question}")
-                lines.append(f"  A: {score}/5 ({score_label})")
-                lines.append("")
-
-        if dass_qa:
-            lines.append("**Mental Health Indicators (DASS-21):**")
-            for qa in dass_qa:
-                score = qa.get("score", 0)
-                question = qa.get("question", "")
-                score_label = _get_score_label(score)
-                lines.append(f"  Q: {question}")
-                lines.append(f"  A: {score}/5 ({score_label})")
-                lines.append("")
+        parts.append(ENRICHED_QA_HEADER)
+
+        # Group by dimension in one pass (dict keeps core/rotating/dass order)
+        grouped = {"core": [], "rotating": [], "dass": []}
+        for qa in enriched_qa:
+            group = grouped.get(qa.get("dimension"))
+            if group is not None:
+                group.append(qa)
+
+        for dimension, qa_items in grouped.items():
+            if not qa_items:
+                continue
+
+            if dimension == "rotating":
+                domain = qa_items[0].get("domain", "Life Area")
+                header = f"**{domain.capitalize()} Domain:**"
+            else:
+                header = DIMENSION_HEADERS[dimension]
+
+            # Whole section (header + every Q&A) built by a single join
+            parts.append("\n".join([header, *map(_format_qa, qa_items)]))
     else:
         # Fallback to original score-only format
         # Core scores
         core = quiz_data.get("core_scores", {})
         if core:
-            lines.append(f"\nCore Metrics:")
-            lines.append(f"  - Mood: {core.get('mood', 'N/A')}/5")
-            lines.append(f"  - Energy: {core.get('energy', 'N/A')}/5")
-            lines.append(f"  - Sleep Quality: {core.get('sleep', 'N/A')}/5")
-            lines.append(f"  - Stress Level: {core.get('stress', 'N/A')}/5")
+            parts.append(CORE_METRICS_TEMPLATE.format_map(_MissingAsNA(core)))
 
         # DASS scores
         dass = quiz_data.get("dass_today", {})
         if dass:
-            lines.append(f"\nMental Health Indicators (DASS-21):")
-            lines.append(f"  - Depression: {dass.get('depression', 'N/A')}/5")
-            lines.append(f"  - Anxiety: {dass.get('anxiety', 'N/A')}/5")
-            lines.append(f"  - Stress: {dass.get('stress', 'N/A')}/5")
+            parts.append(DASS_METRICS_TEMPLATE.format_map(_MissingAsNA(dass)))
 
         # Rotating domain
         rotating = quiz_data.get("rotating_scores", {})
@@ -280,38 +338,45 @@ def _build_daily_prompt(quiz_data: Dict[str, Any]) -> str:
             scores = rotating.get("scores", [])
             if scores:
                 avg_domain = sum(scores) / len(scores)
-                lines.append(f"\n{domain_name.capitalize()} Domain:")
-                lines.append(f"  - Average Score: {avg_domain:.1f}/5")
-                lines.append(f"  - Individual Scores: {scores}")
+                parts.append(
+                    f"\n{domain_name.capitalize()} Domain:\n"
+                    f"  - Average Score: {avg_domain:.1f}/5\n"
+                    f"  - Individual Scores: {scores}"
+                )
 
         # Calculated averages
         core_avg = quiz_data.get("core_avg")
         rotating_avg = quiz_data.get("rotating_avg")
         if core_avg is not None:
-            lines.append(f"\nOverall Core Average: {core_avg:.2f}/5")
+            parts.append(f"\nOverall Core Average: {core_avg:.2f}/5")
         if rotating_avg is not None:
-            lines.append(
+            parts.append(
                 f"Overall {rotating.get('domain_name', 'Domain')} Average: {rotating_avg:.2f}/5"
             )
 
     # Additional notes (always include if present)
     notes = quiz_data.get("additional_notes", "")
     if notes:
-        lines.append(f"\nUser Notes: {notes}")
+        parts.append(f"\nUser Notes: {notes}")
+
+    return "\n".join(parts)
+
+
+def _format_qa(qa: Dict[str, Any]) -> str:
+    """Render one enriched Q&A item as its prompt lines."""
+    score = qa.get("score", 0)
+    return QA_TEMPLATE.format(
+        question=qa.get("question", ""),
+        score=score,
+        label=SCORE_LABELS[score if isinstance(score, int) and 0 < score < 6 else 0],
+    )
 
-    return "\n".join(lines)
 
+class _MissingAsNA(dict):
+    """format_map() mapping that renders missing scores as N/A."""
 
-def _get_score_label(score: int) -> str:
-    """Convert numeric score to descriptive label."""
-    labels = {
-        1: "Very Poor/Very Low",
-        2: "Poor/Low",
-        3: "Moderate/Average",
-        4: "Good/High",
-        5: "Excellent/Very High",
-    }
-    return labels.get(score, "Unknown")
+    def __missing__(self, key: str) -> str:
+        return "N/A"
 
 
 def _validate_insights_structure(insights: Dict[str, Any]) -> bool:
@@ -324,27 +389,24 @@ def _validate_insights_structure(insights: Dict[str, Any]) -> bool:
     Returns:
         bool: True if valid, False otherwise
     """
-    required_fields = {
-        "dominant_emotion": str,
-        "summary": str,
-        "motivation_quote": str,
-        "suggestions": list,
-    }
-
-    for field, expected_type in required_fields.items():
+    for field, expected_type in INSIGHT_FIELD_TYPES.items():
         if field not in insights:
-            print(f"⚠ Missing required field: {field}")
+            logger.warning("Missing required field: %s", field)
             return False
 
         if not isinstance(insights[field], expected_type):
-            print(
-                f"⚠ Invalid type for {field}: expected {expected_type}, got {type(insights[field])}"
+            logger.warning(
+                "Invalid type for %s: expected %s, got %s",
+                field,
+                expected_type,
+                type(insights[field]),
             )
             return False
 
-    # Validate suggestions is a list of strings
-    if not all(isinstance(s, str) for s in insights["suggestions"]):
-        print(f"⚠ Suggestions must be a list of strings")
+    # Validate suggestions is a list of strings. Parsed JSON yields exact str
+    # instances, so an identity check is enough (no subclass lookup)
+    if not all(type(s) is str for s in insights["suggestions"]):
+        logger.warning("Suggestions must be a list of strings")
         return False
 
     return True
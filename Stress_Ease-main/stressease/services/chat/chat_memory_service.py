@@ -8,10 +8,25 @@ This module handles all chat session operations including:
 - User profile retrieval
 """
 
-from datetime import datetime, timedelta
+from datetime import datetime, timezone
 from typing import Dict, List, Optional, Any
+from cachetools import TTLCache
+from firebase_admin import firestore
+from google.api_core import exceptions as google_exceptions
 from langchain_core.messages import HumanMessage, AIMessage, BaseMessage
 from stressease.services.utility.firebase_config import get_firestore_client
+from stressease.services.utility.firestore_batcher import firestore_batcher
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Stored message role -> LangChain message class (legacy one-doc-per-message
+# history; turns are now stored as one document, see _turn_document)
+MESSAGE_CLASSES_BY_ROLE = {
+    "user": HumanMessage,
+    "assistant": AIMessage,
+}
 
 
 # ============================================================================
@@ -19,93 +34,175 @@ from stressease.services.utility.firebase_config import get_firestore_client
 # ============================================================================
 
 
+# Profiles rarely change, so they're kept in memory for a few minutes instead
+# of being read from Firestore on every chat session. Users without a profile
+# are remembered for a shorter time so a newly created profile shows up soon.
+# Profiles are written by the client, not this backend, so nothing invalidates
+# these entries: an edit reaches new chat sessions once both this cache and the
+# user chain cache below have expired, i.e. after at most
+# PROFILE_CACHE_TTL_SECONDS + USER_CHAIN_CACHE_TTL_SECONDS (15 minutes).
+PROFILE_CACHE_MAX_SIZE = 10_000
+PROFILE_CACHE_TTL_SECONDS = 300
+MISSING_PROFILE_CACHE_TTL_SECONDS = 60
+_profile_cache = TTLCache(maxsize=PROFILE_CACHE_MAX_SIZE, ttl=PROFILE_CACHE_TTL_SECONDS)
+_missing_profile_cache = TTLCache(
+    maxsize=PROFILE_CACHE_MAX_SIZE, ttl=MISSING_PROFILE_CACHE_TTL_SECONDS
+)
+_profile_cache_lock = threading.Lock()
+
+
 def get_user_profile(user_id: str) -> Optional[Dict[str, Any]]:
     """
-    Fetch user profile from Firestore.
+    Fetch user profile from Firestore, cached per user.
 
     Collection: users/{user_id}/profile or users/{user_id}
 
+    Failed reads aren't cached. The returned dict is shared; don't mutate it.
+
     Args:
         user_id (str): Firebase Auth user ID
 
     Returns:
         Optional[Dict]: User profile data or None if not found
     """
-    db = get_firestore_client()
+    with _profile_cache_lock:
+        profile = _profile_cache.get(user_id)
+        if profile is not None:
+            return profile
+        if user_id in _missing_profile_cache:
+            return None
 
     try:
-        # Try structure: users/{user_id}/profile/data
-        doc_ref = (
-            db.collection("users")
-            .document(user_id)
-            .collection("profile")
-            .document("data")
-        )
-        doc = doc_ref.get()
+        profile = _fetch_user_profile(user_id)
+    except Exception:
+        logger.exception("Error fetching user profile for %s", user_id)
+        return None
 
-        if doc.exists:
-            return doc.to_dict()
+    with _profile_cache_lock:
+        if profile is None:
+            _missing_profile_cache[user_id] = True
+        else:
+            _profile_cache[user_id] = profile
 
-        # Try alternative structure: users/{user_id} (profile as document)
-        user_doc = db.collection("users").document(user_id).get()
-        if user_doc.exists:
-            return user_doc.to_dict()
+    return profile
 
-        return None
 
-    except Exception as e:
-        print(f"Error fetching user profile for {user_id}: {str(e)}")
-        return None
+def _fetch_user_profile(user_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Read a user profile from Firestore, trying both document layouts.
+
+    Args:
+        user_id (str): Firebase Auth user ID
+
+    Returns:
+        Optional[Dict]: User profile data or None if not found
+
+    Raises:
+        Exception: If the Firestore read fails
+    """
+    db = get_firestore_client()
+
+    # Both layouts are read in one BatchGetDocuments round trip:
+    # users/{user_id}/profile/data, else users/{user_id} (profile as document)
+    user_ref = db.document("users", user_id)
+    profile_ref = db.document("users", user_id, "profile", "data")
+
+    # get_all() doesn't preserve order, so match snapshots back by path
+    snapshots = {
+        snap.reference.path: snap for snap in db.get_all([profile_ref, user_ref])
+    }
+
+    for ref in (profile_ref, user_ref):
+        snap = snapshots.get(ref.path)
+        if snap is not None and snap.exists:
+            return snap.to_dict()
+
+    return None
 
 
 # ============================================================================
-# CHAT SESSION OPERATIONS
+# USER CHAIN CACHE
 # ============================================================================
 
+# Per-user chain fields {'chain', 'user_context', 'cache_name', 'cache_expires_at'}
+# shared by all of a user's new sessions, so opening another chat skips the
+# profile/mood reads and the mood summary LLM call. Chains are stateless (history
+# is passed per call), so sharing one across sessions is safe.
+USER_CHAIN_CACHE_MAX_SIZE = 5000
+USER_CHAIN_CACHE_TTL_SECONDS = 600
+_user_chain_cache = TTLCache(
+    maxsize=USER_CHAIN_CACHE_MAX_SIZE, ttl=USER_CHAIN_CACHE_TTL_SECONDS
+)
+_user_chain_cache_lock = threading.Lock()
 
-def create_session_metadata(user_id: str, session_id: str) -> bool:
+
+def get_cached_user_chain(user_id: str) -> Optional[Dict[str, Any]]:
     """
-    Create initial session metadata document in Firestore.
+    Get a user's cached chain fields, if any.
 
-    Collection: users/{user_id}/chat_sessions/{session_id}/metadata/info
+    The returned dict is shared; copy it before extending it.
 
     Args:
         user_id (str): Firebase Auth user ID
-        session_id (str): Unique session identifier
 
     Returns:
-        bool: True if successful, False otherwise
+        Optional[Dict]: Chain fields, or None if none are cached
     """
-    db = get_firestore_client()
+    with _user_chain_cache_lock:
+        return _user_chain_cache.get(user_id)
 
-    try:
-        metadata = {
-            "created_at": datetime.utcnow(),
-            "last_activity": datetime.utcnow(),
-            "status": "active",
-            "message_count": 0,
-        }
 
-        db.collection("users").document(user_id).collection("chat_sessions").document(
-            session_id
-        ).collection("metadata").document("info").set(metadata)
+def cache_user_chain(user_id: str, fields: Dict[str, Any]) -> None:
+    """Store a user's chain fields for their next new sessions."""
+    with _user_chain_cache_lock:
+        _user_chain_cache[user_id] = fields
 
-        return True
 
-    except Exception as e:
-        print(f"Error creating session metadata for {user_id}/{session_id}: {str(e)}")
-        return False
+def invalidate_user_chain(user_id: str) -> None:
+    """
+    Drop a user's cached chain so their next new session rebuilds its context.
+
+    Call after anything that feeds the user context changes (mood logs, profile).
+    Sessions already in progress keep the chain they started with.
+
+    Args:
+        user_id (str): Firebase Auth user ID
+    """
+    with _user_chain_cache_lock:
+        _user_chain_cache.pop(user_id, None)
+
+
+# ============================================================================
+# CHAT SESSION OPERATIONS
+# ============================================================================
+
 
+def _metadata_ref(db, user_id: str, session_id: str):
+    """
+    Reference to users/{user_id}/chat_sessions/{session_id}/metadata/info.
 
-def update_session_activity(user_id: str, session_id: str) -> bool:
+    Built from the full path in one call, instead of a chain of intermediate
+    collection/document references.
     """
-    Update last_activity timestamp and increment message count for a session.
+    return db.document(
+        "users", user_id, "chat_sessions", session_id, "metadata", "info"
+    )
+
+
+def _messages_ref(db, user_id: str, session_id: str):
+    """Reference to the users/{user_id}/chat_sessions/{session_id}/messages collection."""
+    return db.collection("users", user_id, "chat_sessions", session_id, "messages")
+
+
+def create_session_metadata(user_id: str, session_id: str) -> bool:
+    """
+    Create initial session metadata document in Firestore.
 
     Collection: users/{user_id}/chat_sessions/{session_id}/metadata/info
 
     Args:
         user_id (str): Firebase Auth user ID
-        session_id (str): Session identifier
+        session_id (str): Unique session identifier
 
     Returns:
         bool: True if successful, False otherwise
@@ -113,77 +210,64 @@ def update_session_activity(user_id: str, session_id: str) -> bool:
     db = get_firestore_client()
 
     try:
-        from firebase_admin import firestore
-
-        metadata_ref = (
-            db.collection("users")
-            .document(user_id)
-            .collection("chat_sessions")
-            .document(session_id)
-            .collection("metadata")
-            .document("info")
-        )
+        # One timestamp, so a new session's created_at == last_activity exactly
+        now = datetime.now(timezone.utc)
+        metadata = {
+            "created_at": now,
+            "last_activity": now,
+            "status": "active",
+            "message_count": 0,
+        }
 
-        # Update last activity and increment message count
-        metadata_ref.update(
-            {
-                "last_activity": datetime.utcnow(),
-                "message_count": firestore.Increment(1),
-            }
-        )
+        metadata_ref = _metadata_ref(db, user_id, session_id)
+        try:
+            metadata_ref.create(metadata)
+        except google_exceptions.AlreadyExists:
+            # The first turn's batched merge landed first; keep its
+            # message_count and last_activity and add only the creation fields
+            metadata_ref.set(
+                {"created_at": now, "status": metadata["status"]}, merge=True
+            )
 
         return True
 
-    except Exception as e:
-        print(f"Error updating session activity for {user_id}/{session_id}: {str(e)}")
+    except Exception:
+        logger.exception(
+            "Error creating session metadata for %s/%s", user_id, session_id
+        )
         return False
 
 
-def check_session_expired(
-    user_id: str, session_id: str, expiry_hours: int = 24
-) -> bool:
+def get_session_message_count(user_id: str, session_id: str) -> Optional[int]:
     """
-    Check if a session has expired based on last_activity timestamp.
+    Read the stored number of turns in a session.
+
+    This is the authoritative count: loaded history is capped, so it can't be
+    derived from the messages a caller has in memory.
 
     Args:
         user_id (str): Firebase Auth user ID
         session_id (str): Session identifier
-        expiry_hours (int): Hours of inactivity before expiry (default: 24)
 
     Returns:
-        bool: True if expired, False if still active
+        Optional[int]: The session's message_count, or None if unknown
     """
     db = get_firestore_client()
 
     try:
-        metadata_ref = (
-            db.collection("users")
-            .document(user_id)
-            .collection("chat_sessions")
-            .document(session_id)
-            .collection("metadata")
-            .document("info")
+        doc = _metadata_ref(db, user_id, session_id).get(
+            field_paths=["message_count"]
         )
-
-        doc = metadata_ref.get()
-
         if not doc.exists:
-            return True  # No metadata = expired/invalid session
-
-        data = doc.to_dict()
-        last_activity = data.get("last_activity")
-
-        if not last_activity:
-            return True  # No activity timestamp = expired
+            return None
 
-        # Check if last activity was more than expiry_hours ago
-        expiry_threshold = datetime.utcnow() - timedelta(hours=expiry_hours)
+        return (doc.to_dict() or {}).get("message_count")
 
-        return last_activity < expiry_threshold
-
-    except Exception as e:
-        print(f"Error checking session expiry for {user_id}/{session_id}: {str(e)}")
-        return True  # Assume expired on error
+    except Exception:
+        logger.exception(
+            "Error reading message count for %s/%s", user_id, session_id
+        )
+        return None
 
 
 def end_session(user_id: str, session_id: str) -> bool:
@@ -200,21 +284,14 @@ def end_session(user_id: str, session_id: str) -> bool:
     db = get_firestore_client()
 
     try:
-        metadata_ref = (
-            db.collection("users")
-            .document(user_id)
-            .collection("chat_sessions")
-            .document(session_id)
-            .collection("metadata")
-            .document("info")
-        )
+        metadata_ref = _metadata_ref(db, user_id, session_id)
 
-        metadata_ref.update({"status": "ended", "ended_at": datetime.utcnow()})
+        metadata_ref.update({"status": "ended", "ended_at": datetime.now(timezone.utc)})
 
         return True
 
-    except Exception as e:
-        print(f"Error ending session for {user_id}/{session_id}: {str(e)}")
+    except Exception:
+        logger.exception("Error ending session for %s/%s", user_id, session_id)
         return False
 
 
@@ -234,54 +311,83 @@ def load_conversation_memory(
     Args:
         user_id (str): Firebase Auth user ID
         session_id (str): Session identifier
-        max_messages (int): Maximum number of messages to load (default: 25)
+        max_messages (int): Maximum number of most recent messages to load (default: 25)
 
     Returns:
-        List[BaseMessage]: List of LangChain HumanMessage and AIMessage objects
+        List[BaseMessage]: List of LangChain HumanMessage and AIMessage objects,
+                           oldest first
     """
     db = get_firestore_client()
 
     try:
-        from firebase_admin import firestore
-
-        # Query messages ordered by timestamp, get last max_messages
+        # Newest documents first (read from the tail of the timestamp index),
+        # reversed below to oldest-first. Each turn document holds two
+        # messages, so half as many documents cover max_messages (rounded down
+        # to whole turns, so history never starts mid-exchange). Only the
+        # message fields (and the timestamp the page cursor needs) are
+        # projected, which keeps the rest off the wire
         query = (
-            db.collection("users")
-            .document(user_id)
-            .collection("chat_sessions")
-            .document(session_id)
-            .collection("messages")
-            .order_by("timestamp", direction=firestore.Query.ASCENDING)
-            .limit(max_messages)
+            _messages_ref(db, user_id, session_id)
+            .select(["user", "assistant", "role", "content", "timestamp"])
+            .order_by("timestamp", direction=firestore.Query.DESCENDING)
         )
 
-        docs = query.stream()
         messages = []
-
-        for doc in docs:
-            data = doc.to_dict()
-            role = data.get("role", "")
-            content = data.get("content", "")
-
-            if role == "user":
-                messages.append(HumanMessage(content=content))
-            elif role == "assistant":
-                messages.append(AIMessage(content=content))
-
+        page_size = max(1, max_messages // 2)
+        last_doc = None
+
+        while True:
+            page = query if last_doc is None else query.start_after(last_doc)
+            docs = list(page.limit(page_size).stream())
+            legacy_seen = False
+
+            for doc in docs:
+                data = doc.to_dict()
+                if "user" in data:
+                    # Turn document; appended newest-first like the docs
+                    messages.append(AIMessage(content=data.get("assistant", "")))
+                    messages.append(HumanMessage(content=data["user"]))
+                    continue
+
+                # Legacy role-keyed message document (one message each)
+                legacy_seen = True
+                message_cls = MESSAGE_CLASSES_BY_ROLE.get(data.get("role"))
+                if message_cls is not None:
+                    messages.append(message_cls(content=data.get("content", "")))
+
+            # Legacy documents predate turn documents, so everything older is
+            # one message per document: fetch exactly the messages still missing
+            remaining = max_messages - len(messages)
+            if not legacy_seen or len(docs) < page_size or remaining < 1:
+                break
+            page_size = remaining
+            last_doc = docs[-1]
+
+        # LangChain expects the conversation oldest-first
+        del messages[max_messages:]
+        messages.reverse()
         return messages
 
-    except Exception as e:
-        print(f"Error loading conversation memory for {user_id}/{session_id}: {str(e)}")
+    except Exception:
+        logger.exception(
+            "Error loading conversation memory for %s/%s", user_id, session_id
+        )
         return []
 
 
-def save_conversation_turn(
+def save_turn_and_touch_session(
     user_id: str, session_id: str, user_msg: str, ai_msg: str, turn_number: int
 ) -> bool:
     """
-    Save one conversation exchange (user message + AI response) to Firestore.
+    Queue a conversation turn and the session activity update as one atomic write.
 
-    Collection: users/{user_id}/chat_sessions/{session_id}/messages
+    Both writes go through the shared FirestoreBatcher as a single group, so
+    they commit together in one WriteBatch: message_count never drifts from the
+    stored turns.
+
+    Collections:
+        users/{user_id}/chat_sessions/{session_id}/messages
+        users/{user_id}/chat_sessions/{session_id}/metadata/info
 
     Args:
         user_id (str): Firebase Auth user ID
@@ -291,40 +397,68 @@ def save_conversation_turn(
         turn_number (int): Turn number in conversation
 
     Returns:
-        bool: True if successful, False otherwise
+        bool: True if the writes were queued, False otherwise
     """
     db = get_firestore_client()
 
     try:
-        timestamp = datetime.utcnow()
-        messages_ref = (
-            db.collection("users")
-            .document(user_id)
-            .collection("chat_sessions")
-            .document(session_id)
-            .collection("messages")
+        timestamp = datetime.now(timezone.utc)
+        messages_ref = _messages_ref(db, user_id, session_id)
+        metadata_ref = _metadata_ref(db, user_id, session_id)
+
+        firestore_batcher.enqueue_group(
+            [
+                # User and AI messages as one turn document (auto-generated ID, same as .add())
+                (
+                    messages_ref.document(),
+                    "set",
+                    _turn_document(user_msg, ai_msg, timestamp, turn_number),
+                    False,
+                ),
+                # Merge so the write doesn't fail if create_session_metadata hasn't landed yet
+                (
+                    metadata_ref,
+                    "set",
+                    {
+                        "last_activity": timestamp,
+                        "message_count": firestore.Increment(1),
+                    },
+                    True,
+                ),
+            ]
         )
 
-        # Save user message
-        user_message_data = {
-            "role": "user",
-            "content": user_msg,
-            "timestamp": timestamp,
-            "turn": turn_number,
-        }
-        messages_ref.add(user_message_data)
-
-        # Save AI message
-        ai_message_data = {
-            "role": "assistant",
-            "content": ai_msg,
-            "timestamp": timestamp,
-            "turn": turn_number,
-        }
-        messages_ref.add(ai_message_data)
-
         return True
 
-    except Exception as e:
-        print(f"Error saving conversation turn for {user_id}/{session_id}: {str(e)}")
+    except Exception:
+        logger.exception(
+            "Error queueing conversation turn for %s/%s", user_id, session_id
+        )
         return False
+
+
+def _turn_document(
+    user_msg: str, ai_msg: str, timestamp: datetime, turn_number: int
+) -> Dict[str, Any]:
+    """
+    Build the stored form of one exchange: both messages in a single document.
+
+    One document per turn halves the writes per turn and the reads needed to
+    load history. Legacy {role, content} documents are still read back by
+    load_conversation_memory().
+
+    Args:
+        user_msg (str): User's message content
+        ai_msg (str): AI's response content
+        timestamp (datetime): Time of the exchange
+        turn_number (int): Turn number in conversation
+
+    Returns:
+        dict: Firestore document data
+    """
+    return {
+        "user": user_msg,
+        "assistant": ai_msg,
+        "timestamp": timestamp,
+        "turn": turn_number,
+    }
@@ -0,0 +1,376 @@
+"""
+Country name normalization for crisis resources.
+
+Maps ISO-3166 alpha-2/alpha-3 codes, official names and common aliases to a
+single canonical country name, so cache lookups for "US", "USA" and
+"united states" all resolve to the same Firestore document.
+"""
+
+from typing import Dict, Optional
+
+# ============================================================================
+# ISO-3166 COUNTRY TABLE
+# ============================================================================
+
+# Canonical name -> (alpha-2, alpha-3, *alternative names)
+COUNTRIES = {
+    "Afghanistan": ("AF", "AFG", "Islamic Republic of Afghanistan"),
+    "Albania": ("AL", "ALB", "Republic of Albania"),
+    "Algeria": ("DZ", "DZA", "People's Democratic Republic of Algeria"),
+    "American Samoa": ("AS", "ASM"),
+    "Andorra": ("AD", "AND", "Principality of Andorra"),
+    "Angola": ("AO", "AGO", "Republic of Angola"),
+    "Anguilla": ("AI", "AIA"),
+    "Antarctica": ("AQ", "ATA"),
+    "Antigua and Barbuda": ("AG", "ATG"),
+    "Argentina": ("AR", "ARG", "Argentine Republic"),
+    "Armenia": ("AM", "ARM", "Republic of Armenia"),
+    "Aruba": ("AW", "ABW"),
+    "Australia": ("AU", "AUS"),
+    "Austria": ("AT", "AUT", "Republic of Austria"),
+    "Azerbaijan": ("AZ", "AZE", "Republic of Azerbaijan"),
+    "Bahamas": ("BS", "BHS", "Commonwealth of the Bahamas"),
+    "Bahrain": ("BH", "BHR", "Kingdom of Bahrain"),
+    "Bangladesh": ("BD", "BGD", "People's Republic of Bangladesh"),
+    "Barbados": ("BB", "BRB"),
+    "Belarus": ("BY", "BLR", "Republic of Belarus"),
+    "Belgium": ("BE", "BEL", "Kingdom of Belgium"),
+    "Belize": ("BZ", "BLZ"),
+    "Benin": ("BJ", "BEN", "Republic of Benin"),
+    "Bermuda": ("BM", "BMU"),
+    "Bhutan": ("BT", "BTN", "Kingdom of Bhutan"),
+    "Bolivia": (
+        "BO",
+        "BOL",
+        "Bolivia, Plurinational State of",
+        "Plurinational State of Bolivia",
+    ),
+    "Bonaire, Sint Eustatius and Saba": ("BQ", "BES"),
+    "Bosnia and Herzegovina": ("BA", "BIH", "Republic of Bosnia and Herzegovina"),
+    "Botswana": ("BW", "BWA", "Republic of Botswana"),
+    "Bouvet Island": ("BV", "BVT"),
+    "Brazil": ("BR", "BRA", "Federative Republic of Brazil"),
+    "British Indian Ocean Territory": ("IO", "IOT"),
+    "British Virgin Islands": ("VG", "VGB", "Virgin Islands, British"),
+    "Brunei": ("BN", "BRN", "Brunei Darussalam"),
+    "Bulgaria": ("BG", "BGR", "Republic of Bulgaria"),
+    "Burkina Faso": ("BF", "BFA"),
+    "Burundi": ("BI", "BDI", "Republic of Burundi"),
+    "Cambodia": ("KH", "KHM", "Kingdom of Cambodia"),
+    "Cameroon": ("CM", "CMR", "Republic of Cameroon"),
+    "Canada": ("CA", "CAN"),
+    "Cape Verde": ("CV", "CPV", "Cabo Verde", "Republic of Cabo Verde"),
+    "Cayman Islands": ("KY", "CYM"),
+    "Central African Republic": ("CF", "CAF"),
+    "Chad": ("TD", "TCD", "Republic of Chad"),
+    "Chile": ("CL", "CHL", "Republic of Chile"),
+    "China": ("CN", "CHN", "People's Republic of China"),
+    "Christmas Island": ("CX", "CXR"),
+    "Cocos Islands": ("CC", "CCK", "Cocos (Keeling) Islands"),
+    "Colombia": ("CO", "COL", "Republic of Colombia"),
+    "Comoros": ("KM", "COM", "Union of the Comoros"),
+    "Cook Islands": ("CK", "COK"),
+    "Costa Rica": ("CR", "CRI", "Republic of Costa Rica"),
+    "Croatia": ("HR", "HRV", "Republic of Croatia"),
+    "Cuba": ("CU", "CUB", "Republic of Cuba"),
+    "Curaçao": ("CW", "CUW"),
+    "Cyprus": ("CY", "CYP", "Republic of Cyprus"),
+    "Czech Republic": ("CZ", "CZE", "Czechia"),
+    "Côte d'Ivoire": ("CI", "CIV", "Republic of Côte d'Ivoire"),
+    "Democratic Republic of the Congo": (
+        "CD",
+        "COD",
+        "Congo, The Democratic Republic of the",
+    ),
+    "Denmark": ("DK", "DNK", "Kingdom of Denmark"),
+    "Djibouti": ("DJ", "DJI", "Republic of Djibouti"),
+    "Dominica": ("DM", "DMA", "Commonwealth of Dominica"),
+    "Dominican Republic": ("DO", "DOM"),
+    "Ecuador": ("EC", "ECU", "Republic of Ecuador"),
+    "Egypt": ("EG", "EGY", "Arab Republic of Egypt"),
+    "El Salvador": ("SV", "SLV", "Republic of El Salvador"),
+    "Equatorial Guinea": ("GQ", "GNQ", "Republic of Equatorial Guinea"),
+    "Eritrea": ("ER", "ERI", "the State of Eritrea"),
+    "Estonia": ("EE", "EST", "Republic of Estonia"),
+    "Eswatini": ("SZ", "SWZ", "Kingdom of Eswatini"),
+    "Ethiopia": ("ET", "ETH", "Federal Democratic Republic of Ethiopia"),
+    "Falkland Islands": ("FK", "FLK", "Falkland Islands (Malvinas)"),
+    "Faroe Islands": ("FO", "FRO"),
+    "Fiji": ("FJ", "FJI", "Republic of Fiji"),
+    "Finland": ("FI", "FIN", "Republic of Finland"),
+    "France": ("FR", "FRA", "French Republic"),
+    "French Guiana": ("GF", "GUF"),
+    "French Polynesia": ("PF", "PYF"),
+    "French Southern Territories": ("TF", "ATF"),
+    "Gabon": ("GA", "GAB", "Gabonese Republic"),
+    "Gambia": ("GM", "GMB", "Republic of the Gambia"),
+    "Georgia": ("GE", "GEO"),
+    "Germany": ("DE", "DEU", "Federal Republic of Germany"),
+    "Ghana": ("GH", "GHA", "Republic of Ghana"),
+    "Gibraltar": ("GI", "GIB"),
+    "Greece": ("GR", "GRC", "Hellenic Republic"),
+    "Greenland": ("GL", "GRL"),
+    "Grenada": ("GD", "GRD"),
+    "Guadeloupe": ("GP", "GLP"),
+    "Guam": ("GU", "GUM"),
+    "Guatemala": ("GT", "GTM", "Republic of Guatemala"),
+    "Guernsey": ("GG", "GGY"),
+    "Guinea": ("GN", "GIN", "Republic of Guinea"),
+    "Guinea-Bissau": ("GW", "GNB", "Republic of Guinea-Bissau"),
+    "Guyana": ("GY", "GUY", "Republic of Guyana"),
+    "Haiti": ("HT", "HTI", "Republic of Haiti"),
+    "Heard Island and McDonald Islands": ("HM", "HMD"),
+    "Honduras": ("HN", "HND", "Republic of Honduras"),
+    "Hong Kong": ("HK", "HKG", "Hong Kong Special Administrative Region of China"),
+    "Hungary": ("HU", "HUN"),
+    "Iceland": ("IS", "ISL", "Republic of Iceland"),
+    "India": ("IN", "IND", "Republic of India"),
+    "Indonesia": ("ID", "IDN", "Republic of Indonesia"),
+    "Iran": ("IR", "IRN", "Iran, Islamic Republic of", "Islamic Republic of Iran"),
+    "Iraq": ("IQ", "IRQ", "Republic of Iraq"),
+    "Ireland": ("IE", "IRL"),
+    "Isle of Man": ("IM", "IMN"),
+    "Israel": ("IL", "ISR", "State of Israel"),
+    "Italy": ("IT", "ITA", "Italian Republic"),
+    "Jamaica": ("JM", "JAM"),
+    "Japan": ("JP", "JPN"),
+    "Jersey": ("JE", "JEY"),
+    "Jordan": ("JO", "JOR", "Hashemite Kingdom of Jordan"),
+    "Kazakhstan": ("KZ", "KAZ", "Republic of Kazakhstan"),
+    "Kenya": ("KE", "KEN", "Republic of Kenya"),
+    "Kiribati": ("KI", "KIR", "Republic of Kiribati"),
+    "Kuwait": ("KW", "KWT", "State of Kuwait"),
+    "Kyrgyzstan": ("KG", "KGZ", "Kyrgyz Republic"),
+    "Laos": ("LA", "LAO", "Lao People's Democratic Republic"),
+    "Latvia": ("LV", "LVA", "Republic of Latvia"),
+    "Lebanon": ("LB", "LBN", "Lebanese Republic"),
+    "Lesotho": ("LS", "LSO", "Kingdom of Lesotho"),
+    "Liberia": ("LR", "LBR", "Republic of Liberia"),
+    "Libya": ("LY", "LBY"),
+    "Liechtenstein": ("LI", "LIE", "Principality of Liechtenstein"),
+    "Lithuania": ("LT", "LTU", "Republic of Lithuania"),
+    "Luxembourg": ("LU", "LUX", "Grand Duchy of Luxembourg"),
+    "Macao": ("MO", "MAC", "Macao Special Administrative Region of China"),
+    "Madagascar": ("MG", "MDG", "Republic of Madagascar"),
+    "Malawi": ("MW", "MWI", "Republic of Malawi"),
+    "Malaysia": ("MY", "MYS"),
+    "Maldives": ("MV", "MDV", "Republic of Maldives"),
+    "Mali": ("ML", "MLI", "Republic of Mali"),
+    "Malta": ("MT", "MLT", "Republic of Malta"),
+    "Marshall Islands": ("MH", "MHL", "Republic of the Marshall Islands"),
+    "Martinique": ("MQ", "MTQ"),
+    "Mauritania": ("MR", "MRT", "Islamic Republic of Mauritania"),
+    "Mauritius": ("MU", "MUS", "Republic of Mauritius"),
+    "Mayotte": ("YT", "MYT"),
+    "Mexico": ("MX", "MEX", "United Mexican States"),
+    "Micronesia": (
+        "FM",
+        "FSM",
+        "Micronesia, Federated States of",
+        "Federated States of Micronesia",
+    ),
+    "Moldova": ("MD", "MDA", "Moldova, Republic of", "Republic of Moldova"),
+    "Monaco": ("MC", "MCO", "Principality of Monaco"),
+    "Mongolia": ("MN", "MNG"),
+    "Montenegro": ("ME", "MNE"),
+    "Montserrat": ("MS", "MSR"),
+    "Morocco": ("MA", "MAR", "Kingdom of Morocco"),
+    "Mozambique": ("MZ", "MOZ", "Republic of Mozambique"),
+    "Myanmar": ("MM", "MMR", "Republic of Myanmar"),
+    "Namibia": ("NA", "NAM", "Republic of Namibia"),
+    "Nauru": ("NR", "NRU", "Republic of Nauru"),
+    "Nepal": ("NP", "NPL", "Federal Democratic Republic of Nepal"),
+    "Netherlands": ("NL", "NLD", "Kingdom of the Netherlands"),
+    "New Caledonia": ("NC", "NCL"),
+    "New Zealand": ("NZ", "NZL"),
+    "Nicaragua": ("NI", "NIC", "Republic of Nicaragua"),
+    "Niger": ("NE", "NER", "Republic of the Niger"),
+    "Nigeria": ("NG", "NGA", "Federal Republic of Nigeria"),
+    "Niue": ("NU", "NIU"),
+    "Norfolk Island": ("NF", "NFK"),
+    "North Korea": (
+        "KP",
+        "PRK",
+        "Korea, Democratic People's Republic of",
+        "Democratic People's Republic of Korea",
+    ),
+    "North Macedonia": ("MK", "MKD", "Republic of North Macedonia"),
+    "Northern Mariana Islands": (
+        "MP",
+        "MNP",
+        "Commonwealth of the Northern Mariana Islands",
+    ),
+    "Norway": ("NO", "NOR", "Kingdom of Norway"),
+    "Oman": ("OM", "OMN", "Sultanate of Oman"),
+    "Pakistan": ("PK", "PAK", "Islamic Republic of Pakistan"),
+    "Palau": ("PW", "PLW", "Republic of Palau"),
+    "Palestine": ("PS", "PSE", "Palestine, State of", "the State of Palestine"),
+    "Panama": ("PA", "PAN", "Republic of Panama"),
+    "Papua New Guinea": ("PG", "PNG", "Independent State of Papua New Guinea"),
+    "Paraguay": ("PY", "PRY", "Republic of Paraguay"),
+    "Peru": ("PE", "PER", "Republic of Peru"),
+    "Philippines": ("PH", "PHL", "Republic of the Philippines"),
+    "Pitcairn": ("PN", "PCN"),
+    "Poland": ("PL", "POL", "Republic of Poland"),
+    "Portugal": ("PT", "PRT", "Portuguese Republic"),
+    "Puerto Rico": ("PR", "PRI"),
+    "Qatar": ("QA", "QAT", "State of Qatar"),
+    # Bare "Congo" is left out: it is as likely to mean the DRC
+    "Republic of the Congo": ("CG", "COG"),
+    "Romania": ("RO", "ROU"),
+    "Russia": ("RU", "RUS", "Russian Federation"),
+    "Rwanda": ("RW", "RWA", "Rwandese Republic"),
+    "Réunion": ("RE", "REU"),
+    "Saint Barthélemy": ("BL", "BLM"),
+    "Saint Helena": ("SH", "SHN", "Saint Helena, Ascension and Tristan da Cunha"),
+    "Saint Kitts and Nevis": ("KN", "KNA"),
+    "Saint Lucia": ("LC", "LCA"),
+    "Saint Martin": ("MF", "MAF", "Saint Martin (French part)"),
+    "Saint Pierre and Miquelon": ("PM", "SPM"),
+    "Saint Vincent and the Grenadines": ("VC", "VCT"),
+    "Samoa": ("WS", "WSM", "Independent State of Samoa"),
+    "San Marino": ("SM", "SMR", "Republic of San Marino"),
+    "Sao Tome and Principe": (
+        "ST",
+        "STP",
+        "Democratic Republic of Sao Tome and Principe",
+    ),
+    "Saudi Arabia": ("SA", "SAU", "Kingdom of Saudi Arabia"),
+    "Senegal": ("SN", "SEN", "Republic of Senegal"),
+    "Serbia": ("RS", "SRB", "Republic of Serbia"),
+    "Seychelles": ("SC", "SYC", "Republic of Seychelles"),
+    "Sierra Leone": ("SL", "SLE", "Republic of Sierra Leone"),
+    "Singapore": ("SG", "SGP", "Republic of Singapore"),
+    "Sint Maarten": ("SX", "SXM", "Sint Maarten (Dutch part)"),
+    "Slovakia": ("SK", "SVK", "Slovak Republic"),
+    "Slovenia": ("SI", "SVN", "Republic of Slovenia"),
+    "Solomon Islands": ("SB", "SLB"),
+    "Somalia": ("SO", "SOM", "Federal Republic of Somalia"),
+    "South Africa": ("ZA", "ZAF", "Republic of South Africa"),
+    "South Georgia and the South Sandwich Islands": ("GS", "SGS"),
+    "South Korea": ("KR", "KOR", "Korea, Republic of"),
+    "South Sudan": ("SS", "SSD", "Republic of South Sudan"),
+    "Spain": ("ES", "ESP", "Kingdom of Spain"),
+    "Sri Lanka": ("LK", "LKA", "Democratic Socialist Republic of Sri Lanka"),
+    "Sudan": ("SD", "SDN", "Republic of the Sudan"),
+    "Suriname": ("SR", "SUR", "Republic of Suriname"),
+    "Svalbard and Jan Mayen": ("SJ", "SJM"),
+    "Sweden": ("SE", "SWE", "Kingdom of Sweden"),
+    "Switzerland": ("CH", "CHE", "Swiss Confederation"),
+    "Syria": ("SY", "SYR", "Syrian Arab Republic"),
+    "Taiwan": ("TW", "TWN", "Taiwan, Province of China"),
+    "Tajikistan": ("TJ", "TJK", "Republic of Tajikistan"),
+    "Tanzania": (
+        "TZ",
+        "TZA",
+        "Tanzania, United Republic of",
+        "United Republic of Tanzania",
+    ),
+    "Thailand": ("TH", "THA", "Kingdom of Thailand"),
+    "Timor-Leste": ("TL", "TLS", "Democratic Republic of Timor-Leste"),
+    "Togo": ("TG", "TGO", "Togolese Republic"),
+    "Tokelau": ("TK", "TKL"),
+    "Tonga": ("TO", "TON", "Kingdom of Tonga"),
+    "Trinidad and Tobago": ("TT", "TTO", "Republic of Trinidad and Tobago"),
+    "Tunisia": ("TN", "TUN", "Republic of Tunisia"),
+    "Turkey": ("TR", "TUR", "Türkiye", "Republic of Türkiye"),
+    "Turkmenistan": ("TM", "TKM"),
+    "Turks and Caicos Islands": ("TC", "TCA"),
+    "Tuvalu": ("TV", "TUV"),
+    "U.S. Virgin Islands": (
+        "VI",
+        "VIR",
+        "Virgin Islands, U.S.",
+        "Virgin Islands of the United States",
+    ),
+    "Uganda": ("UG", "UGA", "Republic of Uganda"),
+    "Ukraine": ("UA", "UKR"),
+    "United Arab Emirates": ("AE", "ARE"),
+    "United Kingdom": (
+        "GB",
+        "GBR",
+        "United Kingdom of Great Britain and Northern Ireland",
+    ),
+    "United States": ("US", "USA", "United States of America"),
+    "United States Minor Outlying Islands": ("UM", "UMI"),
+    "Uruguay": ("UY", "URY", "Eastern Republic of Uruguay"),
+    "Uzbekistan": ("UZ", "UZB", "Republic of Uzbekistan"),
+    "Vanuatu": ("VU", "VUT", "Republic of Vanuatu"),
+    "Vatican City": ("VA", "VAT", "Holy See (Vatican City State)"),
+    "Venezuela": (
+        "VE",
+        "VEN",
+        "Venezuela, Bolivarian Republic of",
+        "Bolivarian Republic of Venezuela",
+    ),
+    "Vietnam": ("VN", "VNM", "Viet Nam", "Socialist Republic of Viet Nam"),
+    "Wallis and Futuna": ("WF", "WLF"),
+    "Western Sahara": ("EH", "ESH"),
+    "Yemen": ("YE", "YEM", "Republic of Yemen"),
+    "Zambia": ("ZM", "ZMB", "Republic of Zambia"),
+    "Zimbabwe": ("ZW", "ZWE", "Republic of Zimbabwe"),
+    "Åland Islands": ("AX", "ALA"),
+}
+
+# Colloquial names not covered by ISO-3166
+EXTRA_ALIASES = {
+    "america": "United States",
+    "united states of america": "United States",
+    "u.s.": "United States",
+    "u.s.a.": "United States",
+    "great britain": "United Kingdom",
+    "britain": "United Kingdom",
+    "england": "United Kingdom",
+    "scotland": "United Kingdom",
+    "wales": "United Kingdom",
+    "northern ireland": "United Kingdom",
+    "uk": "United Kingdom",
+    "uae": "United Arab Emirates",
+    "emirates": "United Arab Emirates",
+    "holland": "Netherlands",
+    "korea": "South Korea",
+    "czechia": "Czech Republic",
+    "türkiye": "Turkey",
+    "turkiye": "Turkey",
+    "ivory coast": "Côte d'Ivoire",
+    "cote d'ivoire": "Côte d'Ivoire",
+    "burma": "Myanmar",
+    "swaziland": "Eswatini",
+    "macedonia": "North Macedonia",
+    "drc": "Democratic Republic of the Congo",
+    "vatican": "Vatican City",
+}
+
+def _build_alias_index() -> Dict[str, str]:
+    """Build the casefolded alias -> canonical name lookup."""
+    index = {}
+    for canonical, aliases in COUNTRIES.items():
+        index[canonical.casefold()] = canonical
+        for alias in aliases:
+            index[alias.casefold()] = canonical
+    index.update(EXTRA_ALIASES)
+    return index
+
+
+_ALIAS_INDEX = _build_alias_index()
+
+
+def normalize_country(country: str) -> Optional[str]:
+    """
+    Resolve a country code, name or known alias to its canonical name.
+
+    Only exact (case- and whitespace-insensitive) matches count. Unknown input
+    is not guessed at: a near miss like "Indiana" must not resolve to India
+    and serve another country's emergency numbers.
+
+    Args:
+        country (str): Raw country input (e.g., 'US', 'usa', 'United States')
+
+    Returns:
+        Optional[str]: Canonical country name, or None if nothing matches
+    """
+    key = " ".join(country.split()).casefold()
+    if not key:
+        return None
+
+    return _ALIAS_INDEX.get(key)
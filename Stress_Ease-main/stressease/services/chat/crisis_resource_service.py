@@ -5,61 +5,83 @@ This module handles caching and retrieval of country-specific
 crisis resources in Firestore.
 """
 
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 from typing import Dict, Optional, Any
+from cachetools import TTLCache
 from stressease.services.utility.firebase_config import get_firestore_client
+from stressease.services.chat.country_aliases import normalize_country
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
 
 
 # ============================================================================
 # CRISIS RESOURCES OPERATIONS
 # ============================================================================
 
+# Crisis resources are reference data that changes rarely; keep them in memory
+# (keyed by document ID) in front of Firestore. Writes go through this cache
+RESOURCES_CACHE_MAX_SIZE = 512
+RESOURCES_CACHE_TTL_SECONDS = 6 * 3600
+_resources_cache = TTLCache(
+    maxsize=RESOURCES_CACHE_MAX_SIZE, ttl=RESOURCES_CACHE_TTL_SECONDS
+)
+_resources_cache_lock = threading.Lock()
+
+# Stored entries older than this are treated as missing so the caller
+# regenerates them (entries without cached_at are kept as-is)
+RESOURCES_MAX_AGE = timedelta(days=30)
+
 
 def get_cached_crisis_resources(country: str) -> Optional[Dict[str, Any]]:
     """
     Get cached crisis resources for a specific country.
-    Works with both country codes (e.g., 'US') and country names (e.g., 'United States').
+    Works with country codes (e.g., 'US', 'USA'), names (e.g., 'United States')
+    and common aliases, which all resolve to the same cached entry.
 
     Args:
         country (str): Country code or name to get resources for
 
     Returns:
-        dict: Crisis resources data, or None if not found in cache
+        dict: Crisis resources data, or None if not found in cache or older
+              than RESOURCES_MAX_AGE. The dict is shared with the in-memory
+              cache; don't mutate it.
     """
     db = get_firestore_client()
 
     if not country or not country.strip():
-        print(
-            "Warning: Attempted to get cached crisis resources with an empty country parameter."
+        logger.warning(
+            "Attempted to get cached crisis resources with an empty country parameter"
         )
         return None
 
     try:
-        # Normalize country input (uppercase for codes, title case for names)
-        country_id = country.strip()
-        if len(country_id) <= 3:  # Likely a country code
-            country_id = country_id.upper()
-        else:  # Likely a country name
-            country_id = country_id.title()
+        country_id = _country_document_id(country)
 
-        # Try to get document with country code/name as ID
-        doc_ref = db.collection("crisis_resources").document(country_id)
-        doc = doc_ref.get()
+        with _resources_cache_lock:
+            resources = _resources_cache.get(country_id)
+        if resources is not None:
+            return resources
 
-        if doc.exists:
-            return doc.to_dict()
+        # Direct lookup by canonical ID. cache_crisis_resources() stores each
+        # entry's "country" field equal to its document ID, so no field query
+        # could find a document this lookup misses
+        doc = db.collection("crisis_resources").document(country_id).get()
 
-        # If not found by exact match and it's a country name, try to find by country field
-        if len(country_id) > 3:
-            query = db.collection("crisis_resources").where("country", "==", country_id)
-            docs = query.stream()
-            for doc in docs:
-                return doc.to_dict()
+        if doc.exists:
+            resources = doc.to_dict()
+            cached_at = resources.get("cached_at")
+            if cached_at and datetime.now(timezone.utc) - cached_at > RESOURCES_MAX_AGE:
+                return None
+            with _resources_cache_lock:
+                _resources_cache[country_id] = resources
+            return resources
 
         return None
 
-    except Exception as e:
-        print(f"Error getting cached crisis resources for {country}: {str(e)}")
+    except Exception:
+        logger.exception("Error getting cached crisis resources for %s", country)
         return None
 
 
@@ -77,27 +99,48 @@ def cache_crisis_resources(country: str, resources: Dict[str, Any]) -> bool:
     db = get_firestore_client()
 
     if not country or not country.strip():
-        print(
-            "Warning: Attempted to cache crisis resources with an empty country parameter."
+        logger.warning(
+            "Attempted to cache crisis resources with an empty country parameter"
         )
         return False
 
     try:
-        # Normalize country input (uppercase for codes, title case for names)
-        country_id = country.strip()
-        if len(country_id) <= 3:  # Likely a country code
-            country_id = country_id.upper()
-        else:  # Likely a country name
-            country_id = country_id.title()
+        country_id = _country_document_id(country)
 
         # Add country field to resources for querying
         resources["country"] = country_id
-        resources["cached_at"] = datetime.utcnow()
+        resources["cached_at"] = datetime.now(timezone.utc)
 
         # Save to crisis_resources collection with country as document ID
         db.collection("crisis_resources").document(country_id).set(resources)
+
+        with _resources_cache_lock:
+            _resources_cache[country_id] = resources
         return True
 
-    except Exception as e:
-        print(f"Error caching crisis resources for {country}: {str(e)}")
+    except Exception:
+        logger.exception("Error caching crisis resources for %s", country)
         return False
+
+
+def _country_document_id(country: str) -> str:
+    """
+    Resolve the crisis_resources document ID for a country input.
+
+    Known codes and aliases map to the canonical country name; anything else
+    keeps the legacy normalization (uppercase for codes, title case for names).
+
+    Args:
+        country (str): Country code or name
+
+    Returns:
+        str: Document ID in the crisis_resources collection
+    """
+    canonical = normalize_country(country)
+    if canonical:
+        return canonical
+
+    country_id = country.strip()
+    if len(country_id) <= 3:  # Likely a country code
+        return country_id.upper()
+    return country_id.title()  # Likely a country name
@@ -8,6 +8,7 @@ This service provides:
 - Mood log summarization (Chain A)
 - Conversational chat with memory (Chain B)
 - Crisis resource generation with structured output
+- Gemini context caching of the static master prompt prefix
 - Response validation and safety checks
 """
 
@@ -20,9 +21,25 @@ from langchain_core.prompts import (
 from langchain_core.output_parsers import StrOutputParser, PydanticOutputParser
 from langchain_core.messages import BaseMessage
 from langchain_core.runnables import Runnable
+from google.ai.generativelanguage_v1beta import (
+    CacheServiceClient,
+    CachedContent,
+    Content,
+    Part,
+)
+from google.api_core import exceptions as google_exceptions
+from google.protobuf import duration_pb2
 from pydantic import BaseModel, Field
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterator, List, Optional, Any, Tuple
+from datetime import datetime, timedelta, timezone
+from cachetools import TTLCache
+import hashlib
 import json
+import logging
+import re
+import threading
+
+logger = logging.getLogger(__name__)
 
 
 # ============================================================================
@@ -35,6 +52,43 @@ base_llm = None
 # Advanced model for chat responses (better quality, more context)
 advance_llm = None
 
+# Gemini CachedContent client for reusing the chat system prompt across turns
+cache_client = None
+
+# Shared cached content for the static master prompt prefix: (name, refresh_at)
+_prompt_cache = None
+_prompt_cache_lock = threading.Lock()
+
+# Chain A (SUMMARY_PROMPT | base_llm | parser), composed once in init_gemini()
+summary_chain = None
+
+# CRISIS_RESOURCES_PROMPT | base_llm | parser, composed once in init_gemini()
+crisis_resources_chain = None
+
+# Lifetime of the cached master prompt prefix on Gemini's side
+PROMPT_CACHE_TTL_SECONDS = 3600
+
+# Recreate the prompt cache slightly before its server-side TTL runs out
+PROMPT_CACHE_REFRESH_MARGIN = timedelta(seconds=60)
+
+# Gemini rejects cached contents below this size
+PROMPT_CACHE_MIN_TOKENS = 1024
+
+# Rough Gemini tokenizer ratio for English text, used for local token estimates
+CHARS_PER_TOKEN = 4
+
+# Per-message overhead (role/turn markers) added to token estimates
+TOKENS_PER_MESSAGE = 4
+
+# Flipped off when the model rejects explicit caching, to stop retrying
+prompt_cache_enabled = True
+
+# Fallback chat replies
+EMPTY_RESPONSE_FALLBACK = "I'm sorry, I couldn't generate a helpful response. How else can I support you today?"
+CONNECTION_ERROR_RESPONSE = (
+    "I'm having trouble connecting right now. Could we try again in a moment?"
+)
+
 
 # ============================================================================
 # INITIALIZATION
@@ -55,15 +109,20 @@ def init_gemini(api_key: str) -> None:
     Raises:
         Exception: If initialization fails
     """
-    global base_llm, advance_llm
+    global base_llm, advance_llm, cache_client, summary_chain, crisis_resources_chain
 
     try:
+        # Both models talk gRPC: each client keeps one HTTP/2 channel open for
+        # the life of the process and multiplexes concurrent calls (.batch(),
+        # streaming) over it, so no per-call connection or TLS handshake
+
         # Base model for summarization, insights, and resource generation
         base_llm = ChatGoogleGenerativeAI(
             model="gemini-2.0-flash-lite",
             google_api_key=api_key,
             temperature=0.3,  # Lower temperature for factual summarization
             convert_system_message_to_human=True,
+            transport="grpc",
         )
 
         # Advanced model for chat responses (better quality)
@@ -72,14 +131,32 @@ def init_gemini(api_key: str) -> None:
             google_api_key=api_key,
             temperature=0.7,  # Higher temperature for conversational responses
             convert_system_message_to_human=True,
+            transport="grpc",
+        )
+
+        # Context cache client for the chat system prompt
+        cache_client = CacheServiceClient(client_options={"api_key": api_key})
+
+        # Chain A: Prompt → Base LLM → Output Parser (LCEL)
+        summary_chain = SUMMARY_PROMPT | base_llm | _str_output_parser
+
+        # Crisis resources: Prompt → Base LLM → Pydantic parser (LCEL)
+        crisis_resources_chain = (
+            CRISIS_RESOURCES_PROMPT | base_llm | CRISIS_RESOURCES_PARSER
         )
 
-        print("✓ Google Gemini dual-model system initialized successfully")
-        print(f"  - Base model (summarization/insights): gemini-2.0-flash-lite")
-        print(f"  - Advanced model (chat): gemini-2.0-flash-lite")
+        # Chains composed with a previous model instance must not be reused
+        with _chain_cache_lock:
+            _chain_cache.clear()
 
-    except Exception as e:
-        print(f"✗ Failed to initialize Gemini models: {str(e)}")
+        logger.info(
+            "Gemini initialized (base: %s, advanced: %s)",
+            "gemini-2.0-flash-lite",
+            "gemini-2.0-flash-lite",
+        )
+
+    except Exception:
+        logger.exception("Failed to initialize Gemini models")
         raise
 
 
@@ -87,6 +164,32 @@ def init_gemini(api_key: str) -> None:
 # CHAIN A: MOOD LOG SUMMARIZATION
 # ============================================================================
 
+# Mood summarization prompt, parsed once at import
+SUMMARY_PROMPT = PromptTemplate(
+    input_variables=["mood_data"],
+    template="""You are analyzing mood tracking data for a mental health app.
+
+Summarize the user's mood patterns over the past week in 2-3 concise sentences.
+
+Focus on:
+- Overall mood trend (improving, declining, stable)
+- Notable patterns or changes
+- Key stress factors or triggers
+- Sleep and energy levels
+
+Mood Data (last 7 days):
+{mood_data}
+
+Provide a brief, empathetic summary:""",
+)
+
+# Summaries keyed by a hash of the formatted mood data: the same 7-day window
+# (chain rebuilds, retries, reconnects) is summarized by Gemini only once
+SUMMARY_CACHE_MAX_SIZE = 1000
+SUMMARY_CACHE_TTL_SECONDS = 3600
+_summary_cache = TTLCache(maxsize=SUMMARY_CACHE_MAX_SIZE, ttl=SUMMARY_CACHE_TTL_SECONDS)
+_summary_cache_lock = threading.Lock()
+
 
 def summarize_mood_logs(mood_logs: List[Dict[str, Any]]) -> str:
     """
@@ -104,45 +207,34 @@ def summarize_mood_logs(mood_logs: List[Dict[str, Any]]) -> str:
     Raises:
         RuntimeError: If Gemini models not initialized
     """
-    if base_llm is None:
+    if summary_chain is None:
         raise RuntimeError("Gemini models not initialized. Call init_gemini() first.")
 
     if not mood_logs or len(mood_logs) == 0:
         return ""
 
     try:
-        # Build prompt template for mood summarization
-        summary_prompt = PromptTemplate(
-            input_variables=["mood_data"],
-            template="""You are analyzing mood tracking data for a mental health app.
-
-Summarize the user's mood patterns over the past week in 2-3 concise sentences.
-
-Focus on:
-- Overall mood trend (improving, declining, stable)
-- Notable patterns or changes
-- Key stress factors or triggers
-- Sleep and energy levels
-
-Mood Data (last 7 days):
-{mood_data}
-
-Provide a brief, empathetic summary:""",
-        )
-
         # Format mood logs for the prompt
         mood_data_text = _format_mood_logs_for_summary(mood_logs)
 
-        # Chain A: Prompt → Base LLM → Output Parser (LCEL)
-        chain_a = summary_prompt | base_llm | StrOutputParser()
+        # The formatted text is exactly what the model sees, so it's the key
+        key = hashlib.blake2b(mood_data_text.encode(), digest_size=16).digest()
+        with _summary_cache_lock:
+            summary = _summary_cache.get(key)
+        if summary is not None:
+            return summary
 
         # Execute chain
-        summary = chain_a.invoke({"mood_data": mood_data_text})
+        summary = summary_chain.invoke({"mood_data": mood_data_text}).strip()
 
-        return summary.strip()
+        # Only real summaries are cached, never the fallback below
+        with _summary_cache_lock:
+            _summary_cache[key] = summary
 
-    except Exception as e:
-        print(f"Error in mood summarization: {str(e)}")
+        return summary
+
+    except Exception:
+        logger.exception("Error in mood summarization")
         # Return graceful fallback
         return "User has been tracking their mood regularly over the past week."
 
@@ -157,86 +249,44 @@ def _format_mood_logs_for_summary(mood_logs: List[Dict[str, Any]]) -> str:
     Returns:
         str: Formatted mood data text
     """
-    formatted_lines = []
-
-    for log in mood_logs:
-        date = log.get("date", "Unknown date")
-        core = log.get("core_scores", {})
-        dass = log.get("dass_today", {})
+    return "\n".join(map(_format_mood_log, mood_logs))
 
-        line = f"Date: {date}"
 
-        if core:
-            line += f" | Mood: {core.get('mood', 'N/A')}/5"
-            line += f", Energy: {core.get('energy', 'N/A')}/5"
-            line += f", Sleep: {core.get('sleep', 'N/A')}/5"
-            line += f", Stress: {core.get('stress', 'N/A')}/5"
+# The only mood log fields _format_mood_log() reads, for projected queries
+MOOD_SUMMARY_FIELDS = ["date", "core_scores", "dass_today", "additional_notes"]
 
-        if dass:
-            line += f" | Depression: {dass.get('depression', 'N/A')}/5"
-            line += f", Anxiety: {dass.get('anxiety', 'N/A')}/5"
 
-        notes = log.get("additional_notes", "")
-        if notes:
-            line += f" | Notes: {notes[:100]}"
+def _format_mood_log(log: Dict[str, Any]) -> str:
+    """Format one mood log as a single summary line, built by one f-string."""
+    core = log.get("core_scores", {})
+    dass = log.get("dass_today", {})
+    notes = log.get("additional_notes", "")
 
-        formatted_lines.append(line)
+    core_text = (
+        f" | Mood: {core.get('mood', 'N/A')}/5"
+        f", Energy: {core.get('energy', 'N/A')}/5"
+        f", Sleep: {core.get('sleep', 'N/A')}/5"
+        f", Stress: {core.get('stress', 'N/A')}/5"
+        if core
+        else ""
+    )
+    dass_text = (
+        f" | Depression: {dass.get('depression', 'N/A')}/5"
+        f", Anxiety: {dass.get('anxiety', 'N/A')}/5"
+        if dass
+        else ""
+    )
+    notes_text = f" | Notes: {notes[:100]}" if notes else ""
 
-    return "\n".join(formatted_lines)
+    return f"Date: {log.get('date', 'Unknown date')}{core_text}{dass_text}{notes_text}"
 
 
 # ============================================================================
 # CHAIN B: CONVERSATIONAL CHAT
 # ============================================================================
 
-
-def create_conversation_chain(user_context: str) -> Runnable:
-    """
-    Create a LangChain LCEL Runnable for chat.
-
-    This builds Chain B with:
-    - Master prompt with user context (profile + mood summary)
-    - MessagesPlaceholder for history
-    - Advanced LLM for high-quality chat responses
-
-    Args:
-        user_context (str): Formatted context (profile + mood summary)
-
-    Returns:
-        Runnable: Configured LCEL chain
-
-    Raises:
-        RuntimeError: If Gemini models not initialized
-    """
-    if advance_llm is None:
-        raise RuntimeError("Gemini models not initialized. Call init_gemini() first.")
-
-    # Build master prompt with user context
-    prompt = ChatPromptTemplate.from_messages(
-        [
-            ("system", _get_master_prompt(user_context)),
-            MessagesPlaceholder(variable_name="history"),
-            ("human", "{input}"),
-        ]
-    )
-
-    # Create LCEL chain: Prompt | Advanced LLM | OutputParser
-    chain = prompt | advance_llm | StrOutputParser()
-
-    return chain
-
-
-def _get_master_prompt(user_context: str) -> str:
-    """
-    Build the master system prompt with user context.
-
-    Args:
-        user_context (str): Formatted user context string
-
-    Returns:
-        str: Complete master prompt
-    """
-    master_prompt = """CORE IDENTITY:
+# Master system prompt; {user_context} is the only template variable
+MASTER_PROMPT = """CORE IDENTITY:
 You are StressBot, an AI companion from the StressEase app. Your primary purpose is to provide a supportive, non-judgmental space for users to express their feelings and work through stress and emotional challenges.
 
 TONE AND LANGUAGE:
@@ -310,7 +360,151 @@ Use the following user context to personalize responses appropriately, but don't
 
 Remember: Be supportive, concise, and always prioritize the user's emotional safety."""
 
-    return master_prompt.format(user_context=user_context)
+# The master prompt split around its only placeholder: the prefix is identical
+# for every user and is what goes into the shared Gemini context cache.
+_MASTER_PROMPT_PREFIX, _MASTER_PROMPT_SUFFIX = MASTER_PROMPT.split("{user_context}")
+
+# Chat prompt templates, parsed once at import. user_context is bound per chain
+# with .partial() instead of being formatted into the template string.
+CHAT_PROMPT = ChatPromptTemplate.from_messages(
+    [
+        ("system", MASTER_PROMPT),
+        MessagesPlaceholder(variable_name="history"),
+        ("human", "{input}"),
+    ]
+)
+
+# Static prompt prefix lives in the Gemini cached content; only the user context
+# and the closing line are sent with each turn, after it
+CACHED_CHAT_PROMPT = ChatPromptTemplate.from_messages(
+    [
+        ("system", "{user_context}" + _MASTER_PROMPT_SUFFIX),
+        MessagesPlaceholder(variable_name="history"),
+        ("human", "{input}"),
+    ]
+)
+
+_str_output_parser = StrOutputParser()
+
+# Composed chat chains keyed by (user context hash, cache name). A chain is
+# stateless, so identical contexts (sessions rebuilt after eviction, users with
+# the same profile and no mood logs) share one instead of re-composing LCEL.
+# The TTL matches the prompt cache's, whose name is part of the key
+CHAIN_CACHE_MAX_SIZE = 2048
+_chain_cache = TTLCache(maxsize=CHAIN_CACHE_MAX_SIZE, ttl=PROMPT_CACHE_TTL_SECONDS)
+_chain_cache_lock = threading.Lock()
+
+
+def create_conversation_chain(
+    user_context: str, cache_name: Optional[str] = None
+) -> Runnable:
+    """
+    Create a LangChain LCEL Runnable for chat.
+
+    This builds Chain B with:
+    - Master prompt with user context (profile + mood summary)
+    - MessagesPlaceholder for history
+    - Advanced LLM for high-quality chat responses
+
+    When a Gemini context cache name is given, the static prompt prefix is
+    served from the cache and only the user context, history and the new
+    message are sent on each turn.
+
+    Args:
+        user_context (str): Formatted context (profile + mood summary)
+        cache_name (Optional[str]): Name from get_prompt_cache(), if any
+
+    Returns:
+        Runnable: Configured LCEL chain
+
+    Raises:
+        RuntimeError: If Gemini models not initialized
+    """
+    if advance_llm is None:
+        raise RuntimeError("Gemini models not initialized. Call init_gemini() first.")
+
+    key = (
+        hashlib.blake2b(user_context.encode(), digest_size=16).digest(),
+        cache_name,
+    )
+    with _chain_cache_lock:
+        chain = _chain_cache.get(key)
+    if chain is not None:
+        return chain
+
+    if cache_name:
+        prompt = CACHED_CHAT_PROMPT.partial(user_context=user_context)
+        llm = advance_llm.bind(cached_content=cache_name)
+    else:
+        # Bind master prompt user context
+        prompt = CHAT_PROMPT.partial(user_context=user_context)
+        llm = advance_llm
+
+    # Create LCEL chain: Prompt | Advanced LLM | OutputParser
+    chain = prompt | llm | _str_output_parser
+
+    with _chain_cache_lock:
+        _chain_cache[key] = chain
+
+    return chain
+
+
+def get_prompt_cache() -> Optional[Tuple[str, datetime]]:
+    """
+    Get the shared Gemini cached content holding the static master prompt.
+
+    The prefix before {user_context} is identical for every user, so one cache
+    serves all chains and is recreated only when it is about to expire.
+
+    Returns:
+        Optional[Tuple[str, datetime]]: Cache name ("cachedContents/{id}") and
+                                        the time it should be refreshed, or
+                                        None if caching is unavailable and the
+                                        prompt should be sent inline
+    """
+    global prompt_cache_enabled, _prompt_cache
+
+    if cache_client is None or advance_llm is None or not prompt_cache_enabled:
+        return None
+
+    if estimate_tokens(_MASTER_PROMPT_PREFIX) < PROMPT_CACHE_MIN_TOKENS:
+        return None
+
+    # Held across the create call so concurrent chains don't each create one
+    with _prompt_cache_lock:
+        now = datetime.now(timezone.utc)
+        if _prompt_cache is not None and now < _prompt_cache[1]:
+            return _prompt_cache
+
+        try:
+            cached_content = cache_client.create_cached_content(
+                cached_content=CachedContent(
+                    model=advance_llm.model,
+                    display_name="stressbot-system-prompt",
+                    system_instruction=Content(
+                        parts=[Part(text=_MASTER_PROMPT_PREFIX)]
+                    ),
+                    ttl=duration_pb2.Duration(seconds=PROMPT_CACHE_TTL_SECONDS),
+                )
+            )
+
+        except google_exceptions.InvalidArgument as e:
+            # Model or prompt size not eligible for explicit caching
+            logger.warning("Prompt caching disabled: %s", e)
+            prompt_cache_enabled = False
+            return None
+
+        except Exception:
+            logger.exception("Error creating prompt cache")
+            return None
+
+        refresh_at = (
+            now
+            + timedelta(seconds=PROMPT_CACHE_TTL_SECONDS)
+            - PROMPT_CACHE_REFRESH_MARGIN
+        )
+        _prompt_cache = (cached_content.name, refresh_at)
+        return _prompt_cache
 
 
 def build_user_context(
@@ -319,6 +513,10 @@ def build_user_context(
     """
     Build formatted user context string from profile and mood summary.
 
+    Runs once per chain build, not per chat turn: the result is cached with the
+    user's chain. Profiles are written by the client app, so the list fields
+    are joined here rather than denormalized at save time.
+
     Args:
         user_profile (Optional[Dict]): User profile data from Firestore
         mood_summary (Optional[str]): Mood summary from Chain A
@@ -326,42 +524,40 @@ def build_user_context(
     Returns:
         str: Formatted context string for prompt
     """
-    context_parts = []
-
-    # Add user profile section
-    if user_profile:
-        context_parts.append("USER PROFILE CONTEXT:")
-
-        if user_profile.get("name"):
-            context_parts.append(f"- Name: {user_profile['name']}")
+    return "\n".join(_iter_context_lines(user_profile, mood_summary))
 
-        if user_profile.get("age"):
-            context_parts.append(f"- Age: {user_profile['age']}")
 
-        if user_profile.get("health_conditions"):
-            conditions = ", ".join(user_profile["health_conditions"])
-            context_parts.append(f"- Health considerations: {conditions}")
+# Profile list fields and their context labels, in output order
+PROFILE_LIST_LABELS = (
+    ("health_conditions", "Health considerations"),
+    ("stress_triggers", "Known stress triggers"),
+    ("goals", "Personal goals"),
+)
 
-        if user_profile.get("stress_triggers"):
-            triggers = ", ".join(user_profile["stress_triggers"])
-            context_parts.append(f"- Known stress triggers: {triggers}")
 
-        if user_profile.get("goals"):
-            goals = ", ".join(user_profile["goals"])
-            context_parts.append(f"- Personal goals: {goals}")
+def _iter_context_lines(
+    user_profile: Optional[Dict[str, Any]], mood_summary: Optional[str]
+) -> Iterator[str]:
+    """Yield the lines of the user context built by build_user_context()."""
+    # User profile section
+    yield "USER PROFILE CONTEXT:"
+    if user_profile:
+        if user_profile.get("name"):
+            yield f"- Name: {user_profile['name']}"
+        if user_profile.get("age"):
+            yield f"- Age: {user_profile['age']}"
+        for field, label in PROFILE_LIST_LABELS:
+            if user_profile.get(field):
+                yield f"- {label}: {', '.join(user_profile[field])}"
     else:
-        context_parts.append("USER PROFILE CONTEXT:")
-        context_parts.append("(Profile incomplete - provide general support)")
+        yield "(Profile incomplete - provide general support)"
 
-    # Add mood context section
+    # Mood context section
+    yield "\nMOOD CONTEXT:"
     if mood_summary:
-        context_parts.append("\nMOOD CONTEXT:")
-        context_parts.append(f"Recent mood pattern: {mood_summary}")
+        yield f"Recent mood pattern: {mood_summary}"
     else:
-        context_parts.append("\nMOOD CONTEXT:")
-        context_parts.append("(No mood history available yet)")
-
-    return "\n".join(context_parts)
+        yield "(No mood history available yet)"
 
 
 def generate_chat_response(
@@ -386,19 +582,138 @@ def generate_chat_response(
         response = chain.invoke({"input": user_message, "history": history})
 
         # Validate response for safety and appropriateness
-        validated_response = validate_gemini_response(response)
+        return finalize_chat_response(response)
 
-        # Return validated response or fallback
-        if validated_response is None:
-            return "I'm sorry, I couldn't generate a helpful response. How else can I support you today?"
+    except Exception:
+        logger.exception("Error generating chat response")
+        return CONNECTION_ERROR_RESPONSE
 
-        return validated_response
 
-    except Exception as e:
-        print(f"Error generating chat response: {str(e)}")
-        return (
-            "I'm having trouble connecting right now. Could we try again in a moment?"
-        )
+def stream_chat_response(
+    chain: Runnable, user_message: str, history: List[BaseMessage]
+) -> Iterator[str]:
+    """
+    Stream raw response text from the LCEL chain (Chain B) as it is generated.
+
+    Chunks are unvalidated: check them with contains_unsafe_content() before
+    showing them, and pass the joined text to finalize_chat_response() once
+    the stream ends.
+
+    Args:
+        chain (Runnable): The LCEL conversation chain
+        user_message (str): User's input message
+        history (List[BaseMessage]): Chat history
+
+    Yields:
+        str: Response text deltas
+
+    Raises:
+        Exception: If response generation fails
+    """
+    for chunk in chain.stream({"input": user_message, "history": history}):
+        if chunk:
+            yield chunk
+
+
+def finalize_chat_response(response: str) -> str:
+    """
+    Validate a complete chat response, substituting the fallback if it is empty.
+
+    Args:
+        response (str): Full raw AI response text
+
+    Returns:
+        str: AI's validated response text
+    """
+    validated_response = validate_gemini_response(response)
+
+    # Return validated response or fallback
+    if validated_response is None:
+        return EMPTY_RESPONSE_FALLBACK
+
+    return validated_response
+
+
+# Response safety checks, in priority order. Each keyword list is compiled into
+# one case-insensitive alternation, so a response is scanned once per category
+# by the regex engine, without a lowercased copy or a loop per keyword
+CRISIS_KEYWORDS = [
+    "suicide",
+    "self-harm",
+    "kill yourself",
+    "end it all",
+    "hurt myself",
+    "die",
+]
+
+DIAGNOSIS_PATTERNS = [
+    "you have ",
+    "you are suffering from",
+    "you might have",
+    "you probably have",
+    "sounds like you have",
+    "diagnosis",
+    "diagnose",
+    "condition is",
+    "disorder",
+    "i diagnose",
+    "you exhibit symptoms of",
+    "clinical depression",
+    "clinical anxiety",
+    "you are experiencing",
+    "you are exhibiting",
+    "pathological",
+    "psychiatric condition",
+]
+
+MEDICATION_PATTERNS = [
+    "you should take",
+    "you need to take",
+    "prescribe",
+    "medication",
+    "dosage",
+    "you should try",
+    "treatment plan",
+    "medical treatment",
+    "therapy regimen",
+]
+
+CRISIS_RESPONSE = """I notice this is a serious topic. If you're experiencing a crisis, please tap the red 'SOS' button in the chat to connect with professional crisis resources immediately. How can I support you right now?"""
+DIAGNOSIS_RESPONSE = """I'm here to listen and support you, but I can't provide medical diagnoses or clinical advice. Consider discussing your feelings with a healthcare professional who can provide personalized guidance. How else can I support you today?"""
+MEDICATION_RESPONSE = """I'm here to provide emotional support, but I can't recommend specific treatments or medications. A healthcare professional would be the best person to discuss treatment options with you. Is there something else on your mind that you'd like to talk about?"""
+
+
+def _compile_keywords(keywords: List[str]) -> re.Pattern:
+    """Compile literal keywords into a single case-insensitive alternation."""
+    return re.compile("|".join(map(re.escape, keywords)), re.IGNORECASE)
+
+
+_SAFETY_CHECKS = [
+    (_compile_keywords(CRISIS_KEYWORDS), CRISIS_RESPONSE),
+    (_compile_keywords(DIAGNOSIS_PATTERNS), DIAGNOSIS_RESPONSE),
+    (_compile_keywords(MEDICATION_PATTERNS), MEDICATION_RESPONSE),
+]
+
+# While streaming, the last STREAM_HOLDBACK_CHARS characters are held back
+# from the client, so a keyword split across chunks is complete (and caught)
+# before any part of it is sent
+STREAM_HOLDBACK_CHARS = (
+    max(map(len, CRISIS_KEYWORDS + DIAGNOSIS_PATTERNS + MEDICATION_PATTERNS)) - 1
+)
+
+
+def contains_unsafe_content(text: str, start: int = 0) -> bool:
+    """
+    Check whether text matches any crisis, diagnosis or medication pattern.
+
+    Args:
+        text (str): Response text so far
+        start (int): Offset to scan from; matches starting earlier are ignored
+
+    Returns:
+        bool: True if validate_gemini_response() would replace the text
+    """
+    return any(pattern.search(text, start) for pattern, _ in _SAFETY_CHECKS)
 
 
 def validate_gemini_response(response: str) -> Optional[str]:
@@ -419,67 +734,84 @@ def validate_gemini_response(response: str) -> Optional[str]:
     Returns:
         Optional[str]: Validated response or safe alternative
     """
-    if not response or len(response.strip()) == 0:
+    # isspace() instead of strip(): no stripped copy of every response
+    if not response or response.isspace():
         return None
 
-    response_lower = response.lower()
+    # Crisis content, then diagnosis language, then medication/treatment advice
+    for pattern, safe_response in _SAFETY_CHECKS:
+        if pattern.search(response):
+            return safe_response
 
-    # Check for crisis-related content in AI response
-    crisis_keywords = [
-        "suicide",
-        "self-harm",
-        "kill yourself",
-        "end it all",
-        "hurt myself",
-        "die",
-    ]
-    for keyword in crisis_keywords:
-        if keyword in response_lower:
-            return """I notice this is a serious topic. If you're experiencing a crisis, please tap the red 'SOS' button in the chat to connect with professional crisis resources immediately. How can I support you right now?"""
-
-    # Check for diagnosis language violations
-    diagnosis_patterns = [
-        "you have ",
-        "you are suffering from",
-        "you might have",
-        "you probably have",
-        "sounds like you have",
-        "diagnosis",
-        "diagnose",
-        "condition is",
-        "disorder",
-        "i diagnose",
-        "you exhibit symptoms of",
-        "clinical depression",
-        "clinical anxiety",
-        "you are experiencing",
-        "you are exhibiting",
-        "pathological",
-        "psychiatric condition",
-    ]
+    return response
 
-    for pattern in diagnosis_patterns:
-        if pattern in response_lower:
-            return """I'm here to listen and support you, but I can't provide medical diagnoses or clinical advice. Consider discussing your feelings with a healthcare professional who can provide personalized guidance. How else can I support you today?"""
-
-    # Check for medication/treatment advice
-    medication_patterns = [
-        "you should take",
-        "you need to take",
-        "prescribe",
-        "medication",
-        "dosage",
-        "you should try",
-        "treatment plan",
-        "medical treatment",
-        "therapy regimen",
-    ]
 
-    for pattern in medication_patterns:
-        if pattern in response_lower:
-            return """I'm here to provide emotional support, but I can't recommend specific treatments or medications. A healthcare professional would be the best person to discuss treatment options with you. Is there something else on your mind that you'd like to talk about?"""
+# ============================================================================
+# TOKEN BUDGETING
+# ============================================================================
 
-    return response
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the token count of a string without a tokenizer round trip.
+
+    Args:
+        text (str): Text to measure
+
+    Returns:
+        int: Approximate token count
+    """
+    return len(text) // CHARS_PER_TOKEN
+
+
+def count_tokens(messages: List[BaseMessage]) -> int:
+    """
+    Estimate the token count of a chat history.
+
+    Args:
+        messages (List[BaseMessage]): Chat history
+
+    Returns:
+        int: Approximate token count including per-message overhead
+    """
+    return sum(
+        estimate_tokens(message.content) + TOKENS_PER_MESSAGE for message in messages
+    )
+
+
+def trim_messages_to_budget(
+    messages: List[BaseMessage], max_tokens: int, min_messages: int = 2
+) -> List[BaseMessage]:
+    """
+    Drop the oldest messages until the history fits within a token budget.
+
+    The newest min_messages (the last user/assistant pair by default) are always
+    kept, and the result never starts with an assistant message, so it begins
+    on a whole turn.
+
+    Args:
+        messages (List[BaseMessage]): Chat history, oldest first
+        max_tokens (int): Token budget for the history
+        min_messages (int): Number of newest messages kept regardless of budget
+
+    Returns:
+        List[BaseMessage]: The newest messages that fit within the budget
+    """
+    start = len(messages)
+    total = 0
+
+    while start > 0:
+        cost = estimate_tokens(messages[start - 1].content) + TOKENS_PER_MESSAGE
+        if total + cost > max_tokens and len(messages) - start >= min_messages:
+            break
+        total += cost
+        start -= 1
+
+    # Start on a user message so turns stay paired
+    while start < len(messages) - 1 and messages[start].type == "ai":
+        start += 1
+
+    return messages[start:]
 
 
 # ============================================================================
@@ -520,6 +852,29 @@ class CrisisResources(BaseModel):
     online_resources: List[OnlineResource]
 
 
+# Parser and prompt for crisis resource generation, built once at import
+CRISIS_RESOURCES_PARSER = PydanticOutputParser(pydantic_object=CrisisResources)
+
+CRISIS_RESOURCES_PROMPT = PromptTemplate(
+    template="""Generate a comprehensive list of mental health crisis resources for {country}.
+
+Include ONLY verified, legitimate resources:
+- One emergency service with number and description
+- 2-5 crisis hotlines with name, phone (with country code), description, and website
+- 2-5 online resources with name, description, and website
+
+Ensure all information is accurate and up-to-date.
+
+{format_instructions}
+
+Country: {country}""",
+    input_variables=["country"],
+    partial_variables={
+        "format_instructions": CRISIS_RESOURCES_PARSER.get_format_instructions()
+    },
+)
+
+
 def find_crisis_resources(country: str) -> Optional[Dict[str, Any]]:
     """
     Generate country-specific crisis resources using structured output.
@@ -535,40 +890,16 @@ def find_crisis_resources(country: str) -> Optional[Dict[str, Any]]:
     Raises:
         RuntimeError: If Gemini models not initialized
     """
-    if base_llm is None:
+    if crisis_resources_chain is None:
         raise RuntimeError("Gemini models not initialized. Call init_gemini() first.")
 
     try:
-        # Create Pydantic output parser
-        parser = PydanticOutputParser(pydantic_object=CrisisResources)
-
-        # Build prompt with format instructions
-        prompt = PromptTemplate(
-            template="""Generate a comprehensive list of mental health crisis resources for {country}.
-
-Include ONLY verified, legitimate resources:
-- One emergency service with number and description
-- 2-5 crisis hotlines with name, phone (with country code), description, and website
-- 2-5 online resources with name, description, and website
-
-Ensure all information is accurate and up-to-date.
-
-{format_instructions}
-
-Country: {country}""",
-            input_variables=["country"],
-            partial_variables={"format_instructions": parser.get_format_instructions()},
-        )
-
-        # Chain: Prompt → Base LLM → Parser (LCEL)
-        chain = prompt | base_llm | parser
-
-        # Execute chain
-        resources = chain.invoke({"country": country})
+        # Execute the chain composed in init_gemini()
+        resources = crisis_resources_chain.invoke({"country": country})
 
         # Convert Pydantic model to dict
-        return resources.dict()
+        return resources.model_dump()
 
-    except Exception as e:
-        print(f"Error generating crisis resources for {country}: {str(e)}")
+    except Exception:
+        logger.exception("Error generating crisis resources for %s", country)
         return None
@@ -7,9 +7,16 @@ This module handles all mood tracking operations including:
 - Mood history retrieval
 """
 
-from datetime import datetime, date
+from datetime import date
 from typing import Dict, List, Optional, Any
+from cachetools import TTLCache
+from firebase_admin import firestore
+from google.api_core import exceptions as google_exceptions
 from stressease.services.utility.firebase_config import get_firestore_client
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
 
 
 # ============================================================================
@@ -54,29 +61,33 @@ def upsert_daily_mood_log(
         daily_log["user_id"] = user_id
 
         # Add server timestamp
-        daily_log["submitted_at"] = datetime.utcnow()
+        daily_log["submitted_at"] = firestore.SERVER_TIMESTAMP
 
         # Upsert: creates if new, overwrites if exists
         # This is naturally idempotent - same request multiple times = same result
         doc_ref = db.collection("user_mood_logs").document(doc_id)
         doc_ref.set(daily_log)
 
-        print(f"✓ Upserted mood log: {doc_id}")
+        logger.debug("Upserted mood log: %s", doc_id)
 
         return {"doc_id": doc_id, "date": date_str, "operation": "upsert"}
 
-    except Exception as e:
-        print(f"✗ Error upserting mood log for {user_id}: {str(e)}")
+    except Exception:
+        logger.exception("Error upserting mood log for %s", user_id)
         return None
 
 
-def get_last_daily_mood_logs(user_id: str, limit: int = 7) -> List[Dict[str, Any]]:
+def get_last_daily_mood_logs(
+    user_id: str, limit: int = 7, fields: Optional[List[str]] = None
+) -> List[Dict[str, Any]]:
     """
     Retrieve the most recent daily mood quiz logs for a user.
 
     Args:
         user_id (str): Firebase Auth user ID
         limit (int): Number of entries to retrieve (default: 7)
+        fields (Optional[List[str]]): Top-level fields to fetch (plus 'id');
+                                      all fields when None
 
     Returns:
         List[Dict[str, Any]]: List of daily mood logs (newest first)
@@ -84,8 +95,6 @@ def get_last_daily_mood_logs(user_id: str, limit: int = 7) -> List[Dict[str, Any
     db = get_firestore_client()
 
     try:
-        from firebase_admin import firestore
-
         logs = []
         query = (
             db.collection("user_mood_logs")
@@ -93,14 +102,16 @@ def get_last_daily_mood_logs(user_id: str, limit: int = 7) -> List[Dict[str, Any
             .order_by("submitted_at", direction=firestore.Query.DESCENDING)
             .limit(limit)
         )
+        if fields is not None:
+            query = query.select(fields)
         docs = query.stream()
         for doc in docs:
             entry = doc.to_dict()
             entry["id"] = doc.id
             logs.append(entry)
         return logs
-    except Exception as e:
-        print(f"Error retrieving last daily mood logs for {user_id}: {str(e)}")
+    except Exception:
+        logger.exception("Error retrieving last daily mood logs for %s", user_id)
         return []
 
 
@@ -117,13 +128,12 @@ def get_daily_mood_logs_count(user_id: str) -> int:
     db = get_firestore_client()
 
     try:
+        # Server-side count aggregation instead of streaming every document
         query = db.collection("user_mood_logs").where("user_id", "==", user_id)
-        count = 0
-        for _ in query.stream():
-            count += 1
-        return count
-    except Exception as e:
-        print(f"Error counting daily mood logs for {user_id}: {str(e)}")
+        results = query.count(alias="total").get()
+        return int(results[0][0].value)
+    except Exception:
+        logger.exception("Error counting daily mood logs for %s", user_id)
         return 0
 
 
@@ -131,35 +141,10 @@ def get_daily_mood_logs_count(user_id: str) -> int:
 # WEEKLY DASS OPERATIONS
 # ============================================================================
 
-
-def weekly_dass_exists(user_id: str, week_start: str, week_end: str) -> bool:
-    """
-    Check if a weekly DASS record already exists for the given user and week.
-
-    Args:
-        user_id (str): Firebase Auth user ID
-        week_start (str): ISO date string for week start
-        week_end (str): ISO date string for week end
-
-    Returns:
-        bool: True if a record exists, False otherwise
-    """
-    db = get_firestore_client()
-
-    try:
-        query = (
-            db.collection("user_weekly_dass")
-            .where("user_id", "==", user_id)
-            .where("week_start", "==", week_start)
-            .where("week_end", "==", week_end)
-        )
-        docs = query.stream()
-        for _ in docs:
-            return True
-        return False
-    except Exception as e:
-        print(f"Error checking weekly DASS existence for {user_id}: {str(e)}")
-        return False
+# Weeks starting on or after this date are only ever saved under the composite
+# document ID, so the legacy field query is skipped for them (ISO dates
+# compare correctly as strings)
+LEGACY_WEEKLY_DASS_CUTOVER = "2026-10-14"
 
 
 def save_weekly_dass_totals(
@@ -171,9 +156,14 @@ def save_weekly_dass_totals(
     stress_total: int,
 ) -> Optional[str]:
     """
-    Save weekly DASS-21 totals to Firestore.
+    Save weekly DASS-21 totals to Firestore, once per user and week range.
 
     Collection: user_weekly_dass
+    Uses composite document ID: {user_id}_{week_start}_{week_end}
+    The create() fails if the week was already saved under that ID. Weeks
+    starting before LEGACY_WEEKLY_DASS_CUTOVER may have been saved under random
+    IDs, so for those a field query runs first. It is create() rather than
+    set() so a week's first totals are never overwritten.
 
     Args:
         user_id (str): Firebase Auth user ID
@@ -185,10 +175,25 @@ def save_weekly_dass_totals(
 
     Returns:
         Optional[str]: Document ID if saved successfully, else None
+                       (including when the week already exists)
     """
     db = get_firestore_client()
 
     try:
+        weekly_ref = db.collection("user_weekly_dass")
+
+        # Weeks saved before the composite ID have random document IDs, which
+        # create() can't collide with; match them on their fields instead
+        if week_start < LEGACY_WEEKLY_DASS_CUTOVER:
+            legacy_query = (
+                weekly_ref.where("user_id", "==", user_id)
+                .where("week_start", "==", week_start)
+                .where("week_end", "==", week_end)
+                .limit(1)
+            )
+            if int(legacy_query.count(alias="total").get()[0][0].value) > 0:
+                return None
+
         data = {
             "user_id": user_id,
             "week_start": week_start,
@@ -196,13 +201,16 @@ def save_weekly_dass_totals(
             "depression_total": depression_total,
             "anxiety_total": anxiety_total,
             "stress_total": stress_total,
-            "calculated_at": datetime.utcnow(),
+            "calculated_at": firestore.SERVER_TIMESTAMP,
         }
 
-        doc_ref = db.collection("user_weekly_dass").add(data)
-        return doc_ref[1].id
-    except Exception as e:
-        print(f"Error saving weekly DASS totals for {user_id}: {str(e)}")
+        doc_id = f"{user_id}_{week_start}_{week_end}"
+        weekly_ref.document(doc_id).create(data)
+        return doc_id
+    except google_exceptions.AlreadyExists:
+        return None
+    except Exception:
+        logger.exception("Error saving weekly DASS totals for %s", user_id)
         return None
 
 
@@ -211,9 +219,22 @@ def save_weekly_dass_totals(
 # ============================================================================
 
 
+# Question sets are static content - keep them in memory instead of reading
+# Firestore on every quiz submission
+QUESTIONS_CACHE_MAX_SIZE = 64
+QUESTIONS_CACHE_TTL_SECONDS = 3600
+_questions_cache = TTLCache(
+    maxsize=QUESTIONS_CACHE_MAX_SIZE, ttl=QUESTIONS_CACHE_TTL_SECONDS
+)
+_questions_cache_lock = threading.Lock()
+
+
 def get_daily_questions(day_key: str) -> List[Dict[str, Any]]:
     """
-    Fetch daily quiz questions from Firestore for context-aware AI insights.
+    Get daily quiz questions for context-aware AI insights, cached per day_key.
+
+    Only non-empty results are cached, so a missing document or a failed read
+    is retried on the next call. The returned list is shared; don't mutate it.
 
     Args:
         day_key (str): Day identifier (e.g., "day_1", "day_2")
@@ -222,6 +243,61 @@ def get_daily_questions(day_key: str) -> List[Dict[str, Any]]:
         List[Dict]: List of question objects with 'text', 'dimension', 'options', etc.
                     Returns empty list if not found or invalid structure.
     """
+    with _questions_cache_lock:
+        questions = _questions_cache.get(day_key)
+    if questions is not None:
+        return questions
+
+    questions = _fetch_daily_questions(day_key)
+    if questions:
+        with _questions_cache_lock:
+            _questions_cache[day_key] = questions
+
+    return questions
+
+
+def clear_questions_cache() -> None:
+    """Drop all cached question sets (call after editing the questions collection)."""
+    with _questions_cache_lock:
+        _questions_cache.clear()
+
+
+def preload_daily_questions() -> int:
+    """
+    Read every question set in one query and fill the questions cache, so the
+    first quiz submission for each day doesn't pay a Firestore round trip.
+
+    Returns:
+        int: Number of question sets cached
+    """
+    db = get_firestore_client()
+
+    try:
+        loaded = {}
+        for doc in db.collection("questions").stream():
+            questions = _parse_questions(doc.id, doc.to_dict())
+            if questions:
+                loaded[doc.id] = questions
+
+        with _questions_cache_lock:
+            _questions_cache.update(loaded)
+        return len(loaded)
+
+    except Exception:
+        logger.exception("Error preloading questions")
+        return 0
+
+
+def _fetch_daily_questions(day_key: str) -> List[Dict[str, Any]]:
+    """
+    Fetch daily quiz questions from Firestore.
+
+    Args:
+        day_key (str): Day identifier (e.g., "day_1", "day_2")
+
+    Returns:
+        List[Dict]: List of question objects, or empty list if not found
+    """
     db = get_firestore_client()
 
     try:
@@ -229,35 +305,48 @@ def get_daily_questions(day_key: str) -> List[Dict[str, Any]]:
         doc = doc_ref.get()
 
         if not doc.exists:
-            print(f"⚠ No questions document found for {day_key}")
+            logger.warning("No questions document found for %s", day_key)
             return []
 
-        data = doc.to_dict()
-        questions_field = data.get("questions", [])
-
-        # Handle both List and Map structures (matching frontend logic)
-        if isinstance(questions_field, list):
-            # Direct list of questions
-            return questions_field
-        elif isinstance(questions_field, dict):
-            # Map structure - extract values and sort by key if numeric
-            try:
-                # Try to sort numerically if keys are numbers
-                sorted_keys = sorted(
-                    questions_field.keys(), key=lambda x: int(x) if x.isdigit() else x
-                )
-                return [questions_field[k] for k in sorted_keys]
-            except (ValueError, TypeError):
-                # Fallback to values without sorting
-                return list(questions_field.values())
-        else:
-            print(
-                f"⚠ Unexpected questions field structure for {day_key}: {type(questions_field)}"
-            )
-            return []
+        return _parse_questions(day_key, doc.to_dict())
+
+    except Exception:
+        logger.exception("Error fetching questions for %s", day_key)
+        return []
+
+
+def _parse_questions(day_key: str, data: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Extract the ordered question list from a questions document.
+
+    Args:
+        day_key (str): Day identifier, for logging
+        data (dict): Questions document data
 
-    except Exception as e:
-        print(f"✗ Error fetching questions for {day_key}: {str(e)}")
+    Returns:
+        List[Dict]: List of question objects, or empty list if invalid
+    """
+    questions_field = data.get("questions", [])
+
+    # Handle both List and Map structures (matching frontend logic)
+    if isinstance(questions_field, list):
+        # Direct list of questions
+        return questions_field
+    elif isinstance(questions_field, dict):
+        # Map structure - extract values sorted by key, numerically if
+        # every key is a number
+        keys = list(questions_field)
+        if all(k.isdigit() for k in keys):
+            keys.sort(key=int)
+        else:
+            keys.sort()
+        return [questions_field[k] for k in keys]
+    else:
+        logger.warning(
+            "Unexpected questions field structure for %s: %s",
+            day_key,
+            type(questions_field),
+        )
         return []
 
 
@@ -292,8 +381,10 @@ def get_daily_mood_log_by_date(user_id: str, date_str: str) -> Optional[Dict[str
             data["id"] = doc.id
             return data
         return None
-    except Exception as e:
-        print(f"Error checking daily mood log for {user_id} on {date_str}: {str(e)}")
+    except Exception:
+        logger.exception(
+            "Error checking daily mood log for %s on %s", user_id, date_str
+        )
         return None
 
 
@@ -311,9 +402,9 @@ def update_daily_mood_log(doc_id: str, daily_log: Dict[str, Any]) -> bool:
     db = get_firestore_client()
 
     try:
-        daily_log["submitted_at"] = datetime.utcnow()  # Update timestamp
+        daily_log["submitted_at"] = firestore.SERVER_TIMESTAMP  # Update timestamp
         db.collection("user_mood_logs").document(doc_id).update(daily_log)
         return True
-    except Exception as e:
-        print(f"Error updating daily mood log {doc_id}: {str(e)}")
+    except Exception:
+        logger.exception("Error updating daily mood log %s", doc_id)
         return False
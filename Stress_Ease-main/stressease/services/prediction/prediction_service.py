@@ -1,12 +1,25 @@
 """Stress prediction service using Gemini LLM with fallback logic."""
 
-from typing import Dict, Any, Optional
-from datetime import datetime, timedelta
+from typing import Dict, Any, List, Optional, Tuple
+import hashlib
+import logging
+import math
+import random
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from cachetools import TTLCache
 from pydantic import BaseModel, Field
 from langchain_core.prompts import PromptTemplate
-from langchain_core.output_parsers import PydanticOutputParser
+from langsmith import tracing_context
+from firebase_admin import firestore
 
-from stressease.services.chat.llm_service import base_llm
+from stressease.services.chat import llm_service
+from stressease.services.utility.firebase_config import get_firestore_client
+from stressease.services.utility.firestore_batcher import firestore_batcher
+
+logger = logging.getLogger(__name__)
 
 
 # ============================================================================
@@ -28,6 +41,528 @@ class StressPrediction(BaseModel):
     )
 
 
+# ============================================================================
+# PREDICTION PROMPT
+# ============================================================================
+
+# Static-first layout: task and guidelines are identical on every call, so
+# Gemini's implicit prefix caching can reuse them; only the metrics at the end
+# vary. (The static part is below the explicit-cache minimum)
+PREDICTION_PROMPT = PromptTemplate(
+    template="""You are an AI assistant analyzing mental health metrics to predict stress levels.
+
+**Prediction Task:**
+Predict the probability that the user will experience HIGH stress tomorrow, given their 7-day averages.
+
+**Guidelines:**
+- Lower mood scores (1-2) suggest higher stress risk
+- Higher chat count suggests user is struggling/seeking more support
+- Lower quiz scores (12-30) indicate poor overall wellness, higher stress risk
+- Stress probability should be between 0.0 and 1.0
+- Label: "High" if probability >= 0.7, "Medium" if 0.4-0.69, "Low" if < 0.4
+- Confidence: How certain you are about this prediction (0.0 to 1.0)
+
+7-day averages:
+- Average Mood Score: {avg_mood_score}/5.0 (where 1=Very Poor, 5=Excellent)
+- Chat Sessions Count: {chat_count} (seeking support/venting sessions)
+- Average Quiz Score: {avg_quiz_score}/60 (sum of 12 daily questions, each 1-5)
+
+Analyze and predict:""",
+    input_variables=["avg_mood_score", "chat_count", "avg_quiz_score"],
+)
+
+# Prompt → Base LLM in JSON mode, composed once per base_llm instance
+_prediction_chain = None
+_prediction_chain_base = None
+
+
+def _get_prediction_chain():
+    """
+    Get the prediction chain, rebuilt only when init_gemini() replaces base_llm.
+
+    Decoding is constrained to the StressPrediction schema, so no format
+    instructions are sent and the response needs no text parsing.
+
+    Returns:
+        Runnable: Prediction inputs -> StressPrediction
+    """
+    global _prediction_chain, _prediction_chain_base
+
+    base_llm = llm_service.base_llm
+    if _prediction_chain is None or _prediction_chain_base is not base_llm:
+        _prediction_chain = PREDICTION_PROMPT | base_llm.with_structured_output(
+            StressPrediction, method="json_schema"
+        )
+        _prediction_chain_base = base_llm
+
+    return _prediction_chain
+
+
+# Share of prediction calls traced to LangSmith when monitoring is enabled;
+# the rest skip run serialization and upload entirely
+PREDICTION_TRACE_SAMPLE_RATE = 0.1
+
+
+def _prediction_tracing():
+    """
+    Tracing context for one prediction call, sampled at
+    PREDICTION_TRACE_SAMPLE_RATE.
+
+    Returns:
+        ContextManager: Defers to the environment when sampled, else disables
+                        tracing for the block
+    """
+    sampled = random.random() < PREDICTION_TRACE_SAMPLE_RATE
+    return tracing_context(enabled=None if sampled else False)
+
+
+# ============================================================================
+# PREDICTION CACHE
+# ============================================================================
+
+# LLM predictions keyed by quantized inputs: mood to 0.1, chat count capped
+# where it stops adding signal (the same cap as _fallback_prediction), quiz
+# score as-is. The inputs are low-entropy, so repeat requests skip Gemini
+PREDICTION_CACHE_MAX_SIZE = 4096
+PREDICTION_CACHE_TTL_SECONDS = 24 * 3600
+CHAT_COUNT_CAP = 15
+_prediction_cache = TTLCache(
+    maxsize=PREDICTION_CACHE_MAX_SIZE, ttl=PREDICTION_CACHE_TTL_SECONDS
+)
+_prediction_cache_lock = threading.Lock()
+
+# Near-duplicate lookup on an exact miss, in normalized input space (each input
+# divided by its range, L-infinity distance): a cached prediction closer than
+# NEAR_MATCH_DISTANCE is reused as-is; otherwise two neighbours within
+# INTERPOLATION_DISTANCE are blended, with reduced confidence
+NEAR_MATCH_DISTANCE = 0.05
+INTERPOLATION_DISTANCE = 0.1
+INTERPOLATED_CONFIDENCE_FACTOR = 0.9
+_KEY_SCALE = (5.0, CHAT_COUNT_CAP, 60.0)
+
+# Exact hit / near hit / obvious region / local model / Firestore hit / miss
+# counters for the prediction cache
+prediction_cache_stats = {
+    "hits": 0,
+    "near_hits": 0,
+    "obvious_hits": 0,
+    "local_hits": 0,
+    "stored_hits": 0,
+    "misses": 0,
+}
+
+# Inputs whose fallback probability is outside this band are clearly Low or
+# clearly High, so the fallback is served as-is (at its usual confidence)
+# without asking Gemini
+OBVIOUS_PROBABILITY_BAND = (0.15, 0.85)
+
+
+def _prediction_key(
+    avg_mood_score: float, chat_count: int, avg_quiz_score: int
+) -> Tuple[float, int, int]:
+    """Quantize prediction inputs into a cache key (also the values sent to the LLM)."""
+    return (
+        round(avg_mood_score, 1),
+        min(chat_count, CHAT_COUNT_CAP),
+        avg_quiz_score,
+    )
+
+
+def _cached_llm_prediction(
+    avg_mood_score: float, chat_count: int, avg_quiz_score: int
+) -> Optional[Dict[str, Any]]:
+    """
+    Get an LLM prediction for quantized inputs, calling Gemini only on a miss.
+
+    Failed predictions are not cached, so they are retried on the next call.
+
+    Args:
+        avg_mood_score: 7-day average mood score (1.0 - 5.0)
+        chat_count: Number of chat sessions in last 7 days
+        avg_quiz_score: Average sum of quiz questions over 7 days (12 - 60)
+
+    Returns:
+        Optional[Dict]: Prediction dict (shared; don't mutate) or None if LLM fails
+    """
+    key = _prediction_key(avg_mood_score, chat_count, avg_quiz_score)
+
+    with _prediction_cache_lock:
+        result = _prediction_cache.get(key)
+        entries = list(_prediction_cache.items()) if result is None else None
+    if result is not None:
+        _count_prediction_lookup("hits")
+        return result
+
+    result = _nearest_cached_prediction(key, entries)
+    if result is not None:
+        _count_prediction_lookup("near_hits")
+        return result
+
+    result = _obvious_prediction(key)
+    if result is not None:
+        _count_prediction_lookup("obvious_hits")
+        return result
+
+    result = _local_prediction(key)
+    if result is not None:
+        _count_prediction_lookup("local_hits")
+        return result
+
+    result = _load_stored_predictions([key]).get(key)
+    if result is not None:
+        _count_prediction_lookup("stored_hits")
+        with _prediction_cache_lock:
+            _prediction_cache[key] = result
+        return result
+
+    _count_prediction_lookup("misses")
+    result = _predict_with_llm(*key)
+    if result:
+        with _prediction_cache_lock:
+            _prediction_cache[key] = result
+        _store_prediction(key, result)
+        _log_training_sample(key, result)
+
+    return result
+
+
+def _obvious_prediction(key: Tuple[float, int, int]) -> Optional[Dict[str, Any]]:
+    """
+    Serve the deterministic formula for inputs far from every label boundary.
+
+    The result keeps the fallback's confidence: it is the same formula, only
+    served where its label can't plausibly differ from Gemini's.
+
+    Args:
+        key: Quantized inputs
+
+    Returns:
+        Optional[Dict]: Prediction dict, or None if the fallback probability
+                        is within OBVIOUS_PROBABILITY_BAND
+    """
+    result = _fallback_prediction(*key)
+    low, high = OBVIOUS_PROBABILITY_BAND
+    if low <= result["stress_probability"] <= high:
+        return None
+
+    return result
+
+
+def _count_prediction_lookup(outcome: str) -> None:
+    """Increment one prediction_cache_stats counter."""
+    with _prediction_cache_lock:
+        prediction_cache_stats[outcome] += 1
+
+
+def _nearest_cached_prediction(
+    key: Tuple[float, int, int], entries: List[Tuple[Tuple[float, int, int], Dict]]
+) -> Optional[Dict[str, Any]]:
+    """
+    Reuse or interpolate cached LLM predictions for inputs close to key.
+
+    Args:
+        key: Quantized inputs with no exact cache entry
+        entries: Snapshot of the prediction cache as (key, prediction) pairs
+
+    Returns:
+        Optional[Dict]: The nearest prediction, a blend of the two nearest, or
+                        None if no cached input is close enough
+    """
+    if not entries:
+        return None
+
+    # numpy is only needed from the first cache miss on, not at worker boot
+    import numpy as np
+
+    points = np.array([entry_key for entry_key, _ in entries]) / _KEY_SCALE
+    distances = np.abs(points - np.array(key) / _KEY_SCALE).max(axis=1)
+    nearest = np.argsort(distances)[:2]
+
+    first = entries[nearest[0]][1]
+    first_distance = distances[nearest[0]]
+    if first_distance < NEAR_MATCH_DISTANCE:
+        return first
+
+    if len(nearest) < 2 or distances[nearest[1]] >= INTERPOLATION_DISTANCE:
+        return None
+
+    # Inverse-distance blend: the closer neighbour gets the larger weight
+    second = entries[nearest[1]][1]
+    second_distance = distances[nearest[1]]
+    weight = second_distance / (first_distance + second_distance)
+    probability = round(
+        float(
+            weight * first["stress_probability"]
+            + (1 - weight) * second["stress_probability"]
+        ),
+        2,
+    )
+    confidence = round(
+        min(first["confidence"], second["confidence"]) * INTERPOLATED_CONFIDENCE_FACTOR,
+        2,
+    )
+
+    return {
+        "stress_probability": probability,
+        "label": _stress_label(probability),
+        "confidence": confidence,
+    }
+
+
+# Labels indexed by how many thresholds a probability reaches
+STRESS_LABELS = ("Low", "Medium", "High")
+MEDIUM_THRESHOLD = 0.4
+HIGH_THRESHOLD = 0.7
+
+
+def _stress_label(stress_probability: float) -> str:
+    """Map a stress probability to its High/Medium/Low label."""
+    return STRESS_LABELS[
+        (stress_probability >= MEDIUM_THRESHOLD)
+        + (stress_probability >= HIGH_THRESHOLD)
+    ]
+
+
+# ============================================================================
+# LOCAL REGRESSOR
+# ============================================================================
+
+# Every fresh LLM prediction is shadow-logged here as a training sample
+TRAINING_SAMPLES_COLLECTION = "llm_training_samples"
+
+# Logistic model fitted offline on those samples, stored as
+# model_config/stress_regressor = {"weights": [mood, chat, quiz], "bias": b}
+# over the same normalized features as the near-match lookup. Re-read hourly;
+# while the document is missing every request goes to the LLM as before
+REGRESSOR_DOC_PATH = ("model_config", "stress_regressor")
+REGRESSOR_CACHE_TTL_SECONDS = 3600
+_regressor_cache = TTLCache(maxsize=1, ttl=REGRESSOR_CACHE_TTL_SECONDS)
+_regressor_cache_lock = threading.Lock()
+
+# The local prediction is served only when it is at least this far from 0.5;
+# anything closer falls through to the LLM
+REGRESSOR_CONFIDENCE_MARGIN = 0.2
+
+
+def _local_prediction(key: Tuple[float, int, int]) -> Optional[Dict[str, Any]]:
+    """
+    Predict from the local logistic model when it is confident enough.
+
+    Args:
+        key: Quantized inputs
+
+    Returns:
+        Optional[Dict]: Prediction dict, or None if no model is loaded or its
+                        probability is within REGRESSOR_CONFIDENCE_MARGIN of 0.5
+    """
+    regressor = _get_regressor()
+    if regressor is None:
+        return None
+
+    weights, bias = regressor
+    z = bias + sum(w * x / s for w, x, s in zip(weights, key, _KEY_SCALE))
+    probability = 1.0 / (1.0 + math.exp(-z))
+    if abs(probability - 0.5) <= REGRESSOR_CONFIDENCE_MARGIN:
+        return None
+
+    probability = round(probability, 2)
+    return {
+        "stress_probability": probability,
+        "label": _stress_label(probability),
+        "confidence": round(max(probability, 1.0 - probability), 2),
+    }
+
+
+def _get_regressor() -> Optional[Tuple[List[float], float]]:
+    """
+    Get the local model's (weights, bias), read from Firestore at most hourly.
+
+    Returns:
+        Optional[Tuple]: Model coefficients, or None if none are published
+    """
+    with _regressor_cache_lock:
+        if "model" in _regressor_cache:
+            return _regressor_cache["model"]
+
+    regressor = None
+    try:
+        doc = get_firestore_client().document(*REGRESSOR_DOC_PATH).get()
+        if doc.exists:
+            data = doc.to_dict()
+            weights = [float(w) for w in data["weights"]]
+            if len(weights) == len(_KEY_SCALE):
+                regressor = (weights, float(data["bias"]))
+            else:
+                logger.warning(
+                    "Ignoring stress regressor with %d weights", len(weights)
+                )
+    except Exception:
+        logger.exception("Error loading stress regressor")
+
+    # A missing or invalid model is cached too, so it isn't re-read per request
+    with _regressor_cache_lock:
+        _regressor_cache["model"] = regressor
+    return regressor
+
+
+def _log_training_sample(key: Tuple[float, int, int], result: Dict[str, Any]) -> None:
+    """
+    Queue an (inputs, LLM prediction) pair for offline regressor fitting.
+
+    Args:
+        key: Quantized inputs sent to the LLM
+        result: The LLM's clamped prediction
+    """
+    try:
+        avg_mood_score, chat_count, avg_quiz_score = key
+        doc_ref = (
+            get_firestore_client().collection(TRAINING_SAMPLES_COLLECTION).document()
+        )
+        firestore_batcher.enqueue(
+            doc_ref,
+            "set",
+            {
+                "avg_mood_score": avg_mood_score,
+                "chat_count": chat_count,
+                "avg_quiz_score": avg_quiz_score,
+                "stress_probability": result["stress_probability"],
+                "confidence": result["confidence"],
+                "created_at": firestore.SERVER_TIMESTAMP,
+            },
+        )
+    except Exception:
+        logger.exception("Error logging prediction training sample")
+
+
+# ============================================================================
+# PERSISTED PREDICTIONS
+# ============================================================================
+
+# LLM predictions are also written to Firestore, so a new instance (redeploy,
+# scale-out) starts from the predictions earlier instances paid for instead of
+# an empty in-memory cache. Documents are keyed by the quantized inputs and
+# PREDICTION_MODEL_VERSION; bump the version when the model or prompt changes
+# and older entries stop matching. expires_at can back a Firestore TTL policy
+PREDICTION_STORE_COLLECTION = "stress_prediction_cache"
+PREDICTION_MODEL_VERSION = "gemini-2.0-flash-lite/v1"
+PREDICTION_STORE_TTL = timedelta(days=7)
+
+
+def preload_prediction_cache() -> int:
+    """
+    Fill the in-memory prediction cache from stored predictions.
+
+    Returns:
+        int: Number of predictions loaded
+    """
+    try:
+        query = (
+            get_firestore_client()
+            .collection(PREDICTION_STORE_COLLECTION)
+            .where("model_version", "==", PREDICTION_MODEL_VERSION)
+            .limit(PREDICTION_CACHE_MAX_SIZE)
+        )
+        now = datetime.now(timezone.utc)
+        loaded = {}
+        for doc in query.stream():
+            data = doc.to_dict()
+            if data["expires_at"] > now:
+                loaded[_stored_key(data)] = _stored_result(data)
+
+        with _prediction_cache_lock:
+            _prediction_cache.update(loaded)
+        return len(loaded)
+
+    except Exception:
+        logger.exception("Error preloading stored predictions")
+        return 0
+
+
+def _load_stored_predictions(
+    keys: List[Tuple[float, int, int]],
+) -> Dict[Tuple[float, int, int], Dict[str, Any]]:
+    """
+    Read unexpired stored predictions for keys, in one batched read.
+
+    Args:
+        keys: Quantized inputs
+
+    Returns:
+        Dict: Prediction dict per key that has one (other keys are absent)
+    """
+    try:
+        db = get_firestore_client()
+        refs = [_stored_prediction_ref(db, key) for key in keys]
+        now = datetime.now(timezone.utc)
+        stored = {}
+        for doc in db.get_all(refs):
+            if doc.exists:
+                data = doc.to_dict()
+                if data["expires_at"] > now:
+                    stored[_stored_key(data)] = _stored_result(data)
+        return stored
+
+    except Exception:
+        logger.exception("Error reading stored predictions")
+        return {}
+
+
+def _store_prediction(key: Tuple[float, int, int], result: Dict[str, Any]) -> None:
+    """
+    Queue a fresh LLM prediction for the shared Firestore store.
+
+    Args:
+        key: Quantized inputs sent to the LLM
+        result: The LLM's clamped prediction
+    """
+    try:
+        avg_mood_score, chat_count, avg_quiz_score = key
+        firestore_batcher.enqueue(
+            _stored_prediction_ref(get_firestore_client(), key),
+            "set",
+            {
+                "avg_mood_score": avg_mood_score,
+                "chat_count": chat_count,
+                "avg_quiz_score": avg_quiz_score,
+                "model_version": PREDICTION_MODEL_VERSION,
+                "stress_probability": result["stress_probability"],
+                "label": result["label"],
+                "confidence": result["confidence"],
+                "expires_at": datetime.now(timezone.utc) + PREDICTION_STORE_TTL,
+            },
+        )
+    except Exception:
+        logger.exception("Error storing prediction")
+
+
+def _stored_prediction_ref(db, key: Tuple[float, int, int]):
+    """Document reference for a key under the current PREDICTION_MODEL_VERSION."""
+    avg_mood_score, chat_count, avg_quiz_score = key
+    seed = f"{float(avg_mood_score)}|{chat_count}|{avg_quiz_score}"
+    doc_id = hashlib.blake2b(
+        f"{seed}|{PREDICTION_MODEL_VERSION}".encode(), digest_size=16
+    ).hexdigest()
+    return db.collection(PREDICTION_STORE_COLLECTION).document(doc_id)
+
+
+def _stored_key(data: Dict[str, Any]) -> Tuple[float, int, int]:
+    """Rebuild the prediction cache key from a stored document."""
+    return (
+        float(data["avg_mood_score"]),
+        int(data["chat_count"]),
+        int(data["avg_quiz_score"]),
+    )
+
+
+def _stored_result(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Rebuild the prediction dict from a stored document."""
+    return {
+        "stress_probability": data["stress_probability"],
+        "label": data["label"],
+        "confidence": data["confidence"],
+    }
+
+
 # ============================================================================
 # PREDICTION LOGIC
 # ============================================================================
@@ -53,34 +588,53 @@ def predict_stress(
             - basedOn: Echo of input data
     """
     # Calculate tomorrow's date
-    tomorrow = (datetime.now() + timedelta(days=1)).strftime("%Y-%m-%d")
+    tomorrow = _tomorrow(int(time.time()) // 60)
 
     # Try LLM-based prediction first
     try:
-        llm_result = _predict_with_llm(avg_mood_score, chat_count, avg_quiz_score)
+        llm_result = _cached_llm_prediction(avg_mood_score, chat_count, avg_quiz_score)
         if llm_result:
-            return {
-                "date": tomorrow,
-                "stressProbability": llm_result["stress_probability"],
-                "label": llm_result["label"],
-                "confidence": llm_result["confidence"],
-                "basedOn": {
-                    "avgMoodScore": avg_mood_score,
-                    "chatCount": chat_count,
-                    "avgQuizScore": avg_quiz_score,
-                },
-            }
-    except Exception as e:
-        print(f"⚠ LLM prediction failed, using fallback: {str(e)}")
+            return _prediction_response(
+                tomorrow, llm_result, avg_mood_score, chat_count, avg_quiz_score
+            )
+    except Exception:
+        logger.warning("LLM prediction failed, using fallback", exc_info=True)
 
     # Fallback to deterministic calculation
     fallback_result = _fallback_prediction(avg_mood_score, chat_count, avg_quiz_score)
 
+    return _prediction_response(
+        tomorrow, fallback_result, avg_mood_score, chat_count, avg_quiz_score
+    )
+
+
+@lru_cache(maxsize=1)
+def _tomorrow(minute: int) -> str:
+    """
+    Tomorrow's date as YYYY-MM-DD, computed once per minute bucket.
+
+    Args:
+        minute: int(time.time()) // 60; a new bucket recomputes the date
+
+    Returns:
+        str: Tomorrow's ISO date (at most a minute stale around midnight)
+    """
+    return (datetime.now() + timedelta(days=1)).strftime("%Y-%m-%d")
+
+
+def _prediction_response(
+    tomorrow: str,
+    result: Dict[str, Any],
+    avg_mood_score: float,
+    chat_count: int,
+    avg_quiz_score: int,
+) -> Dict[str, Any]:
+    """Shape an LLM or fallback prediction as the API's prediction object."""
     return {
         "date": tomorrow,
-        "stressProbability": fallback_result["stress_probability"],
-        "label": fallback_result["label"],
-        "confidence": fallback_result["confidence"],
+        "stressProbability": result["stress_probability"],
+        "label": result["label"],
+        "confidence": result["confidence"],
         "basedOn": {
             "avgMoodScore": avg_mood_score,
             "chatCount": chat_count,
@@ -103,74 +657,53 @@ def _predict_with_llm(
     Returns:
         Optional[Dict]: Prediction dict or None if LLM fails
     """
-    if base_llm is None:
+    if llm_service.base_llm is None:
         raise RuntimeError("Gemini models not initialized. Call init_gemini() first.")
 
     try:
-        # Create Pydantic output parser
-        parser = PydanticOutputParser(pydantic_object=StressPrediction)
-
-        # Build prompt template
-        prompt_template = PromptTemplate(
-            template="""You are an AI assistant analyzing mental health metrics to predict stress levels.
-
-Given the following 7-day averages:
-- Average Mood Score: {avg_mood_score}/5.0 (where 1=Very Poor, 5=Excellent)
-- Chat Sessions Count: {chat_count} (seeking support/venting sessions)
-- Average Quiz Score: {avg_quiz_score}/60 (sum of 12 daily questions, each 1-5)
-
-**Prediction Task:**
-Predict the probability that the user will experience HIGH stress tomorrow.
-
-**Guidelines:**
-- Lower mood scores (1-2) suggest higher stress risk
-- Higher chat count suggests user is struggling/seeking more support
-- Lower quiz scores (12-30) indicate poor overall wellness, higher stress risk
-- Stress probability should be between 0.0 and 1.0
-- Label: "High" if probability >= 0.7, "Medium" if 0.4-0.69, "Low" if < 0.4
-- Confidence: How certain you are about this prediction (0.0 to 1.0)
-
-{format_instructions}
-
-Analyze and predict:""",
-            input_variables=["avg_mood_score", "chat_count", "avg_quiz_score"],
-            partial_variables={"format_instructions": parser.get_format_instructions()},
+        # Execute chain (traced only for a sample of calls)
+        with _prediction_tracing():
+            prediction_model = _get_prediction_chain().invoke(
+                {
+                    "avg_mood_score": avg_mood_score,
+                    "chat_count": chat_count,
+                    "avg_quiz_score": avg_quiz_score,
+                }
+            )
+
+        result = _clamped_prediction(prediction_model)
+        logger.debug(
+            "LLM prediction successful: %s (%.2f)",
+            result["label"],
+            result["stress_probability"],
         )
+        return result
 
-        # Chain: Prompt → Base LLM → Parser
-        chain = prompt_template | base_llm | parser
+    except Exception:
+        logger.exception("Error in LLM prediction")
+        return None
 
-        # Execute chain
-        prediction_model = chain.invoke(
-            {
-                "avg_mood_score": avg_mood_score,
-                "chat_count": chat_count,
-                "avg_quiz_score": avg_quiz_score,
-            }
-        )
 
-        # Convert Pydantic model to dict
-        result = prediction_model.dict()
+def _clamped_prediction(prediction_model: StressPrediction) -> Dict[str, Any]:
+    """
+    Convert a parsed LLM prediction to a dict with values clamped to 0-1.
 
-        # Validate and clamp values
-        result["stress_probability"] = max(0.0, min(1.0, result["stress_probability"]))
-        result["confidence"] = max(0.0, min(1.0, result["confidence"]))
+    Args:
+        prediction_model (StressPrediction): Parser output
 
-        # Ensure label matches probability
-        prob = result["stress_probability"]
-        if prob >= 0.7:
-            result["label"] = "High"
-        elif prob >= 0.4:
-            result["label"] = "Medium"
-        else:
-            result["label"] = "Low"
-
-        print(f"✓ LLM prediction successful: {result['label']} ({prob:.2f})")
-        return result
+    Returns:
+        Dict with stress_probability, label (recomputed from it), and confidence
+    """
+    # The parser already validated the model, so read its fields directly
+    # rather than paying for model_dump() or another validation pass
+    stress_probability = max(0.0, min(1.0, prediction_model.stress_probability))
 
-    except Exception as e:
-        print(f"✗ Error in LLM prediction: {str(e)}")
-        return None
+    return {
+        "stress_probability": stress_probability,
+        # Ensure label matches probability
+        "label": _stress_label(stress_probability),
+        "confidence": max(0.0, min(1.0, prediction_model.confidence)),
+    }
 
 
 def _fallback_prediction(
@@ -210,18 +743,16 @@ def _fallback_prediction(
     stress_probability = max(0.0, min(1.0, stress_probability))
 
     # Determine label
-    if stress_probability >= 0.7:
-        label = "High"
-    elif stress_probability >= 0.4:
-        label = "Medium"
-    else:
-        label = "Low"
+    label = _stress_label(stress_probability)
 
     # Fallback has lower confidence than LLM predictions
     confidence = 0.65
 
-    print(
-        f"✓ Fallback prediction: {label} ({stress_probability:.2f}) - confidence: {confidence}"
+    logger.debug(
+        "Fallback prediction: %s (%.2f) - confidence: %s",
+        label,
+        stress_probability,
+        confidence,
     )
 
     return {
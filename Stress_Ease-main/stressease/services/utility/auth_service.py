@@ -1,8 +1,12 @@
 """Auth helpers and @token_required decorator."""
 
 import functools
-from flask import request, jsonify, g
+import logging
+from flask import request, g
 import firebase_admin.auth
+from stressease.services.utility.json_response import json_response
+
+logger = logging.getLogger(__name__)
 
 def token_required(f):
     """Verify Firebase ID token from Authorization: Bearer <token> and pass user_id to the route."""
@@ -12,10 +16,10 @@ def token_required(f):
         auth_header = request.headers.get('Authorization')
         
         if not auth_header:
-            return jsonify({
+            return json_response({
                 'error': 'Unauthorized',
                 'message': 'Authorization header is required'
-            }), 401
+            }, 401)
         
         # Check if header follows "Bearer <token>" format
         try:
@@ -23,10 +27,10 @@ def token_required(f):
             if scheme.lower() != 'bearer':
                 raise ValueError("Invalid authorization scheme")
         except ValueError:
-            return jsonify({
+            return json_response({
                 'error': 'Unauthorized',
                 'message': 'Authorization header must be in format: Bearer <token>'
-            }), 401
+            }, 401)
         
         # Validate the Firebase JWT token
         try:
@@ -41,27 +45,26 @@ def token_required(f):
             return f(user_id, *args, **kwargs)
             
         except firebase_admin.auth.InvalidIdTokenError:
-            return jsonify({
+            return json_response({
                 'error': 'Unauthorized',
                 'message': 'Invalid or expired token'
-            }), 401
+            }, 401)
         except firebase_admin.auth.ExpiredIdTokenError:
-            return jsonify({
+            return json_response({
                 'error': 'Unauthorized',
                 'message': 'Token has expired'
-            }), 401
+            }, 401)
         except firebase_admin.auth.RevokedIdTokenError:
-            return jsonify({
+            return json_response({
                 'error': 'Unauthorized',
                 'message': 'Token has been revoked'
-            }), 401
-        except Exception as e:
-            # Log the error for debugging (in production, use proper logging)
-            print(f"Token validation error: {str(e)}")
-            return jsonify({
+            }, 401)
+        except Exception:
+            logger.exception("Token validation error")
+            return json_response({
                 'error': 'Unauthorized',
                 'message': 'Token validation failed'
-            }), 401
+            }, 401)
     
     return decorated_function
 
@@ -7,15 +7,26 @@ the Firestore client instance to other services.
 
 import firebase_admin
 from firebase_admin import credentials, firestore
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
 
 
 # Global Firestore client
 db = None
 
+# Serializes init_firebase() so concurrent callers create one app and client
+_init_lock = threading.Lock()
+
 
 def init_firebase(credentials_path: str) -> None:
     """
     Initialize Firebase Admin SDK with service account credentials.
+
+    Idempotent: once the client exists, later calls return immediately
+    without re-reading the credentials file. An already-initialized default
+    app (e.g. one created before a worker fork) is reused.
     
     Args:
         credentials_path (str): Path to the Firebase service account JSON file
@@ -24,25 +35,48 @@ def init_firebase(credentials_path: str) -> None:
         Exception: If Firebase initialization fails
     """
     global db
-    
-    try:
-        # Initialize Firebase Admin SDK
-        cred = credentials.Certificate(credentials_path)
-        firebase_admin.initialize_app(cred)
-        
-        # Get Firestore client
-        db = firestore.client()
-        
-        print("✓ Firebase Admin SDK initialized successfully")
-        
-    except Exception as e:
-        print(f"✗ Failed to initialize Firebase: {str(e)}")
-        raise
+
+    with _init_lock:
+        if db is not None:
+            return
+
+        try:
+            # Initialize Firebase Admin SDK, unless the default app exists
+            try:
+                firebase_admin.get_app()
+            except ValueError:
+                cred = credentials.Certificate(credentials_path)
+                firebase_admin.initialize_app(cred)
+
+            # Get Firestore client
+            db = firestore.client()
+
+            # Open the gRPC channel now rather than on the first user request
+            threading.Thread(
+                target=_warm_up_client, args=(db,), name="firestore-warmup", daemon=True
+            ).start()
+
+            logger.info("Firebase Admin SDK initialized")
+
+        except Exception:
+            logger.exception("Failed to initialize Firebase")
+            raise
 
 
 def get_firestore_client():
     """
     Get the Firestore client instance.
+
+    This is the single client created by init_firebase(); its gRPC channel is
+    shared by every caller, so it's cheap to call per request.
+
+    It is the sync client on purpose: requests are served by sync Flask
+    workers, and independent reads are overlapped on thread pools (see the
+    read pool in api/chat.py) rather than on an event loop.
+
+    Services bind this function with `from ... import get_firestore_client`,
+    so it stays a plain function; rebinding the module attribute after init
+    would not reach those references. The None check costs a global lookup.
     
     Returns:
         firestore.Client: The Firestore client
@@ -53,3 +87,19 @@ def get_firestore_client():
     if db is None:
         raise RuntimeError("Firebase has not been initialized. Call init_firebase() first.")
     return db
+
+
+def _warm_up_client(client) -> None:
+    """
+    Issue one tiny read so channel setup and the OAuth token fetch happen at startup.
+
+    The Python Firestore client only speaks gRPC and connects lazily, so
+    without this the first request in each process pays the connection cost.
+
+    Args:
+        client (firestore.Client): The client to warm up
+    """
+    try:
+        client.collection("_warmup").document("ping").get()
+    except Exception as e:
+        logger.warning("Firestore warm-up read failed: %s", e)
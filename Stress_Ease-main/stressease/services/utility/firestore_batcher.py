@@ -0,0 +1,298 @@
+"""
+Firestore write micro-batching.
+
+This module collects write operations from concurrent requests and flushes
+them together through a Firestore BulkWriter, either every
+FLUSH_INTERVAL_SECONDS or once MAX_BATCH_OPS operations are queued,
+whichever comes first. Writes that must land together are queued as a group
+and committed as one atomic WriteBatch in the same flush.
+"""
+
+import atexit
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+from google.rpc import code_pb2
+from stressease.services.utility.firebase_config import get_firestore_client
+
+logger = logging.getLogger(__name__)
+
+# ============================================================================
+# BATCHING CONFIGURATION
+# ============================================================================
+
+# Maximum time a queued write waits before being flushed
+FLUSH_INTERVAL_SECONDS = 0.02
+
+# Flush early once this many operations are queued (Firestore limit is 500)
+MAX_BATCH_OPS = 400
+
+# Largest atomic group accepted (Firestore WriteBatch limit)
+MAX_GROUP_OPS = 500
+
+# Threads committing atomic groups in parallel within a round
+GROUP_COMMIT_WORKERS = 8
+
+# Attempts (first try included) before a failed write is dropped
+MAX_WRITE_ATTEMPTS = 5
+
+# Failures a retry can't fix (the document or payload itself is wrong)
+_PERMANENT_ERROR_CODES = frozenset(
+    (
+        code_pb2.INVALID_ARGUMENT,
+        code_pb2.NOT_FOUND,
+        code_pb2.ALREADY_EXISTS,
+        code_pb2.FAILED_PRECONDITION,
+    )
+)
+
+# Queued write: (DocumentReference, op, payload, merge)
+_Op = Tuple[Any, str, Optional[Dict[str, Any]], bool]
+
+# Queue item: one op, or several committed atomically
+_Group = Tuple[_Op, ...]
+
+_OPERATIONS = ("create", "set", "update", "delete")
+
+_group_commit_executor = ThreadPoolExecutor(
+    max_workers=GROUP_COMMIT_WORKERS, thread_name_prefix="fs-batch-commit"
+)
+
+
+# ============================================================================
+# BATCHER
+# ============================================================================
+
+
+class FirestoreBatcher:
+    """
+    Queue of (ref, op, payload) writes drained by a background worker.
+
+    Writes to different documents in the same window are sent in parallel.
+    Writes to the same document are split into successive rounds so they are
+    applied in the order they were queued. Groups queued with enqueue_group()
+    are committed all-or-nothing.
+    """
+
+    def __init__(
+        self,
+        flush_interval: float = FLUSH_INTERVAL_SECONDS,
+        max_ops: int = MAX_BATCH_OPS,
+    ):
+        self._queue: "queue.Queue[_Group]" = queue.Queue()
+        self._flush_interval = flush_interval
+        self._max_ops = max_ops
+        self._worker: Optional[threading.Thread] = None
+        self._worker_lock = threading.Lock()
+
+    def enqueue(
+        self,
+        ref,
+        op: str,
+        payload: Optional[Dict[str, Any]] = None,
+        merge: bool = False,
+    ) -> None:
+        """
+        Queue a write operation.
+
+        Args:
+            ref (DocumentReference): Target document
+            op (str): One of "create", "set", "update", "delete"
+            payload (Optional[dict]): Document data (unused for "delete")
+            merge (bool): Merge flag for "set" operations
+        """
+        if op not in _OPERATIONS:
+            raise ValueError(f"Unsupported Firestore operation: {op}")
+
+        self._ensure_worker()
+        self._queue.put(((ref, op, payload, merge),))
+
+    def enqueue_group(self, ops: List[_Op]) -> None:
+        """
+        Queue several writes that must be committed atomically.
+
+        Args:
+            ops (List[tuple]): (ref, op, payload, merge) tuples, as for enqueue()
+        """
+        if not ops or len(ops) > MAX_GROUP_OPS:
+            raise ValueError(f"Atomic groups must hold 1-{MAX_GROUP_OPS} writes")
+        for _ref, op, _payload, _merge in ops:
+            if op not in _OPERATIONS:
+                raise ValueError(f"Unsupported Firestore operation: {op}")
+
+        self._ensure_worker()
+        self._queue.put(tuple(ops))
+
+    def flush(self) -> None:
+        """Synchronously write everything currently queued."""
+        groups = []
+        while True:
+            try:
+                groups.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+
+        if groups:
+            self._write(groups)
+
+    def _ensure_worker(self) -> None:
+        """Start the background worker on first use."""
+        if self._worker is not None:
+            return
+
+        with self._worker_lock:
+            if self._worker is None:
+                self._worker = threading.Thread(
+                    target=self._run, name="fs-batcher", daemon=True
+                )
+                self._worker.start()
+
+    def _run(self) -> None:
+        """Worker loop: block for the first op, then collect until the window closes."""
+        while True:
+            groups = [self._queue.get()]
+            op_count = len(groups[0])
+            deadline = time.monotonic() + self._flush_interval
+
+            while op_count < self._max_ops:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    group = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                groups.append(group)
+                op_count += len(group)
+
+            self._write(groups)
+
+    def _write(self, groups: List[_Group]) -> None:
+        """Send queued writes through one BulkWriter, one round per repeated document."""
+        try:
+            db = get_firestore_client()
+            writer = db.bulk_writer()
+            writer.on_write_error(_on_write_error)
+
+            try:
+                for round_groups in _split_rounds(groups):
+                    batches = []
+                    for group in round_groups:
+                        if len(group) == 1:
+                            _apply(writer, *group[0])
+                            continue
+
+                        batch = db.batch()
+                        for ref, op, payload, merge in group:
+                            _apply(batch, ref, op, payload, merge)
+                        batches.append((batch, group))
+
+                    commits = [
+                        _group_commit_executor.submit(_commit_group, batch, group)
+                        for batch, group in batches
+                    ]
+
+                    # Blocks until every write in this round is committed (or
+                    # dropped) before the next round starts
+                    writer.flush()
+                    for commit in commits:
+                        commit.result()
+            finally:
+                writer.close()
+
+        except Exception:
+            logger.exception(
+                "Error flushing %d batched Firestore writes",
+                sum(len(group) for group in groups),
+            )
+
+
+def _apply(writer, ref, op: str, payload: Optional[Dict[str, Any]], merge: bool):
+    """Add one queued op to a BulkWriter or WriteBatch (same method signatures)."""
+    if op == "create":
+        writer.create(ref, payload)
+    elif op == "set":
+        writer.set(ref, payload, merge=merge)
+    elif op == "update":
+        writer.update(ref, payload)
+    else:
+        writer.delete(ref)
+
+
+def _commit_group(batch, group: _Group) -> None:
+    """Commit an atomic group; WriteBatch.commit() already retries transient errors."""
+    try:
+        batch.commit()
+    except Exception:
+        logger.exception(
+            "Dropping atomic group of %d writes (%s)",
+            len(group),
+            ", ".join(ref.path for ref, _op, _payload, _merge in group),
+        )
+
+
+def _on_write_error(failure, writer) -> bool:
+    """
+    BulkWriter error callback: retry transient failures a bounded number of times.
+
+    Args:
+        failure (BulkWriteFailure): The failed operation with its status code
+        writer (BulkWriter): The writer that ran it
+
+    Returns:
+        bool: True to retry the operation, False to drop it
+    """
+    operation = failure.operation
+    if (
+        failure.code not in _PERMANENT_ERROR_CODES
+        and failure.attempts < MAX_WRITE_ATTEMPTS
+    ):
+        logger.debug(
+            "Retrying %s on %s (attempt %d): %s",
+            type(operation).__name__,
+            operation.reference.path,
+            failure.attempts,
+            failure.message,
+        )
+        return True
+
+    logger.error(
+        "Dropping %s on %s after %d attempt(s): %s",
+        type(operation).__name__,
+        operation.reference.path,
+        failure.attempts,
+        failure.message,
+    )
+    return False
+
+
+def _split_rounds(groups: List[_Group]) -> List[List[_Group]]:
+    """
+    Split queued groups so no document is written twice in the same round.
+
+    Each group lands in the round after the last one that touched any of its
+    documents, which keeps per-document ordering while independent documents
+    share the first round.
+    """
+    rounds: List[List[_Group]] = []
+    last_round: Dict[str, int] = {}
+
+    for group in groups:
+        paths = {ref.path for ref, _op, _payload, _merge in group}
+        index = max((last_round.get(path, -1) for path in paths), default=-1) + 1
+
+        if index == len(rounds):
+            rounds.append([])
+        rounds[index].append(group)
+        for path in paths:
+            last_round[path] = index
+
+    return rounds
+
+
+# Shared instance used by the services
+firestore_batcher = FirestoreBatcher()
+atexit.register(firestore_batcher.flush)
@@ -0,0 +1,35 @@
+"""
+JSON response helpers.
+
+Responses are serialized with orjson instead of Flask's jsonify, which goes
+through the stdlib json encoder.
+"""
+
+from datetime import datetime
+from flask import Response
+import orjson
+
+
+def json_response(payload, status=200):
+    """
+    Serialize a response payload with orjson.
+
+    Args:
+        payload (dict): JSON-serializable response body
+        status (int): HTTP status code
+
+    Returns:
+        Response: Flask response with a UTF-8 JSON body
+    """
+    return Response(
+        orjson.dumps(payload, default=json_default),
+        status=status,
+        content_type="application/json; charset=utf-8",
+    )
+
+
+def json_default(obj):
+    """Fallback for types orjson doesn't handle natively (e.g. Firestore timestamps)."""
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
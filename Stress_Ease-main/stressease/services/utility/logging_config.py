@@ -0,0 +1,42 @@
+"""
+Application logging setup.
+
+Records are handed to a QueueHandler and written by a QueueListener thread,
+so request threads never block on the stream handler's lock or on I/O.
+"""
+
+from logging.handlers import QueueHandler, QueueListener
+import atexit
+import logging
+import queue
+
+LOG_FORMAT = "%(asctime)s %(levelname)s [%(name)s] %(message)s"
+
+_listener = None
+
+
+def init_logging(level: int = logging.INFO) -> None:
+    """
+    Route the stressease loggers through a background queue listener.
+
+    Safe to call more than once; only the first call installs the handlers.
+
+    Args:
+        level (int): Minimum level for stressease loggers
+    """
+    global _listener
+
+    if _listener is not None:
+        return
+
+    log_queue = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+
+    _listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)
+
+    logger = logging.getLogger("stressease")
+    logger.setLevel(level)
+    logger.addHandler(QueueHandler(log_queue))
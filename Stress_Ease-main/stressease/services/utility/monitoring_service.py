@@ -5,9 +5,12 @@ This module handles the initialization of LangSmith for tracing and monitoring
 LLM performance, latency, and token usage.
 """
 
+import logging
 import os
 from config import Config
 
+logger = logging.getLogger(__name__)
+
 
 def init_monitoring():
     """
@@ -21,10 +24,11 @@ def init_monitoring():
         os.environ["LANGCHAIN_API_KEY"] = Config.LANGCHAIN_API_KEY
         os.environ["LANGCHAIN_PROJECT"] = Config.LANGCHAIN_PROJECT
 
-        print("✓ LangSmith monitoring initialized successfully")
-        print(f"  - Project: {Config.LANGCHAIN_PROJECT}")
+        logger.info(
+            "LangSmith monitoring initialized (project: %s)", Config.LANGCHAIN_PROJECT
+        )
     else:
-        print("! LangSmith monitoring skipped (missing API key or disabled)")
+        logger.info("LangSmith monitoring skipped (missing API key or disabled)")
 
 
 def log_error(error_type, error_message, context=None):
@@ -37,8 +41,11 @@ def log_error(error_type, error_message, context=None):
         context (dict, optional): Additional context data
     """
     # In the future, this can be expanded to send custom events to LangSmith
-    # or another monitoring tool. For now, we print to standard output which
-    # is captured by cloud logging.
-    print(f"[{error_type.upper()}] {error_message}")
+    # or another monitoring tool. For now, it goes through the app logger,
+    # whose stream output is captured by cloud logging.
     if context:
-        print(f"  Context: {context}")
+        logger.error(
+            "[%s] %s (context: %s)", error_type.upper(), error_message, context
+        )
+    else:
+        logger.error("[%s] %s", error_type.upper(), error_message)
@@ -0,0 +1,130 @@
+"""Tests for the chat API's streamed replies and session cache."""
+
+import os
+import sys
+from unittest import mock
+
+import orjson
+from flask import Flask
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from stressease.api import chat
+from stressease.services.chat import llm_service
+
+
+class _StreamingChain:
+    """Stands in for the LCEL chain, streaming fixed chunks."""
+
+    def __init__(self, chunks):
+        self.chunks = chunks
+
+    def stream(self, inputs):
+        return iter(self.chunks)
+
+
+def _stream(chunks):
+    """Run one streamed turn and return its decoded SSE frames."""
+    app = Flask(__name__)
+    with app.test_request_context(), mock.patch.object(
+        chat, "_record_turn", return_value=1
+    ) as record_turn:
+        response = chat._stream_chat_message(
+            "user", "session", _StreamingChain(chunks), "hello", []
+        )
+        body = b"".join(response.response)
+
+    frames = [
+        orjson.loads(line[len(b"data: ") :])
+        for line in body.split(b"\n\n")
+        if line.startswith(b"data: ")
+    ]
+    return frames, record_turn
+
+
+def _deltas(frames):
+    return "".join(frame.get("delta", "") for frame in frames)
+
+
+def test_safe_reply_streams_in_full():
+    chunks = ["That sounds ", "like a long day. ", "Want to talk ", "about it?"]
+    frames, _ = _stream(chunks)
+
+    assert _deltas(frames) == "".join(chunks)
+    assert frames[-1]["done"] is True
+    assert frames[-1]["content"] == "".join(chunks)
+
+
+def test_unsafe_reply_is_never_streamed():
+    chunks = ["I hear you. ", "You should ", "take this medication ", "daily."]
+    frames, record_turn = _stream(chunks)
+
+    assert "medication" not in _deltas(frames)
+    assert "You should" not in _deltas(frames)
+    assert frames[-1]["content"] == llm_service.MEDICATION_RESPONSE
+    assert record_turn.call_args.args[3] == llm_service.MEDICATION_RESPONSE
+
+
+def test_keyword_split_across_chunks_is_held_back():
+    chunks = ["It sounds like you ", "might have a disor", "der."]
+    frames, _ = _stream(chunks)
+
+    assert "disor" not in _deltas(frames)
+    assert frames[-1]["content"] == llm_service.DIAGNOSIS_RESPONSE
+
+
+def test_whole_reply_decides_the_safe_response():
+    # Crisis content outranks medication advice even when it comes later
+    chunks = ["You should take a break. ", "Do not hurt myself..."]
+    frames, _ = _stream(chunks)
+
+    assert frames[-1]["content"] == llm_service.CRISIS_RESPONSE
+
+
+def _load_session(sessions, stored_count, loaded_messages=()):
+    """Run _load_session against a fake cache and Firestore."""
+    memory = chat.chat_memory_service
+    with mock.patch.object(chat, "active_chat_sessions", sessions), mock.patch.object(
+        memory, "load_conversation_memory", return_value=list(loaded_messages)
+    ), mock.patch.object(
+        memory, "get_session_message_count", return_value=stored_count
+    ), mock.patch.object(
+        chat, "_create_chain_for_user", side_effect=lambda user_id: {"chain": "new"}
+    ), mock.patch.object(
+        llm_service, "trim_messages_to_budget", side_effect=lambda messages, _: messages
+    ):
+        return chat._load_session("session", "user")
+
+
+def _cached_session(message_count):
+    return {
+        "chain": "cached",
+        "history": [],
+        "cache_expires_at": None,
+        "user_context": "",
+        "message_count": message_count,
+    }
+
+
+def test_cold_reload_takes_message_count_from_metadata():
+    sessions = {}
+    # History is capped at 25 messages; the session itself has 40 turns
+    _load_session(sessions, stored_count=40, loaded_messages=["message"] * 25)
+
+    assert sessions[("user", "session")]["message_count"] == 40
+
+
+def test_cached_session_is_reloaded_when_another_instance_added_turns():
+    sessions = {("user", "session"): _cached_session(3)}
+    _, chain, _ = _load_session(sessions, stored_count=5)
+
+    assert chain == "new"
+    assert sessions[("user", "session")]["message_count"] == 5
+
+
+def test_cached_session_is_kept_while_its_own_writes_are_pending():
+    sessions = {("user", "session"): _cached_session(3)}
+    _, chain, _ = _load_session(sessions, stored_count=2)
+
+    assert chain == "cached"
+    assert sessions[("user", "session")]["message_count"] == 3
@@ -0,0 +1,120 @@
+"""Tests for loading conversation history from Firestore."""
+
+import os
+import sys
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from langchain_core.messages import AIMessage, HumanMessage
+
+from stressease.services.chat import chat_memory_service
+
+
+class _FakeQuery:
+    """Stands in for the messages query; docs are stored newest first."""
+
+    def __init__(self, docs, limits, start=0, size=None):
+        self.docs = docs
+        self.limits = limits
+        self.start = start
+        self.size = size
+
+    def select(self, fields):
+        return self
+
+    def order_by(self, field, direction=None):
+        return self
+
+    def start_after(self, doc):
+        return _FakeQuery(self.docs, self.limits, self.docs.index(doc) + 1)
+
+    def limit(self, size):
+        self.limits.append(size)
+        return _FakeQuery(self.docs, self.limits, self.start, size)
+
+    def stream(self):
+        return iter(self.docs[self.start : self.start + self.size])
+
+
+def _doc(**data):
+    return mock.Mock(**{"to_dict.return_value": data})
+
+
+def _turn(n):
+    return _doc(user=f"user {n}", assistant=f"ai {n}", timestamp=n)
+
+
+def _load(docs, max_messages):
+    """Load history from docs, returning (messages, page sizes requested)."""
+    limits = []
+    db = mock.Mock()
+    db.collection.return_value = _FakeQuery(docs, limits)
+
+    with mock.patch.object(chat_memory_service, "get_firestore_client", return_value=db):
+        messages = chat_memory_service.load_conversation_memory(
+            "user", "session", max_messages=max_messages
+        )
+    return [(type(m), m.content) for m in messages], limits
+
+
+def test_turn_documents_load_oldest_first():
+    messages, limits = _load([_turn(3), _turn(2), _turn(1)], max_messages=25)
+
+    assert messages == [
+        (HumanMessage, "user 1"),
+        (AIMessage, "ai 1"),
+        (HumanMessage, "user 2"),
+        (AIMessage, "ai 2"),
+        (HumanMessage, "user 3"),
+        (AIMessage, "ai 3"),
+    ]
+    assert limits == [12]
+
+
+def test_history_is_capped_to_whole_turns():
+    messages, limits = _load([_turn(n) for n in range(5, 0, -1)], max_messages=5)
+
+    # Five messages round down to the two newest turns
+    assert [content for _, content in messages] == ["user 4", "ai 4", "user 5", "ai 5"]
+    assert limits == [2]
+
+
+def test_legacy_documents_are_paged_one_message_each():
+    docs = [
+        _turn(3),
+        _doc(role="assistant", content="ai 2", timestamp=2.1),
+        _doc(role="user", content="user 2", timestamp=2.0),
+        _doc(role="assistant", content="ai 1", timestamp=1.1),
+        _doc(role="user", content="user 1", timestamp=1.0),
+        _doc(role="assistant", content="ai 0", timestamp=0.1),
+    ]
+    messages, limits = _load(docs, max_messages=6)
+
+    # The first page (three documents) holds four messages; the second page
+    # fetches exactly the two still missing
+    assert limits == [3, 2]
+    assert messages == [
+        (HumanMessage, "user 1"),
+        (AIMessage, "ai 1"),
+        (HumanMessage, "user 2"),
+        (AIMessage, "ai 2"),
+        (HumanMessage, "user 3"),
+        (AIMessage, "ai 3"),
+    ]
+
+
+def test_legacy_documents_with_unknown_roles_are_skipped():
+    docs = [_doc(role="system", content="ignored", timestamp=2), _turn(1)]
+    messages, limits = _load(docs, max_messages=25)
+
+    assert messages == [(HumanMessage, "user 1"), (AIMessage, "ai 1")]
+    assert limits == [12]
+
+
+def test_short_session_stops_after_one_page():
+    docs = [_doc(role="assistant", content="ai 1"), _doc(role="user", content="user 1")]
+    messages, limits = _load(docs, max_messages=25)
+
+    assert messages == [(HumanMessage, "user 1"), (AIMessage, "ai 1")]
+    assert limits == [12]
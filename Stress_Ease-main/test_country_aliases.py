@@ -0,0 +1,36 @@
+"""Tests for crisis-resource country normalization."""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from stressease.services.chat.country_aliases import normalize_country
+
+
+def test_codes_names_and_aliases_share_one_key():
+    for country in ("US", "usa", "United States", "  united   states ", "America"):
+        assert normalize_country(country) == "United States"
+
+
+def test_known_aliases():
+    assert normalize_country("UK") == "United Kingdom"
+    assert normalize_country("holland") == "Netherlands"
+    assert normalize_country("DRC") == "Democratic Republic of the Congo"
+    assert normalize_country("IN") == "India"
+
+
+def test_near_misses_are_not_guessed():
+    # Each of these is one or two edits from a real country
+    for country in ("Indiana", "Roman", "Untied States", "Austrlia"):
+        assert normalize_country(country) is None
+
+
+def test_ambiguous_congo_is_not_resolved():
+    assert normalize_country("Congo") is None
+    assert normalize_country("COG") == "Republic of the Congo"
+
+
+def test_blank_input():
+    assert normalize_country("") is None
+    assert normalize_country("   ") is None
@@ -0,0 +1,145 @@
+"""Tests for the background Firestore write batcher."""
+
+import os
+import sys
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from stressease.services.utility import firestore_batcher as batcher_module
+
+
+def _ref(path):
+    ref = mock.Mock()
+    ref.path = path
+    return ref
+
+
+def _single(path, op="set", payload=None, merge=False):
+    return ((_ref(path), op, payload, merge),)
+
+
+def _paths(rounds):
+    return [
+        [[ref.path for ref, _op, _payload, _merge in group] for group in groups]
+        for groups in rounds
+    ]
+
+
+def test_split_rounds_keeps_distinct_documents_together():
+    groups = [_single(p) for p in ("a/1", "a/2", "a/3")]
+    assert _paths(batcher_module._split_rounds(groups)) == [
+        [["a/1"], ["a/2"], ["a/3"]]
+    ]
+
+
+def test_split_rounds_orders_repeated_writes():
+    groups = [
+        _single("a/1", payload={"n": 1}),
+        _single("a/2"),
+        _single("a/1", payload={"n": 2}, merge=True),
+        _single("a/1", op="delete"),
+        _single("a/3"),
+    ]
+    rounds = batcher_module._split_rounds(groups)
+
+    assert _paths(rounds) == [[["a/1"], ["a/2"], ["a/3"]], [["a/1"]], [["a/1"]]]
+    assert [round_groups[0][0][1] for round_groups in rounds[1:]] == ["set", "delete"]
+    assert rounds[1][0][0][2] == {"n": 2}
+
+
+def test_split_rounds_places_groups_after_every_earlier_write():
+    groups = [
+        _single("a/1"),
+        _single("a/1"),
+        _single("b/1"),
+        _single("a/1") + _single("b/1"),
+        # b/1 is free in round 1, but must still follow the group in round 2
+        _single("b/1"),
+    ]
+    rounds = batcher_module._split_rounds(groups)
+
+    assert _paths(rounds) == [
+        [["a/1"], ["b/1"]],
+        [["a/1"]],
+        [["a/1", "b/1"]],
+        [["b/1"]],
+    ]
+
+
+def test_write_flushes_each_round_on_one_writer():
+    writer = mock.Mock()
+    db = mock.Mock()
+    db.bulk_writer.return_value = writer
+    groups = [
+        _single("a/1", payload={"n": 1}),
+        _single("a/1", op="update", payload={"n": 2}),
+    ]
+
+    with mock.patch.object(batcher_module, "get_firestore_client", return_value=db):
+        batcher_module.FirestoreBatcher()._write(groups)
+
+    db.bulk_writer.assert_called_once_with()
+    writer.on_write_error.assert_called_once_with(batcher_module._on_write_error)
+    assert [name for name, _args, _kwargs in writer.method_calls[1:]] == [
+        "set",
+        "flush",
+        "update",
+        "flush",
+        "close",
+    ]
+
+
+def test_write_commits_groups_as_one_batch():
+    writer = mock.Mock()
+    batch = mock.Mock()
+    db = mock.Mock()
+    db.bulk_writer.return_value = writer
+    db.batch.return_value = batch
+    group = _single("a/1", payload={"n": 1}) + _single(
+        "b/1", payload={"m": 1}, merge=True
+    )
+
+    with mock.patch.object(batcher_module, "get_firestore_client", return_value=db):
+        batcher_module.FirestoreBatcher()._write([group, _single("c/1")])
+
+    db.batch.assert_called_once_with()
+    assert batch.set.call_args_list == [
+        mock.call(group[0][0], {"n": 1}, merge=False),
+        mock.call(group[1][0], {"m": 1}, merge=True),
+    ]
+    batch.commit.assert_called_once_with()
+    assert writer.set.call_count == 1
+
+
+def test_enqueue_group_rejects_bad_groups():
+    batcher = batcher_module.FirestoreBatcher()
+    for ops in ([], [(_ref("a/1"), "upsert", {}, False)]):
+        try:
+            batcher.enqueue_group(ops)
+        except ValueError:
+            continue
+        raise AssertionError(f"enqueue_group accepted {ops!r}")
+
+
+def _failure(code, attempts):
+    failure = mock.Mock(code=code, attempts=attempts, message="boom")
+    failure.operation.reference.path = "a/1"
+    return failure
+
+
+def test_on_write_error_retries_transient_failures_a_bounded_number_of_times():
+    unavailable = batcher_module.code_pb2.UNAVAILABLE
+
+    assert batcher_module._on_write_error(_failure(unavailable, 1), None) is True
+    assert (
+        batcher_module._on_write_error(
+            _failure(unavailable, batcher_module.MAX_WRITE_ATTEMPTS), None
+        )
+        is False
+    )
+
+
+def test_on_write_error_drops_permanent_failures():
+    not_found = batcher_module.code_pb2.NOT_FOUND
+    assert batcher_module._on_write_error(_failure(not_found, 1), None) is False
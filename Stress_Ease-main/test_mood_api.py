@@ -0,0 +1,111 @@
+"""Tests for daily quiz payload validation."""
+
+import copy
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from stressease.api import mood
+
+VALID_PAYLOAD = {
+    "core_scores": {"mood": 3, "energy": 4, "sleep": 2, "stress": 5},
+    "rotating_scores": {"domain_name": "social", "scores": [1, 2, 3, 4, 5]},
+    "dass_today": {"depression": 1, "anxiety": 2, "stress": 3},
+    "additional_notes": "long day",
+}
+
+
+def _payload(section=None, key=None, value=None):
+    """VALID_PAYLOAD with one field replaced (or removed when value is ...)."""
+    payload = copy.deepcopy(VALID_PAYLOAD)
+    if section is None:
+        return payload
+
+    target = payload if key is None else payload[section]
+    field = section if key is None else key
+    if value is ...:
+        del target[field]
+    else:
+        target[field] = value
+    return payload
+
+
+# (payload, expected (error, message) from the detailed checks, or None)
+CASES = [
+    (_payload(), None),
+    # Booleans pass the original isinstance(int) check (True == 1), but not
+    # the schema's integer type: the detailed checks still accept them
+    (_payload("core_scores", "mood", True), None),
+    (
+        _payload("dass_today", None, ...),
+        (
+            "Missing required fields",
+            "core_scores, rotating_scores, and dass_today are required",
+        ),
+    ),
+    (
+        _payload("core_scores", None, {}),
+        (
+            "Missing required fields",
+            "core_scores, rotating_scores, and dass_today are required",
+        ),
+    ),
+    (
+        _payload("core_scores", "sleep", ...),
+        ("Invalid core_scores", "Missing one of mood, energy, sleep, stress"),
+    ),
+    (
+        _payload("core_scores", "mood", 6),
+        ("Invalid core_scores", "All core scores must be integers between 1 and 5"),
+    ),
+    (
+        _payload("core_scores", "mood", 3.0),
+        ("Invalid core_scores", "All core scores must be integers between 1 and 5"),
+    ),
+    (
+        _payload("rotating_scores", "domain_name", ...),
+        ("Invalid rotating_scores", "domain_name and scores are required"),
+    ),
+    (
+        _payload("rotating_scores", "scores", [1, 2, 3, 4]),
+        ("Invalid rotating_scores", "scores must be a list of 5 integers"),
+    ),
+    (
+        _payload("rotating_scores", "scores", [1, 2, "3", 4, 5]),
+        (
+            "Invalid rotating_scores",
+            "All rotating scores must be integers between 1 and 5",
+        ),
+    ),
+    (
+        _payload("dass_today", "stress", ...),
+        ("Invalid dass_today", "Missing one of depression, anxiety, stress"),
+    ),
+    (
+        _payload("dass_today", "anxiety", 0),
+        ("Invalid dass_today", "All DASS scores must be integers between 1 and 5"),
+    ),
+]
+
+
+def test_detailed_checks_report_the_expected_errors():
+    for payload, expected in CASES:
+        assert mood._quiz_payload_error(payload) == expected, payload
+
+
+def test_fast_path_never_accepts_what_the_detailed_checks_reject():
+    for payload, expected in CASES:
+        if mood._is_valid_quiz_payload(payload):
+            assert expected is None, payload
+
+
+def test_fast_path_accepts_valid_payloads():
+    assert mood._is_valid_quiz_payload(_payload())
+    # Extra keys are allowed, as in the detailed checks
+    assert mood._is_valid_quiz_payload(_payload("core_scores", "focus", 9))
+
+
+def test_fast_path_rejects_integral_floats():
+    # JSON Schema counts 3.0 as an integer; the scores must be ints
+    assert not mood._is_valid_quiz_payload(_payload("core_scores", "mood", 3.0))
@@ -0,0 +1,77 @@
+"""Tests for the stress prediction cache."""
+
+import os
+import sys
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from stressease.services.prediction import prediction_service
+
+
+def _prediction(probability, confidence=0.8):
+    return {
+        "stress_probability": probability,
+        "label": prediction_service._stress_label(probability),
+        "confidence": confidence,
+    }
+
+
+def _cached_llm_prediction(cache, *inputs):
+    """Run one lookup against a fake cache, failing if Gemini would be called."""
+    with mock.patch.object(
+        prediction_service, "_prediction_cache", cache
+    ), mock.patch.object(
+        prediction_service, "_predict_with_llm", side_effect=AssertionError("LLM called")
+    ), mock.patch.dict(
+        prediction_service.prediction_cache_stats
+    ):
+        return prediction_service._cached_llm_prediction(*inputs)
+
+
+def test_quantized_inputs_hit_the_cache():
+    cached = _prediction(0.5)
+    cache = {(3.0, 15, 36): cached}
+
+    # Mood rounds to 3.0 and the chat count is capped at CHAT_COUNT_CAP
+    assert _cached_llm_prediction(cache, 3.04, 40, 36) is cached
+
+
+def test_near_match_is_reused_as_is():
+    cached = _prediction(0.5)
+    entries = [((3.1, 5, 36), cached), ((1.0, 0, 12), _prediction(0.9))]
+
+    assert prediction_service._nearest_cached_prediction((3.0, 5, 36), entries) is cached
+
+
+def test_two_close_neighbours_are_blended():
+    entries = [
+        ((2.9, 5, 36), _prediction(0.4, confidence=0.9)),
+        ((3.6, 5, 36), _prediction(0.7, confidence=0.8)),
+    ]
+    result = prediction_service._nearest_cached_prediction((3.3, 5, 36), entries)
+
+    # The closer neighbour (3.6) carries the larger weight
+    assert result == {"stress_probability": 0.57, "label": "Medium", "confidence": 0.72}
+
+
+def test_distant_entries_are_not_used():
+    entries = [((1.0, 0, 12), _prediction(0.9))]
+    assert prediction_service._nearest_cached_prediction((4.0, 5, 48), entries) is None
+
+
+def test_obvious_prediction_keeps_the_fallback_confidence():
+    key = (5.0, 0, 60)
+    result = prediction_service._obvious_prediction(key)
+
+    assert result == prediction_service._fallback_prediction(*key)
+    assert result["label"] == "Low"
+
+
+def test_borderline_inputs_are_not_obvious():
+    assert prediction_service._obvious_prediction((3.0, 5, 36)) is None
+
+
+def test_obvious_inputs_skip_gemini():
+    result = _cached_llm_prediction({}, 1.0, 15, 12)
+    assert result == prediction_service._fallback_prediction(1.0, 15, 12)